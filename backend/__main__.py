@@ -1,18 +1,262 @@
 from __future__ import annotations
 
+import argparse
 import os
+from pathlib import Path
 
-import uvicorn
 
-from backend.src.api.app import create_app
+def _serve(_args: argparse.Namespace) -> None:
+    import uvicorn
 
+    from backend.src.api.app import create_app
 
-def main() -> None:
     host = os.environ.get("HOST", "127.0.0.1")
     port = int(os.environ.get("PORT", "8000"))
     app = create_app()
     uvicorn.run(app, host=host, port=port, log_level="info")
 
 
+def _preload_geocodes(args: argparse.Namespace) -> None:
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.florida import florida_county_queries, florida_zip_candidates
+    from backend.src.infra.geocode_store import PersistentGeocoder, preload_geocodes
+    from backend.src.infra.geocoding import NominatimGeocoder, default_geocode_store
+    from backend.src.infra.logging import configure_logging
+
+    configure_logging()
+    queries: list[str] = []
+    if args.counties:
+        queries.extend(florida_county_queries())
+    if args.zips_file:
+        lines = Path(args.zips_file).read_text(encoding="utf-8").splitlines()
+        queries.extend(line.strip() for line in lines if line.strip())
+    elif args.zips:
+        queries.extend(florida_zip_candidates())
+
+    store = default_geocode_store(find_repo_root())
+    report = preload_geocodes(
+        queries,
+        store=store,
+        geocoder=PersistentGeocoder(NominatimGeocoder(), store),
+        min_interval_seconds=args.min_interval,
+    )
+    print(
+        f"fetched={report.fetched} skipped={report.skipped} "
+        f"not_found={report.not_found} failed={report.failed}"
+    )
+
+
+def _preseed_tiles(args: argparse.Namespace) -> None:
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.logging import configure_logging
+    from backend.src.infra.tile_proxy import tile_proxy
+    from backend.src.services.preseed_service import PreseedPlan, preseed
+    from backend.src.services.risk_service import RiskService
+
+    configure_logging()
+    repo_root = find_repo_root()
+    defaults = PreseedPlan.from_config()
+    plan = PreseedPlan(
+        locations=tuple(args.location) if args.location else defaults.locations,
+        window_days=tuple(args.window_days) if args.window_days else defaults.window_days,
+        layer_ids=tuple(args.layer) if args.layer else None,
+        min_zoom=args.min_zoom if args.min_zoom is not None else defaults.min_zoom,
+        max_zoom=args.max_zoom if args.max_zoom is not None else defaults.max_zoom,
+        tile_concurrency=args.concurrency,
+        max_tile_requests=args.max_tiles,
+        requests_per_second=args.rate,
+    )
+    report = preseed(
+        plan,
+        risk_service=RiskService(repo_root=repo_root),
+        proxy=None if args.map_ids_only else tile_proxy(repo_root),
+    )
+    print(
+        f"map_ids={report.map_ids} map_id_failures={report.map_id_failures} "
+        f"tiles_fetched={report.tiles_fetched} tiles_failed={report.tiles_failed} "
+        f"tiles_skipped={report.tiles_skipped} tiles_cached={report.tiles_cached}"
+    )
+
+
+def _export_rasters(args: argparse.Namespace) -> None:
+    from datetime import date
+
+    from backend.src.domain.errors import DataUnavailableError
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.ee_session import ee_session
+    from backend.src.infra.florida import FLORIDA_BBOX
+    from backend.src.infra.logging import configure_logging
+    from backend.src.infra.raster_store import export_driver_month, months_between, raster_store, region_tiles
+    from backend.src.infra.sources import default_sources_yaml_path, load_sources_config, merge_local_auth_token
+
+    configure_logging()
+    repo_root = find_repo_root()
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    sources = merge_local_auth_token(sources, repo_root=repo_root)
+    ee_session(sources.googleearthengine.projectid).ensure_initialized()
+
+    store = raster_store(repo_root)
+    months = months_between(date.fromisoformat(f"{args.start_month}-01"), date.fromisoformat(f"{args.end_month}-01"))
+    exported = skipped = failed = 0
+    for region_id, bbox in region_tiles(FLORIDA_BBOX, tile_degrees=args.tile_degrees):
+        for month in months:
+            if store.has(region_id, month) and not args.force:
+                skipped += 1
+                continue
+            try:
+                export_driver_month(
+                    store=store, region_id=region_id, bbox=bbox, month=month, sources=sources, pixel_size=args.pixel_size
+                )
+                exported += 1
+            except DataUnavailableError as e:
+                print(f"{region_id} {month}: {e}")
+                failed += 1
+    print(f"exported={exported} skipped={skipped} failed={failed}")
+
+
+def _build_cube(args: argparse.Namespace) -> None:
+    from datetime import date
+
+    from backend.src.domain.errors import DataUnavailableError
+    from backend.src.infra.aggregate_cube import aggregate_cube
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.ee_session import ee_session
+    from backend.src.infra.florida import FLORIDA_BBOX
+    from backend.src.infra.logging import configure_logging
+    from backend.src.infra.raster_store import month_bounds
+    from backend.src.infra.sources import default_sources_yaml_path, load_sources_config, merge_local_auth_token
+
+    configure_logging()
+    repo_root = find_repo_root()
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    sources = merge_local_auth_token(sources, repo_root=repo_root)
+    ee_session(sources.googleearthengine.projectid).ensure_initialized()
+
+    cube = aggregate_cube(repo_root, sources=sources)
+    start, _ = month_bounds(args.start_month)
+    _, stop = month_bounds(args.end_month)
+    try:
+        # Composing whole months stores every month the cube is missing.
+        cube.compose(start, date.fromordinal(stop.toordinal() - 1), FLORIDA_BBOX)
+    except DataUnavailableError as e:
+        print(f"failed: {e}")
+        raise SystemExit(1)
+    print(f"cube ready for {args.start_month}..{args.end_month}")
+
+
+def _prefetch_datasets(args: argparse.Namespace) -> None:
+    from backend.src.infra.cache import cache_paths
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.datasets import prefetch_datasets
+    from backend.src.infra.logging import configure_logging
+    from backend.src.infra.sources import default_sources_yaml_path, load_sources_config
+
+    configure_logging()
+    repo_root = find_repo_root()
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    results = prefetch_datasets(sources, cache_paths(repo_root), max_workers=args.workers)
+    failed = 0
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"{name}: {result}")
+        else:
+            print(f"{name}: {result.local_path}")
+    if failed:
+        raise SystemExit(1)
+
+
+def _ingest_observations(args: argparse.Namespace) -> None:
+    from backend.src.domain.errors import DataUnavailableError
+    from backend.src.infra.config import find_repo_root
+    from backend.src.infra.logging import configure_logging
+    from backend.src.infra.observations import OBSERVATION_DATASETS, ingest_observations
+    from backend.src.infra.sources import default_sources_yaml_path, load_sources_config
+
+    configure_logging()
+    repo_root = find_repo_root()
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    failed = 0
+    for name in args.dataset or sorted(OBSERVATION_DATASETS):
+        try:
+            print(f"{name}: {ingest_observations(name, repo_root=repo_root, sources=sources, force=args.force)}")
+        except DataUnavailableError as e:
+            failed += 1
+            print(f"{name}: {e}")
+    if failed:
+        raise SystemExit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve = subparsers.add_parser("serve", help="Run the API server (default)")
+    serve.set_defaults(func=_serve)
+
+    preload = subparsers.add_parser(
+        "preload-geocodes", help="Fill the persistent geocode store with Florida ZIPs and counties"
+    )
+    preload.add_argument("--no-counties", dest="counties", action="store_false", help="Skip county names")
+    preload.add_argument("--no-zips", dest="zips", action="store_false", help="Skip the Florida ZIP range")
+    preload.add_argument("--zips-file", help="Newline-separated ZIP list to use instead of the full Florida range")
+    preload.add_argument(
+        "--min-interval", type=float, default=1.0, help="Seconds between upstream lookups (Nominatim policy: 1)"
+    )
+    preload.set_defaults(func=_preload_geocodes)
+
+    seed = subparsers.add_parser(
+        "preseed-tiles", help="Warm map ids and the local tile cache for Florida counties and recent windows"
+    )
+    seed.add_argument("--location", action="append", help="Location to warm (repeatable; default: all counties)")
+    seed.add_argument(
+        "--window-days", type=int, action="append", help="Trailing window length in days (repeatable; default: 30/90/365)"
+    )
+    seed.add_argument("--layer", action="append", help="Layer id to warm (repeatable; default: all risk layers)")
+    seed.add_argument("--min-zoom", type=int, help="Lowest zoom to fetch (default: GEOEMERGE_PRESEED_MIN_ZOOM)")
+    seed.add_argument("--max-zoom", type=int, help="Highest zoom to fetch (default: GEOEMERGE_PRESEED_MAX_ZOOM)")
+    seed.add_argument("--concurrency", type=int, default=4, help="Parallel tile fetches")
+    seed.add_argument("--max-tiles", type=int, default=20_000, help="Upper bound on tile requests per run")
+    seed.add_argument("--rate", type=float, default=10.0, help="Tile requests per second")
+    seed.add_argument("--map-ids-only", action="store_true", help="Resolve map ids without fetching tiles")
+    seed.set_defaults(func=_preseed_tiles)
+
+    rasters = subparsers.add_parser(
+        "export-rasters", help="Export monthly driver composites for Florida into the local raster store"
+    )
+    rasters.add_argument("--start-month", required=True, help="First month (YYYY-MM)")
+    rasters.add_argument("--end-month", required=True, help="Last month (YYYY-MM)")
+    rasters.add_argument("--tile-degrees", type=float, default=1.0, help="Region tile size in degrees")
+    rasters.add_argument("--pixel-size", type=float, default=0.01, help="Pixel size in degrees (~1 km)")
+    rasters.add_argument("--force", action="store_true", help="Re-export months already in the store")
+    rasters.set_defaults(func=_export_rasters)
+
+    cube = subparsers.add_parser(
+        "build-cube", help="Fill the monthly aggregate cube (precip sums, LST sum/count, NDVI medians) for Florida"
+    )
+    cube.add_argument("--start-month", required=True, help="First month (YYYY-MM)")
+    cube.add_argument("--end-month", required=True, help="Last month (YYYY-MM)")
+    cube.set_defaults(func=_build_cube)
+
+    datasets = subparsers.add_parser(
+        "prefetch-datasets", help="Download and extract every dataset in sources.yaml into the local cache"
+    )
+    datasets.add_argument("--workers", type=int, default=4, help="Parallel downloads")
+    datasets.set_defaults(func=_prefetch_datasets)
+
+    observations = subparsers.add_parser(
+        "ingest-observations", help="Convert GLOBE mosquito and land-cover points into indexed GeoParquet"
+    )
+    observations.add_argument(
+        "--dataset", action="append", choices=("mosquito", "landcover"), help="Dataset to ingest (repeatable; default: all)"
+    )
+    observations.add_argument("--force", action="store_true", help="Rebuild even if the source is unchanged")
+    observations.set_defaults(func=_ingest_observations)
+
+    args = parser.parse_args(argv)
+    func = getattr(args, "func", _serve)
+    func(args)
+
+
 if __name__ == "__main__":
     main()
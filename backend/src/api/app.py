@@ -4,15 +4,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.src.api.errors import register_error_handlers
+from backend.src.api.lifespan import app_lifespan
+from backend.src.api.routes.counties import router as counties_router
 from backend.src.api.routes.drivers import router as drivers_router
+from backend.src.api.routes.hotspots import router as hotspots_router
+from backend.src.api.routes.observations import router as observations_router
 from backend.src.api.routes.risk import router as risk_router
+from backend.src.api.routes.tiles import router as tiles_router
 from backend.src.api.middleware import BasicRateLimitMiddleware, CorrelationIdMiddleware
 from backend.src.infra.logging import configure_logging
+from backend.src.infra.metrics import metrics
 
 
 def create_app() -> FastAPI:
     configure_logging()
-    app = FastAPI(title="Mosquito Risk Dashboard API", version="0.1.0")
+    app = FastAPI(title="Mosquito Risk Dashboard API", version="0.1.0", lifespan=app_lifespan)
 
     app.add_middleware(CorrelationIdMiddleware)
     app.add_middleware(BasicRateLimitMiddleware)
@@ -30,7 +36,15 @@ def create_app() -> FastAPI:
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def get_metrics() -> dict[str, dict[str, float]]:
+        return metrics().snapshot()
+
     app.include_router(risk_router)
     app.include_router(drivers_router)
+    app.include_router(observations_router)
+    app.include_router(counties_router)
+    app.include_router(hotspots_router)
+    app.include_router(tiles_router)
     register_error_handlers(app)
     return app
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+import logging
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.config import AppConfig, find_repo_root
+from backend.src.infra.ee_session import EarthEngineSession, ee_session
+from backend.src.infra.gazetteer import GazetteerGeocoder
+from backend.src.infra.geocoding import default_geocoder
+from backend.src.infra.regions import florida_boundary, florida_ee_geometry
+from backend.src.infra.sources import default_sources_yaml_path, load_sources_config, merge_local_auth_token
+from backend.src.infra.tile_proxy import tile_proxy
+from backend.src.services.preseed_service import PreseedPlan, preseed
+from backend.src.services.risk_service import RiskService
+
+logger = logging.getLogger(__name__)
+
+
+def _startup_ee_session(repo_root: Path) -> EarthEngineSession:
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    sources = merge_local_auth_token(sources, repo_root=repo_root)
+    return ee_session(sources.googleearthengine.projectid)
+
+
+def _load_florida_boundary(repo_root: Path, session: EarthEngineSession) -> None:
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    boundary = florida_boundary(repo_root=repo_root, sources=sources)
+    logger.info(f"Loaded Florida boundary ({boundary.vertex_count} vertices)")
+    if session.is_initialized:
+        florida_ee_geometry(repo_root=repo_root, sources=sources)
+
+
+async def _warm_florida_boundary(repo_root: Path, session: EarthEngineSession) -> None:
+    try:
+        await run_in_threadpool(_load_florida_boundary, repo_root, session)
+    except Exception as e:
+        logger.warning(f"Failed to load Florida boundary at startup: {e}")
+
+
+async def _ee_health_loop(session: EarthEngineSession, *, interval_seconds: int) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await run_in_threadpool(session.check_health)
+
+
+async def _default_response_loop(service: RiskService, *, interval_seconds: int, retry_seconds: int) -> None:
+    while True:
+        try:
+            await run_in_threadpool(service.refresh_default)
+            delay = interval_seconds
+        except Exception as e:
+            logger.warning(f"Failed to refresh default risk response: {e}")
+            delay = retry_seconds
+        await asyncio.sleep(delay)
+
+
+async def _preseed_loop(repo_root: Path, *, interval_seconds: int) -> None:
+    plan = PreseedPlan.from_config()
+    proxy = tile_proxy(repo_root) if AppConfig().tile_proxy_base_url else None
+    while True:
+        try:
+            report = await run_in_threadpool(
+                preseed, plan, risk_service=RiskService(repo_root=repo_root), proxy=proxy
+            )
+            logger.info(f"Preseed finished: {report}")
+        except Exception as e:
+            logger.warning(f"Preseed failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+@asynccontextmanager
+async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    config = AppConfig()
+    tasks: list[asyncio.Task] = []
+
+    repo_root = find_repo_root()
+    session = _startup_ee_session(repo_root)
+    app.state.ee_session = session
+    try:
+        await run_in_threadpool(session.ensure_initialized)
+    except DataUnavailableError as e:
+        # Keep serving: requests surface the same error as a 503 until EE becomes reachable.
+        logger.warning(f"Earth Engine unavailable at startup: {e}")
+    # Opening the persistent geocode store warms the in-memory cache; load the gazetteer index too.
+    geocoder = await run_in_threadpool(default_geocoder, repo_root=repo_root)
+    if isinstance(geocoder, GazetteerGeocoder):
+        await run_in_threadpool(geocoder.load)
+
+    # Statewide queries are served from the prebuilt boundary; load it ahead of the first one.
+    # It may need a one-off download and simplification, so it never blocks startup.
+    tasks.append(asyncio.create_task(_warm_florida_boundary(repo_root, session)))
+    tasks.append(
+        asyncio.create_task(_ee_health_loop(session, interval_seconds=config.ee_health_check_interval_seconds))
+    )
+    if config.default_response_refresh_seconds > 0:
+        # Precompute the landing-page response in the background so startup never waits on it.
+        tasks.append(
+            asyncio.create_task(
+                _default_response_loop(
+                    RiskService(repo_root=repo_root),
+                    interval_seconds=config.default_response_refresh_seconds,
+                    retry_seconds=config.default_response_retry_seconds,
+                )
+            )
+        )
+    if config.preseed_interval_seconds > 0:
+        tasks.append(
+            asyncio.create_task(_preseed_loop(repo_root, interval_seconds=config.preseed_interval_seconds))
+        )
+
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
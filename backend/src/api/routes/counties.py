@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from backend.src.api.schemas import CountySummarySchema
+from backend.src.services.county_service import CountyService
+
+
+router = APIRouter(prefix="/api/counties", tags=["counties"])
+
+
+@router.get("/{name}/summary", response_model=CountySummarySchema)
+def get_county_summary(name: str) -> CountySummarySchema:
+    service = CountyService.from_repo_root()
+    return CountySummarySchema(**service.summary(name=name))
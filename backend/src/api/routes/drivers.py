@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from backend.src.api.schemas import DriversRequestSchema, DriversResponseSchema
+from backend.src.api.schemas import (
+    DriversRequestSchema,
+    DriversResponseSchema,
+    DriverTimeseriesResponseSchema,
+)
 from backend.src.services.drivers_service import DriversService
 
 
@@ -10,11 +14,22 @@ router = APIRouter(prefix="/api/drivers", tags=["drivers"])
 
 
 @router.post("", response_model=DriversResponseSchema)
-def post_drivers(body: DriversRequestSchema) -> DriversResponseSchema:
+async def post_drivers(body: DriversRequestSchema) -> DriversResponseSchema:
     service = DriversService.from_repo_root()
-    resp = service.query(
+    resp = await service.aquery(
         location_text=body.location_text,
         start_date=body.date_range.start_date if body.date_range else None,
         end_date=body.date_range.end_date if body.date_range else None,
     )
     return DriversResponseSchema(**resp)
+
+
+@router.post("/timeseries", response_model=DriverTimeseriesResponseSchema)
+async def post_driver_timeseries(body: DriversRequestSchema) -> DriverTimeseriesResponseSchema:
+    service = DriversService.from_repo_root()
+    resp = await service.atimeseries(
+        location_text=body.location_text,
+        start_date=body.date_range.start_date if body.date_range else None,
+        end_date=body.date_range.end_date if body.date_range else None,
+    )
+    return DriverTimeseriesResponseSchema(**resp)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from backend.src.api.schemas import HotspotsResponseSchema
+from backend.src.domain.validation import parse_bbox
+from backend.src.infra.florida import FLORIDA_BBOX
+from backend.src.services.hotspot_service import HotspotService
+
+
+router = APIRouter(prefix="/api/hotspots", tags=["hotspots"])
+
+_FLORIDA_BBOX_PARAM = ",".join(str(v) for v in FLORIDA_BBOX)
+
+
+@router.get("", response_model=HotspotsResponseSchema)
+def get_hotspots(
+    dataset: Literal["mosquito", "landcover"] = "mosquito",
+    bbox: str = Query(_FLORIDA_BBOX_PARAM, description="minx,miny,maxx,maxy in degrees"),
+    z: int = Query(7, ge=0, le=22, description="Map zoom; levels above the pyramid's finest reuse it"),
+    smooth: bool = False,
+) -> HotspotsResponseSchema:
+    service = HotspotService.from_repo_root()
+    return HotspotsResponseSchema(**service.query(dataset=dataset, bbox=parse_bbox(bbox), z=z, smooth=smooth))
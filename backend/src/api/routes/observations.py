@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from backend.src.api.schemas import ObservationsResponseSchema
+from backend.src.domain.validation import parse_bbox
+from backend.src.infra.florida import FLORIDA_BBOX
+from backend.src.services.observations_service import ObservationsService
+
+
+router = APIRouter(prefix="/api/observations", tags=["observations"])
+
+_FLORIDA_BBOX_PARAM = ",".join(str(v) for v in FLORIDA_BBOX)
+
+
+# A plain `def`: index lookups are CPU-bound and short, so FastAPI's threadpool is enough.
+@router.get("", response_model=ObservationsResponseSchema)
+def get_observations(
+    dataset: Literal["mosquito", "landcover"] = "mosquito",
+    bbox: str = Query(_FLORIDA_BBOX_PARAM, description="minx,miny,maxx,maxy in degrees"),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int = Query(1000, ge=1, le=10_000),
+) -> ObservationsResponseSchema:
+    service = ObservationsService.from_repo_root()
+    resp = service.query(
+        dataset=dataset,
+        bbox=parse_bbox(bbox),
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+    )
+    return ObservationsResponseSchema(**resp)
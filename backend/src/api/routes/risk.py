@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
-from backend.src.api.schemas import RiskLayerResponseSchema, RiskQueryRequestSchema
+from backend.src.api.schemas import (
+    RiskBatchLineSchema,
+    RiskBatchRequestSchema,
+    RiskLayerResponseSchema,
+    RiskQueryRequestSchema,
+)
 from backend.src.services.risk_service import RiskService
 
 
@@ -10,9 +16,9 @@ router = APIRouter(prefix="/api/risk", tags=["risk"])
 
 
 @router.get("/default", response_model=RiskLayerResponseSchema)
-def get_default_risk() -> RiskLayerResponseSchema:
+async def get_default_risk() -> RiskLayerResponseSchema:
     service = RiskService.from_repo_root()
-    layer = service.get_default()
+    layer = await service.aget_default()
     return RiskLayerResponseSchema(
         location_label=layer["location_label"],
         date_range=layer["date_range"],
@@ -20,14 +26,15 @@ def get_default_risk() -> RiskLayerResponseSchema:
         attribution=layer.get("attribution"),
         legend=layer["legend"],
         layers=layer.get("layers", []),
+        layer_errors=layer.get("layer_errors", []),
         viewport=layer.get("viewport"),
     )
 
 
 @router.post("/query", response_model=RiskLayerResponseSchema)
-def post_risk_query(body: RiskQueryRequestSchema) -> RiskLayerResponseSchema:
+async def post_risk_query(body: RiskQueryRequestSchema) -> RiskLayerResponseSchema:
     service = RiskService.from_repo_root()
-    layer = service.query(
+    layer = await service.aquery(
         location_text=body.location_text,
         start_date=body.date_range.start_date,
         end_date=body.date_range.end_date,
@@ -39,5 +46,23 @@ def post_risk_query(body: RiskQueryRequestSchema) -> RiskLayerResponseSchema:
         attribution=layer.get("attribution"),
         legend=layer["legend"],
         layers=layer.get("layers", []),
+        layer_errors=layer.get("layer_errors", []),
         viewport=layer.get("viewport"),
     )
+
+
+@router.post("/batch", response_class=StreamingResponse)
+async def post_risk_batch(body: RiskBatchRequestSchema) -> StreamingResponse:
+    """Stream one NDJSON line per distinct location, in completion order."""
+    service = RiskService.from_repo_root()
+    lines = service.batch_query(
+        location_texts=body.locations,
+        start_date=body.date_range.start_date,
+        end_date=body.date_range.end_date,
+    )
+
+    async def _ndjson():
+        async for line in lines:
+            yield RiskBatchLineSchema(**line).model_dump_json() + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
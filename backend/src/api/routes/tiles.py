@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from backend.src.infra.concurrency import run_blocking
+from backend.src.infra.config import AppConfig, find_repo_root
+from backend.src.infra.singleflight import SingleFlight
+from backend.src.infra.tile_proxy import is_valid_tile, tile_etag, tile_proxy
+
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+_TILE_FETCHES: SingleFlight[bytes | None] = SingleFlight("tile_fetch")
+_EXPIRED = "Unknown or expired tile layer; request the layers again"
+
+
+@router.get("/{layer_key}/{z}/{x}/{y}.png")
+async def get_tile(layer_key: str, z: int, x: int, y: int, request: Request) -> Response:
+    if not is_valid_tile(layer_key, z, x, y):
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    etag = tile_etag(layer_key, z, x, y)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={AppConfig().tile_cache_max_age_seconds}"}
+    proxy = tile_proxy(find_repo_root())
+    if request.headers.get("if-none-match") == etag:
+        if await run_blocking(lambda: proxy.knows(layer_key, z, x, y), upstream="earthengine"):
+            return Response(status_code=304, headers=headers)
+        raise HTTPException(status_code=410, detail=_EXPIRED)
+
+    # Disk hits and upstream fetches both run on a worker thread; `fetch` reads the cache first.
+    data = await _TILE_FETCHES.ado(
+        (layer_key, z, x, y),
+        lambda: run_blocking(lambda: proxy.fetch(layer_key, z, x, y), upstream="earthengine"),
+    )
+    if data is None:
+        # Map ids expire; 410 tells clients to fetch the layer list again for fresh keys.
+        raise HTTPException(status_code=410, detail=_EXPIRED)
+    return Response(content=data, media_type="image/png", headers=headers)
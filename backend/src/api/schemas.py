@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
@@ -55,6 +55,11 @@ class OverlayLayerSchema(BaseModel):
     legend: LayerLegendSchema | None = None
 
 
+class LayerErrorSchema(BaseModel):
+    layer_id: str
+    detail: str
+
+
 class ViewportSchema(BaseModel):
     center_lat: float
     center_lng: float
@@ -68,6 +73,7 @@ class RiskLayerResponseSchema(BaseModel):
     attribution: str | None = None
     legend: list[RiskBandSchema]
     layers: list[OverlayLayerSchema] = Field(default_factory=list)
+    layer_errors: list[LayerErrorSchema] = Field(default_factory=list)
     viewport: ViewportSchema | None = None
 
 
@@ -75,6 +81,40 @@ class ErrorResponseSchema(BaseModel):
     detail: str = Field(..., description="Human-readable error")
 
 
+class RiskBatchRequestSchema(BaseModel):
+    locations: list[str] = Field(..., min_length=1)
+    date_range: DateRangeSchema
+
+    @field_validator("locations")
+    @classmethod
+    def _validate_locations(cls, v: list[str]) -> list[str]:
+        locations = [item.strip() for item in v]
+        if any(not item for item in locations):
+            raise ValueError("locations must not contain empty entries")
+        if any(len(item) > 200 for item in locations):
+            raise ValueError("each location must be at most 200 characters")
+        return locations
+
+
+class RegionalMeansSchema(BaseModel):
+    lst_c: float
+    precip_mm: float
+
+
+class RiskBatchResultSchema(RiskLayerResponseSchema):
+    regional_means: RegionalMeansSchema | None = None
+
+
+class RiskBatchLineSchema(BaseModel):
+    """One NDJSON line of a batch response; `inputs` lists every request entry it answers."""
+
+    location_text: str
+    inputs: list[str]
+    status: int
+    result: RiskBatchResultSchema | None = None
+    detail: str | None = None
+
+
 class DriversRequestSchema(BaseModel):
     location_text: str = Field(..., max_length=200)
     date_range: DateRangeSchema | None = None
@@ -104,7 +144,75 @@ class DriversResponseSchema(BaseModel):
     location_label: str
     date_range: DateRangeSchema
     tiles: list[DriverTileSchema]
+    layer_errors: list[LayerErrorSchema] = Field(default_factory=list)
     viewport: ViewportSchema | None = None
 
 
+class DriverTimeseriesResponseSchema(BaseModel):
+    """Monthly regional means as parallel columns: `ndvi[i]` belongs to `months[i]` ("YYYY-MM")."""
+
+    location_label: str
+    date_range: DateRangeSchema
+    months: list[str]
+    ndvi: list[float | None]
+    lst_c: list[float | None]
+    precip_mm: list[float | None]
+
+
+class ObservationSchema(BaseModel):
+    lon: float
+    lat: float
+    site_id: int | None = None
+    measured_at: datetime | None = None
+    country_code: str | None = None
+    properties: dict[str, Any] = Field(default_factory=dict)
+
+
+class ObservationsResponseSchema(BaseModel):
+    dataset: str
+    bbox: tuple[float, float, float, float]
+    date_range: DateRangeSchema | None = None
+    count: int
+    truncated: bool
+    observations: list[ObservationSchema]
+
+
+class CountyYearSchema(BaseModel):
+    year: int
+    count: int
+    eliminated: int
+    mitigation_rate: float | None = None
+
+
+class ValueCountSchema(BaseModel):
+    value: str
+    count: int
+
+
+class CountySummarySchema(BaseModel):
+    county: str
+    geoid: str
+    total: int
+    eliminated: int
+    mitigation_rate: float | None = None
+    by_year: list[CountyYearSchema]
+    by_water_source_type: list[ValueCountSchema]
+    by_water_source: list[ValueCountSchema]
+
+
+class HotspotsResponseSchema(BaseModel):
+    """Density cells as parallel columns (cell centre lon/lat and point count)."""
+
+    dataset: str
+    bbox: tuple[float, float, float, float]
+    z: int
+    cell_degrees: float
+    smoothed: bool
+    total: float
+    max_count: float
+    lon: list[float]
+    lat: list[float]
+    count: list[float]
+
+
 JsonObject = dict[str, Any]
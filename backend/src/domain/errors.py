@@ -15,3 +15,7 @@ class InvalidDateRangeError(DomainError):
 
 class DataUnavailableError(DomainError):
     pass
+
+
+class LocationNotFoundError(InvalidLocationError):
+    pass
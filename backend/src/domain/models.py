@@ -25,6 +25,14 @@ class DateRange:
     end_date: date
 
 
+@dataclass(frozen=True)
+class RegionalMeans:
+    """Regional mean LST (°C) and precipitation (mm) that the risk rules compare pixels against."""
+
+    lst_c: float
+    precip_mm: float
+
+
 class RiskBandCode(str, Enum):
     low = "low"
     medium = "medium"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from backend.src.domain.errors import InvalidDateRangeError
+from backend.src.domain.errors import InvalidDateRangeError, InvalidLocationError
 from backend.src.domain.models import DateRange
 
 
@@ -19,3 +19,14 @@ def validate_date_range(date_range: DateRange, *, allow_future: bool = False) ->
 
     if not allow_future and date_range.end_date > date.today():
         raise InvalidDateRangeError("end_date cannot be in the future")
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    """Parse "minx,miny,maxx,maxy" in degrees (lon/lat)."""
+    try:
+        minx, miny, maxx, maxy = (float(part) for part in value.split(","))
+    except ValueError as e:
+        raise InvalidLocationError("Invalid bbox; expected minx,miny,maxx,maxy") from e
+    if not (-180.0 <= minx < maxx <= 180.0 and -90.0 <= miny < maxy <= 90.0):
+        raise InvalidLocationError("Invalid bbox; expected minx < maxx and miny < maxy within lon/lat bounds")
+    return minx, miny, maxx, maxy
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from backend.src.domain.errors import DataUnavailableError, InvalidDateRangeError
+from backend.src.infra.cache import TtlLruCache
+from backend.src.infra.config import AppConfig
+from backend.src.infra.ee_composites import DriverCollections, driver_collections
+from backend.src.infra.ee_geometry import LocalRegion
+from backend.src.infra.ee_tiles import ee_fingerprint
+from backend.src.infra.metrics import metrics
+from backend.src.infra.raster_store import RasterStore, month_bounds, months_between
+from backend.src.infra.sources import SourcesConfig
+
+DRIVER_BANDS = ("ndvi", "lst_c", "precip_mm")
+
+
+@dataclass(frozen=True)
+class MonthlyDrivers:
+    """Regional means of the drivers for one calendar month; None where the month had no valid pixels."""
+
+    ndvi: float | None
+    lst_c: float | None
+    precip_mm: float | None
+
+
+def _new_months_cache() -> TtlLruCache[tuple[str, str], MonthlyDrivers]:
+    config = AppConfig()
+    return TtlLruCache(max_entries=config.timeseries_cache_max_entries, ttl_seconds=config.regional_means_ttl_seconds)
+
+
+_MONTHS = _new_months_cache()
+
+
+def reset_driver_timeseries() -> None:
+    _MONTHS.clear()
+
+
+def _or_masked(collection: Any, image: Any) -> Any:
+    """`image`, or a fully masked band when `collection` has no scenes (so the month reduces to null)."""
+    import ee  # type: ignore
+
+    return ee.Image(ee.Algorithms.If(collection.size().gt(0), image, ee.Image.constant(0).selfMask()))
+
+
+def _band(name: str, month: str) -> str:
+    return f"{name}_{month.replace('-', '_')}"
+
+
+def _month_bands(collections: DriverCollections, month: str) -> list[Any]:
+    start, end = month_bounds(month)
+    s2 = collections.s2.filterDate(str(start), str(end))
+    lst = collections.lst.filterDate(str(start), str(end))
+    chirps = collections.chirps.filterDate(str(start), str(end))
+
+    # Same per-driver reductions as `build_driver_composites`, over one month.
+    ndvi = _or_masked(s2, s2.median().normalizedDifference(["B8", "B4"]))
+    lst_c = _or_masked(lst, lst.mean().multiply(0.02).subtract(273.15))
+    precip_mm = _or_masked(chirps, chirps.sum())
+    return [
+        ndvi.rename(_band("ndvi", month)),
+        lst_c.rename(_band("lst_c", month)),
+        precip_mm.rename(_band("precip_mm", month)),
+    ]
+
+
+def monthly_driver_stack(collections: DriverCollections, months: list[str]) -> Any:
+    """One image with an ndvi/lst_c/precip_mm band per month, e.g. `ndvi_2024_01`."""
+    import ee  # type: ignore
+
+    return ee.Image.cat([band for month in months for band in _month_bands(collections, month)])
+
+
+def _region_key(region: Any, sources: SourcesConfig) -> str | None:
+    fingerprint = ee_fingerprint(region)
+    if fingerprint is None:
+        return None
+    image_sets = ",".join(
+        sources.eeimagesets.get(k) or "" for k in ("vegetation", "land_surface_temperature", "precipitation")
+    )
+    return f"{fingerprint}|{image_sets}"
+
+
+def _fetch_months(
+    *, region: Any, bounds: Any | None, months: list[str], sources: SourcesConfig
+) -> dict[str, MonthlyDrivers]:
+    import ee  # type: ignore
+
+    start, _ = month_bounds(months[0])
+    _, end = month_bounds(months[-1])
+    collections = driver_collections(region=region, start_date=start, end_date=end, sources=sources, bounds=bounds)
+    reduction = monthly_driver_stack(collections, months).reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=region,
+        scale=1000,
+        maxPixels=1e12,
+    )
+    try:
+        values = reduction.getInfo()
+    except Exception as e:
+        raise DataUnavailableError("Failed to compute driver time series") from e
+    if not isinstance(values, dict):
+        raise DataUnavailableError("Failed to compute driver time series")
+
+    def _value(name: str, month: str) -> float | None:
+        value = values.get(_band(name, month))
+        return float(value) if value is not None else None
+
+    return {month: MonthlyDrivers(*(_value(name, month) for name in DRIVER_BANDS)) for month in months}
+
+
+def _months(start_date: date, end_date: date) -> list[str]:
+    months = months_between(start_date, end_date)
+    max_months = AppConfig().timeseries_max_months
+    if len(months) > max_months:
+        raise InvalidDateRangeError(f"Time series are limited to {max_months} months")
+    return months
+
+
+def _stored_months(
+    store: RasterStore, local: LocalRegion, months: list[str], today: date
+) -> dict[str, MonthlyDrivers]:
+    """Months the raster store covers for `local`; only finished months, since stored ones never change."""
+    series: dict[str, MonthlyDrivers] = {}
+    for month in months:
+        if month_bounds(month)[1] > today:
+            continue
+        means = store.region_means(month, local.bbox, local.geometry)
+        if means is not None:
+            series[month] = MonthlyDrivers(*(means.get(name) for name in DRIVER_BANDS))
+    return series
+
+
+def _columns(months: list[str], series: dict[str, MonthlyDrivers]) -> dict[str, list]:
+    return {
+        "months": months,
+        **{name: [getattr(series[m], name) for m in months] for name in DRIVER_BANDS},
+    }
+
+
+def stored_driver_timeseries(
+    *, store: RasterStore, local: LocalRegion, start_date: date, end_date: date, today: date | None = None
+) -> dict[str, list] | None:
+    """`driver_timeseries` read entirely from the raster store, or None if any month is not stored.
+
+    Needs no Earth Engine session, so exported history can be served offline.
+    """
+    months = _months(start_date, end_date)
+    series = _stored_months(store, local, months, today or date.today())
+    if len(series) < len(months):
+        return None
+    metrics().increment("drivers.timeseries.stored_months", len(months))
+    return _columns(months, series)
+
+
+def driver_timeseries(
+    *,
+    region: Any,
+    start_date: date,
+    end_date: date,
+    sources: SourcesConfig,
+    bounds: Any | None = None,
+    today: date | None = None,
+    store: RasterStore | None = None,
+    local: LocalRegion | None = None,
+) -> dict[str, list]:
+    """Monthly regional means of NDVI, LST (°C) and precipitation (mm) as columnar lists.
+
+    Every calendar month touched by the window is reported in full. Months already
+    cached for this region are reused, then finished months the raster `store` holds
+    for `local`; the rest are reduced together from one multi-band image stack with a
+    single getInfo. The current month is never cached.
+    """
+    months = _months(start_date, end_date)
+    today = today or date.today()
+
+    key = _region_key(region, sources)
+    series: dict[str, MonthlyDrivers] = {}
+    if key is not None:
+        for month in months:
+            cached = _MONTHS.get((key, month))
+            if cached is not None:
+                series[month] = cached
+    cached_count = len(series)
+    if store is not None and local is not None:
+        stored = _stored_months(store, local, [m for m in months if m not in series], today)
+        series.update(stored)
+        metrics().increment("drivers.timeseries.stored_months", len(stored))
+    missing = [m for m in months if m not in series]
+    metrics().increment("drivers.timeseries.cached_months", cached_count)
+    metrics().increment("drivers.timeseries.fetched_months", len(missing))
+
+    if missing:
+        fetched = _fetch_months(region=region, bounds=bounds, months=missing, sources=sources)
+        series.update(fetched)
+        if key is not None:
+            for month, value in fetched.items():
+                if month_bounds(month)[1] <= today:
+                    _MONTHS.put((key, month), value)
+
+    return _columns(months, series)
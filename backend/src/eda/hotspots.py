@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.src.domain.errors import InvalidLocationError
+
+BBox = tuple[float, float, float, float]
+
+MAX_ZOOM = 14
+# Grid cells across one 256 px web-map tile; 8 gives 32 px cells at every zoom.
+CELLS_PER_TILE = 8
+# Upper bound on the dense window built for kernel smoothing (cells).
+MAX_SMOOTH_CELLS = 4_000_000
+
+
+def cell_degrees(z: int) -> float:
+    return 360.0 / (2**z * CELLS_PER_TILE)
+
+
+def _columns(z: int) -> int:
+    return 2**z * CELLS_PER_TILE
+
+
+def _aggregate(ids: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    unique, inverse = np.unique(ids, return_inverse=True)
+    return unique, np.bincount(inverse, weights=weights, minlength=len(unique))
+
+
+@dataclass(frozen=True)
+class HotspotLevel:
+    """Sparse point counts on one zoom level's lon/lat grid, sorted by (row, column)."""
+
+    z: int
+    ids: np.ndarray  # cy * columns + cx, ascending
+    counts: np.ndarray
+
+    @property
+    def cy(self) -> np.ndarray:
+        return self.ids // _columns(self.z)
+
+    @property
+    def cx(self) -> np.ndarray:
+        return self.ids % _columns(self.z)
+
+    @property
+    def cell_degrees(self) -> float:
+        return cell_degrees(self.z)
+
+    def cell_range(self, bbox: BBox) -> tuple[int, int, int, int]:
+        """Inclusive (cx0, cx1, cy0, cy1) cell indices covering `bbox`."""
+        minx, miny, maxx, maxy = bbox
+        size = self.cell_degrees
+        cx0, cx1 = (int(np.floor((v + 180.0) / size)) for v in (minx, maxx))
+        cy0, cy1 = (int(np.floor((v + 90.0) / size)) for v in (miny, maxy))
+        top = _columns(self.z) - 1
+        return max(cx0, 0), min(cx1, top), max(cy0, 0), cy1
+
+    def window(self, bbox: BBox) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(row, column, count) of the non-empty cells overlapping `bbox`."""
+        return self.cells(*self.cell_range(bbox))
+
+    def cells(self, cx0: int, cx1: int, cy0: int, cy1: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Non-empty cells in an inclusive index range; one binary search pair per grid row."""
+        cx0, cx1 = max(cx0, 0), min(cx1, _columns(self.z) - 1)
+        columns = _columns(self.z)
+        rows = np.arange(cy0, cy1 + 1, dtype=np.int64)
+        starts = np.searchsorted(self.ids, rows * columns + cx0, side="left")
+        stops = np.searchsorted(self.ids, rows * columns + cx1, side="right")
+        take = np.concatenate([np.arange(a, b) for a, b in zip(starts, stops) if b > a] or [np.empty(0, np.int64)])
+        ids = self.ids[take]
+        return ids // columns, ids % columns, self.counts[take]
+
+
+class HotspotPyramid:
+    """Observation density binned on a lon/lat grid for every zoom level from 0 to `max_zoom`.
+
+    The finest level is histogrammed from the points in one vectorized pass; each coarser
+    level merges 2x2 cells of the one below. Queries read pre-aggregated cells, so the
+    response size depends on the bbox and zoom, not on how many points exist.
+    """
+
+    def __init__(self, levels: dict[int, HotspotLevel]) -> None:
+        self._levels = levels
+        self.max_zoom = max(levels)
+
+    @classmethod
+    def build(cls, lon: np.ndarray, lat: np.ndarray, *, max_zoom: int = MAX_ZOOM) -> "HotspotPyramid":
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        valid = np.isfinite(lon) & np.isfinite(lat)
+        size = cell_degrees(max_zoom)
+        ix = np.clip(np.floor((lon[valid] + 180.0) / size).astype(np.int64), 0, _columns(max_zoom) - 1)
+        iy = np.floor((lat[valid] + 90.0) / size).astype(np.int64)
+
+        levels: dict[int, HotspotLevel] = {}
+        ids, counts = _aggregate(iy * _columns(max_zoom) + ix, np.ones(len(ix)))
+        for z in range(max_zoom, -1, -1):
+            level = HotspotLevel(z=z, ids=ids, counts=counts)
+            levels[z] = level
+            if z:
+                # Parent cell of (cy, cx) is (cy // 2, cx // 2) on a grid half as wide.
+                ids, counts = _aggregate((level.cy // 2) * _columns(z - 1) + level.cx // 2, counts)
+        return cls(levels)
+
+    def query(self, bbox: BBox, z: int, *, smooth: bool = False) -> dict:
+        level = self._levels[min(max(z, 0), self.max_zoom)]
+        size = level.cell_degrees
+        if smooth:
+            cy, cx, counts = _smoothed(level, bbox)
+        else:
+            cy, cx, counts = level.window(bbox)
+        return {
+            "z": level.z,
+            "cell_degrees": size,
+            "lon": ((cx + 0.5) * size - 180.0).round(6).tolist(),
+            "lat": ((cy + 0.5) * size - 90.0).round(6).tolist(),
+            "count": counts.round(4).tolist(),
+            "total": float(counts.sum()),
+            "max_count": float(counts.max()) if len(counts) else 0.0,
+        }
+
+
+def _smoothed(level: HotspotLevel, bbox: BBox) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cells of `bbox` after a separable [1, 2, 1] / 4 kernel; mass near the edges is kept via a one-cell halo."""
+    cx0, cx1, cy0, cy1 = level.cell_range(bbox)
+    height, width = cy1 - cy0 + 3, cx1 - cx0 + 3
+    if height * width > MAX_SMOOTH_CELLS:
+        raise InvalidLocationError("bbox is too large to smooth at this zoom; zoom in or disable smoothing")
+
+    cy, cx, counts = level.cells(cx0 - 1, cx1 + 1, cy0 - 1, cy1 + 1)
+    grid = np.zeros((height + 2, width + 2))
+    np.add.at(grid, (cy - cy0 + 2, cx - cx0 + 2), counts)
+    grid = (grid[:-2] + 2 * grid[1:-1] + grid[2:]) / 4
+    grid = (grid[:, :-2] + 2 * grid[:, 1:-1] + grid[:, 2:]) / 4
+    inner = grid[1:-1, 1:-1]
+    rows, cols = np.nonzero(inner > 0)
+    return rows + cy0, cols + cx0, inner[rows, cols]
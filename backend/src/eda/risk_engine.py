@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.src.domain.models import RegionalMeans, RiskBandCode
+
+# Integer codes shared with the Earth Engine "Risk_Level" band.
+RISK_LOW = 0
+RISK_MEDIUM = 1
+RISK_HIGH = 2
+RISK_NODATA = -1
+
+RISK_CODES: dict[int, RiskBandCode] = {
+    RISK_LOW: RiskBandCode.low,
+    RISK_MEDIUM: RiskBandCode.medium,
+    RISK_HIGH: RiskBandCode.high,
+}
+
+NDVI_VEGETATED = 0.3
+
+
+def regional_means(lst_c: np.ndarray, precip_mm: np.ndarray) -> RegionalMeans:
+    """Mean LST and precipitation over valid (non-NaN) pixels, like `reduceRegion(mean)`."""
+    return RegionalMeans(lst_c=float(np.nanmean(lst_c)), precip_mm=float(np.nanmean(precip_mm)))
+
+
+def classify_risk_arrays(
+    ndvi: np.ndarray,
+    lst_c: np.ndarray,
+    precip_mm: np.ndarray,
+    *,
+    means: RegionalMeans | None = None,
+) -> np.ndarray:
+    """Vectorized `build_risk_image`: Risk_Level codes for whole rasters in one pass.
+
+    Inputs are same-shaped float arrays with NaN for masked pixels. Pass `means` to
+    classify against precomputed regional means (e.g. a tile of a larger region);
+    otherwise they are taken from these arrays. Masked pixels get `RISK_NODATA`.
+    """
+    ndvi = np.asarray(ndvi, dtype=np.float64)
+    lst_c = np.asarray(lst_c, dtype=np.float64)
+    precip_mm = np.asarray(precip_mm, dtype=np.float64)
+    if not (ndvi.shape == lst_c.shape == precip_mm.shape):
+        raise ValueError("ndvi, lst_c and precip_mm must have the same shape")
+
+    means = means or regional_means(lst_c, precip_mm)
+    mean_lst, mean_rain = means.lst_c, means.precip_mm
+
+    # Same rules as the Earth Engine graph; the low class contributes 0 either way.
+    med_risk = (ndvi <= NDVI_VEGETATED) | (lst_c == mean_lst) | (precip_mm == mean_rain)
+    high_risk = (ndvi > NDVI_VEGETATED) & (lst_c > mean_lst) & (precip_mm > mean_rain)
+    risk = med_risk.astype(np.int8) * RISK_MEDIUM + high_risk.astype(np.int8) * RISK_HIGH
+
+    valid = ~(np.isnan(ndvi) | np.isnan(lst_c) | np.isnan(precip_mm))
+    return np.where(valid, risk, RISK_NODATA).astype(np.int8)
+
+
+def classify_risk_scores(ndvi: np.ndarray, lst_c: np.ndarray, precip_mm: np.ndarray) -> np.ndarray:
+    """Vectorized `classify_risk_score` for batches of points; returns Risk_Level codes."""
+    ndvi = np.asarray(ndvi, dtype=np.float64)
+    lst_c = np.asarray(lst_c, dtype=np.float64)
+    precip_mm = np.asarray(precip_mm, dtype=np.float64)
+
+    score = (
+        (ndvi > NDVI_VEGETATED).astype(np.int8)
+        + ((lst_c >= 20.0) & (lst_c <= 35.0)).astype(np.int8)
+        + (precip_mm > 10.0).astype(np.int8)
+    )
+    return np.select([score <= 1, score == 2], [RISK_LOW, RISK_MEDIUM], default=RISK_HIGH).astype(np.int8)
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 from datetime import date
+import hashlib
+import json
+import logging
+from pathlib import Path
 from typing import Any
 
-from backend.src.domain.models import RiskBandCode
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.domain.models import RegionalMeans, RiskBandCode
+from backend.src.infra.cache import TtlLruCache
+from backend.src.infra.config import AppConfig
+from backend.src.infra.ee_composites import DriverComposites, build_driver_composites
+from backend.src.infra.ee_geometry import local_region
+from backend.src.infra.ee_tiles import ee_fingerprint
+from backend.src.infra.metrics import metrics
 from backend.src.infra.sources import SourcesConfig
 
+logger = logging.getLogger(__name__)
+
 
 def classify_risk_score(*, ndvi: float, lst_c: float, precip_mm: float) -> RiskBandCode:
     score = 0
@@ -30,82 +43,149 @@ def classify_risk_score(*, ndvi: float, lst_c: float, precip_mm: float) -> RiskB
 
 
 def build_default_risk_image(*, region: Any, start_date: date, end_date: date, sources: SourcesConfig):
-    import ee  # type: ignore
-    import logging
-
-    from backend.src.domain.errors import DataUnavailableError
-
-    logger = logging.getLogger(__name__)
-
-    s2_id = sources.eeimagesets.get("vegetation")
-    lst_id = sources.eeimagesets.get("land_surface_temperature")
-    chirps_id = sources.eeimagesets.get("precipitation")
+    composites = build_driver_composites(region=region, start_date=start_date, end_date=end_date, sources=sources)
+    return build_risk_image(composites)
 
-    if not (s2_id and lst_id and chirps_id):
-        raise DataUnavailableError("Earth Engine image sets are not configured")
-
-    logger.info(f"Building risk image for region {region} from {start_date} to {end_date}")
-
-    # Cloud masking function for Sentinel-2
-    def _mask_s2_clouds(img):
-        qa = img.select("QA60")
-        cloud_bit_mask = 1 << 10
-        cirrus_bit_mask = 1 << 11
-        mask = qa.bitwiseAnd(cloud_bit_mask).eq(0).And(qa.bitwiseAnd(cirrus_bit_mask).eq(0))
-        return img.updateMask(mask)
-
-    # T104: Process and combine image bands
-    # NDVI from Sentinel-2
-    s2 = (
-        ee.ImageCollection(s2_id)
-        .filterDate(str(start_date), str(end_date))
-        .filterBounds(region)
-        .map(_mask_s2_clouds)
-    )
-    s2_img = s2.median()
-    ndvi = s2_img.normalizedDifference(["B8", "B4"]).rename("NDVI").clip(region)
-
-    # LST from MODIS (convert to Celsius)
-    lst = (
-        ee.ImageCollection(lst_id)
-        .filterDate(str(start_date), str(end_date))
-        .filterBounds(region)
-        .select(["LST_Day_1km"])
-    )
-    lst_img = lst.mean().multiply(0.02).subtract(273.15).rename("LST_Day_1km").clip(region)
-
-    # Precipitation from CHIRPS
-    chirps = (
-        ee.ImageCollection(chirps_id)
-        .filterDate(str(start_date), str(end_date))
-        .filterBounds(region)
-    )
-    precip_img = chirps.sum().rename("precipitation").clip(region)
 
-    # T104: Combine bands into single image for pixel-aligned operations
-    combined = ndvi.addBands(lst_img).addBands(precip_img)
+def _reduce_regional_means(composites: DriverComposites):
+    import ee  # type: ignore
 
-    # T103: Compute regional means server-side (as ee.Number for conditional operations)
     # Use larger scale for faster computation, maxPixels for large regions
-    mean_lst_dict = lst_img.reduceRegion(
+    mean_lst_dict = composites.lst_c.rename("LST_Day_1km").reduceRegion(
         reducer=ee.Reducer.mean(),
-        geometry=region,
+        geometry=composites.region,
         scale=1000,
         maxPixels=1e12
     )
-    mean_rain_dict = precip_img.reduceRegion(
+    mean_rain_dict = composites.precip_mm.rename("precipitation").reduceRegion(
         reducer=ee.Reducer.mean(),
-        geometry=region,
+        geometry=composites.region,
         scale=5566,
         maxPixels=1e12
     )
+    return ee.Dictionary(
+        {"lst_c": mean_lst_dict.get("LST_Day_1km"), "precip_mm": mean_rain_dict.get("precipitation")}
+    )
+
+
+def _new_regional_means_cache() -> TtlLruCache[str, RegionalMeans]:
+    config = AppConfig()
+    return TtlLruCache(max_entries=config.mapid_cache_max_entries, ttl_seconds=config.regional_means_ttl_seconds)
+
+
+_REGIONAL_MEANS = _new_regional_means_cache()
+
+
+def reset_regional_means() -> None:
+    _REGIONAL_MEANS.clear()
+
+
+def regional_means(composites: DriverComposites) -> RegionalMeans:
+    """Regional mean LST and precipitation for the composites, fetched with a single getInfo.
+
+    Cached per reduction expression (region, window and sources), so each
+    (region, window) pays for the whole-region reduction once.
+    """
+    reduction = _reduce_regional_means(composites)
+    key = ee_fingerprint(reduction)
+    if key is not None:
+        cached = _REGIONAL_MEANS.get(key)
+        if cached is not None:
+            metrics().increment("risk.regional_means.cache_hits")
+            return cached
+    metrics().increment("risk.regional_means.cache_misses")
+
+    try:
+        values = reduction.getInfo()
+    except Exception as e:
+        raise DataUnavailableError("Failed to compute regional means") from e
+    lst_c = values.get("lst_c") if isinstance(values, dict) else None
+    precip_mm = values.get("precip_mm") if isinstance(values, dict) else None
+    if lst_c is None or precip_mm is None:
+        raise DataUnavailableError("No valid pixels for regional means in the selected region and date range")
+
+    means = RegionalMeans(lst_c=float(lst_c), precip_mm=float(precip_mm))
+    if key is not None:
+        _REGIONAL_MEANS.put(key, means)
+    return means
+
+
+def cube_regional_means(
+    *,
+    repo_root: Path,
+    location_geometry: dict,
+    location_bbox: tuple[float, float, float, float] | None,
+    start_date: date,
+    end_date: date,
+    sources: SourcesConfig,
+) -> RegionalMeans | None:
+    """`regional_means` composed from the monthly aggregate cube; None when the cube does not cover the range.
+
+    Only the means use the cube: whole months are local reads, and the partial-month
+    edges are still reduced by Earth Engine on the request path. The map tiles are
+    unaffected and are still rendered from `build_driver_composites` over the daily
+    collections.
+    """
+    local = local_region(location_geometry=location_geometry, location_bbox=location_bbox)
+    if local is None:
+        return None
+    image_sets = [sources.eeimagesets.get(k) for k in ("vegetation", "land_surface_temperature", "precipitation")]
+    payload = json.dumps([local.bbox, local.geometry, str(start_date), str(end_date), image_sets], sort_keys=True)
+    key = "cube|" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    cached = _REGIONAL_MEANS.get(key)
+    if cached is not None:
+        metrics().increment("risk.regional_means.cache_hits")
+        return cached
+
+    # The cube pulls in numpy; keep it off the import path.
+    from backend.src.infra.aggregate_cube import aggregate_cube
+
+    cube = aggregate_cube(repo_root, sources=sources)
+    if not cube.covers(start_date, end_date, local.bbox):
+        return None
+    try:
+        values = cube.region_means(start_date, end_date, local.bbox, local.geometry)
+    except DataUnavailableError as e:
+        logger.warning(f"Aggregate cube could not compose {start_date}..{end_date}: {e}")
+        return None
+    lst_c, precip_mm = values.get("lst_c"), values.get("precip_mm")
+    if lst_c is None or precip_mm is None:
+        return None
+
+    means = RegionalMeans(lst_c=lst_c, precip_mm=precip_mm)
+    metrics().increment("risk.regional_means.cube_hits")
+    _REGIONAL_MEANS.put(key, means)
+    return means
+
+
+def build_risk_image(composites: DriverComposites, *, means: RegionalMeans | None = None):
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+    region = composites.region
+    start_date = composites.start_date
+    end_date = composites.end_date
 
-    # Extract as ee.Number (server-side) - NOT .getInfo() (client-side)
-    mean_lst = ee.Number(mean_lst_dict.get("LST_Day_1km"))
-    mean_rain = ee.Number(mean_rain_dict.get("precipitation"))
+    logger.info(f"Building risk image for region {region} from {start_date} to {end_date}")
+
+    # T104: Combine the shared driver composites into a single image for pixel-aligned operations
+    ndvi = composites.ndvi.rename("NDVI")
+    lst_img = composites.lst_c.rename("LST_Day_1km")
+    precip_img = composites.precip_mm.rename("precipitation")
+    combined = ndvi.addBands(lst_img).addBands(precip_img)
+
+    # T103: Regional means are materialized once and embedded as constants, so rendering a
+    # tile only does per-pixel work instead of re-reducing the whole region.
+    means = means or regional_means(composites)
+    mean_lst = means.lst_c
+    mean_rain = means.precip_mm
 
     # T107: Log regional statistics (will appear in server logs)
-    logger.info(f"Computing pixel-wise risk classification for date range {start_date} to {end_date}")
+    logger.info(
+        f"Computing pixel-wise risk classification for date range {start_date} to {end_date} "
+        f"(mean LST {mean_lst:.2f} C, mean precipitation {mean_rain:.2f} mm)"
+    )
 
     # T102 & T105: Pixel-wise classification matching notebook cell 8 logic
     # Select bands from combined image
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+import logging
+from pathlib import Path
+from typing import Callable, Mapping
+
+import numpy as np
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import cache_paths
+from backend.src.infra.metrics import metrics
+from backend.src.infra.raster_store import (
+    BBox,
+    RasterGrid,
+    RasterStore,
+    month_bounds,
+    months_between,
+    region_means,
+    region_tiles,
+    shared_store,
+)
+from backend.src.infra.sources import SourcesConfig
+
+logger = logging.getLogger(__name__)
+
+# Per-pixel partials that compose by addition (sums, counts) plus per-month medians.
+AGGREGATE_BANDS: tuple[str, ...] = ("precip_sum", "lst_sum", "lst_count", "ndvi_median", "ndwi_median")
+
+# Computes AGGREGATE_BANDS on `grid` for [start, end) — used for partial-month edges and missing months.
+EdgeSource = Callable[[BBox, RasterGrid, date, date], Mapping[str, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class RangePlan:
+    """A date range split into whole months and at most two partial-month edges ([start, end) each)."""
+
+    months: tuple[str, ...]
+    edges: tuple[tuple[date, date], ...]
+
+
+def plan_range(start: date, end: date) -> RangePlan:
+    """Split the inclusive range [start, end] into whole months plus leading/trailing partial months."""
+    if end < start:
+        raise ValueError("end must not be before start")
+    stop = end + timedelta(days=1)
+    months: list[str] = []
+    edges: list[tuple[date, date]] = []
+    for month in months_between(start, end):
+        month_start, month_end = month_bounds(month)
+        lo, hi = max(start, month_start), min(stop, month_end)
+        if (lo, hi) == (month_start, month_end):
+            months.append(month)
+        else:
+            edges.append((lo, hi))
+    return RangePlan(months=tuple(months), edges=tuple(edges))
+
+
+class AggregateCube:
+    """Monthly partial aggregates per region tile, composed into arbitrary date ranges.
+
+    Precipitation and LST compose exactly (sums and counts add up). NDVI/NDWI use the
+    median of the monthly medians, an approximation of the full-window median. Ranges
+    cost one read per month; partial edges and months missing from the store go to
+    `edge_source` (Earth Engine by default), or raise `DataUnavailableError` without one.
+    Tiles already in the store keep their stored grid; `pixel_size` only sets up new ones.
+    """
+
+    def __init__(
+        self,
+        store: RasterStore,
+        *,
+        tile_degrees: float = 1.0,
+        pixel_size: float = 0.01,
+        edge_source: EdgeSource | None = None,
+    ) -> None:
+        self._store = store
+        self._tile_degrees = tile_degrees
+        self._pixel_size = pixel_size
+        self._edge_source = edge_source
+
+    @property
+    def store(self) -> RasterStore:
+        return self._store
+
+    def covers(self, start: date, end: date, bbox: BBox) -> bool:
+        """Whether every whole month of [start, end] is stored for every tile under `bbox`.
+
+        Only the partial-month edges are then left to compute; a range without any
+        whole month is not worth composing.
+        """
+        plan = plan_range(start, end)
+        if not plan.months:
+            return False
+        for region_id, tile_bbox in region_tiles(bbox, tile_degrees=self._tile_degrees):
+            if self._tile_grid(region_id, tile_bbox).window(bbox) is None:
+                continue
+            if not all(self._store.has(region_id, month) for month in plan.months):
+                return False
+        return True
+
+    def compose(self, start: date, end: date, bbox: BBox) -> list[dict[str, np.ndarray]]:
+        """Driver composites (ndvi, ndwi, lst_c, precip_mm) over `bbox` for [start, end], per region tile."""
+        return [bands for _grid, bands in self._compose(start, end, bbox)]
+
+    def region_means(self, start: date, end: date, bbox: BBox, geometry: dict | None = None) -> dict[str, float | None]:
+        """Driver means over `geometry` (or all of `bbox`) for [start, end]."""
+        return region_means(self._compose(start, end, bbox), geometry)
+
+    def _compose(self, start: date, end: date, bbox: BBox) -> list[tuple[RasterGrid, dict[str, np.ndarray]]]:
+        plan = plan_range(start, end)
+        out: list[tuple[RasterGrid, dict[str, np.ndarray]]] = []
+        for region_id, tile_bbox in region_tiles(bbox, tile_degrees=self._tile_degrees):
+            grid = self._tile_grid(region_id, tile_bbox)
+            window = grid.window(bbox)
+            if window is None:
+                continue
+            partials = [self._month(region_id, tile_bbox, grid, month) for month in plan.months]
+            partials.extend(self._edge(tile_bbox, grid, lo, hi) for lo, hi in plan.edges)
+            rows, cols = window
+            composite = _finalize([{k: v[rows, cols] for k, v in p.items()} for p in partials])
+            out.append((grid.subgrid(rows, cols), composite))
+        metrics().increment("cube.months_read", len(plan.months))
+        metrics().increment("cube.edges_computed", len(plan.edges))
+        return out
+
+    def _tile_grid(self, region_id: str, tile_bbox: BBox) -> RasterGrid:
+        """The grid the tile's months were stored on; the configured pixel size only for new tiles."""
+        return self._store.grid(region_id) or RasterGrid.covering(tile_bbox, pixel_size=self._pixel_size)
+
+    def _month(self, region_id: str, tile_bbox: BBox, grid: RasterGrid, month: str) -> Mapping[str, np.ndarray]:
+        tile = self._store.get(region_id, month)
+        if tile is not None and tile.grid == grid:
+            return tile.bands
+        if tile is not None:
+            # Stored on another grid by an earlier build; recompute on this one but leave it in place.
+            logger.warning(f"Aggregate cube month {region_id}/{month} is on a different grid; recomputing")
+        lo, hi = month_bounds(month)
+        bands = self._edge(tile_bbox, grid, lo, hi)
+        # Whole months never change once past, so keep what was computed.
+        if tile is None and hi <= date.today():
+            self._store.put(region_id, month, grid, bands)
+        return bands
+
+    def _edge(self, tile_bbox: BBox, grid: RasterGrid, lo: date, hi: date) -> Mapping[str, np.ndarray]:
+        if self._edge_source is None:
+            raise DataUnavailableError(f"Aggregate cube has no data for {lo}..{hi}")
+        return self._edge_source(tile_bbox, grid, lo, hi)
+
+
+def _finalize(partials: list[Mapping[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    precip = np.stack([p["precip_sum"] for p in partials])
+    lst_sum = np.stack([p["lst_sum"] for p in partials])
+    lst_count = np.stack([p["lst_count"] for p in partials])
+    ndvi = np.stack([p["ndvi_median"] for p in partials])
+    ndwi = np.stack([p["ndwi_median"] for p in partials])
+
+    count = np.nansum(lst_count, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lst_c = np.where(count > 0, np.nansum(lst_sum, axis=0) / count, np.nan)
+    # All-NaN pixels stay NaN instead of summing to 0.
+    precip_mm = np.where(np.all(np.isnan(precip), axis=0), np.nan, np.nansum(precip, axis=0))
+    return {
+        "ndvi": _nanmedian(ndvi),
+        "ndwi": _nanmedian(ndwi),
+        "lst_c": lst_c.astype(np.float32),
+        "precip_mm": precip_mm.astype(np.float32),
+    }
+
+
+def _nanmedian(stack: np.ndarray) -> np.ndarray:
+    out = np.full(stack.shape[1:], np.nan, dtype=np.float32)
+    valid = ~np.all(np.isnan(stack), axis=0)
+    if valid.any():
+        out[valid] = np.nanmedian(stack[:, valid], axis=0)
+    return out
+
+
+def ee_edge_source(sources: SourcesConfig) -> EdgeSource:
+    """Compute aggregate partials for any [start, end) window in Earth Engine."""
+
+    def _compute(tile_bbox: BBox, grid: RasterGrid, start: date, end: date) -> Mapping[str, np.ndarray]:
+        import ee  # type: ignore
+
+        from backend.src.infra.ee_composites import driver_collections
+        from backend.src.infra.raster_store import compute_pixels
+
+        region = ee.Geometry.Rectangle(list(tile_bbox))
+        collections = driver_collections(region=region, start_date=start, end_date=end, sources=sources)
+        lst_count = collections.lst.count()
+        # Sum of per-image Celsius values: 0.02 * sum(raw) - 273.15 * count.
+        lst_sum = collections.lst.sum().multiply(0.02).subtract(lst_count.multiply(273.15))
+        s2_img = collections.s2.median()
+        image = ee.Image.cat(
+            [
+                collections.chirps.sum(),
+                lst_sum,
+                lst_count,
+                s2_img.normalizedDifference(["B8", "B4"]),
+                s2_img.normalizedDifference(["B3", "B8"]),
+            ]
+        )
+        bands = compute_pixels(image, grid, AGGREGATE_BANDS)
+        # A pixel with no LST observations has a zero count, not a missing one.
+        bands["lst_count"] = np.nan_to_num(bands["lst_count"], nan=0.0)
+        return bands
+
+    return _compute
+
+
+def aggregate_cube(repo_root: Path, *, sources: SourcesConfig | None = None) -> AggregateCube:
+    store = shared_store(cache_paths(repo_root).subdir("cube"))
+    return AggregateCube(store, edge_source=ee_edge_source(sources) if sources is not None else None)
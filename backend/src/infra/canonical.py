@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from calendar import monthrange
+from dataclasses import replace
+from datetime import date
+import hashlib
+import json
+import math
+
+from backend.src.domain.models import Location
+from backend.src.infra.config import AppConfig
+from backend.src.infra.geocoding import GeocodingResult, location_from_geocoding
+
+
+def snap_point(lng: float, lat: float, *, cell_degrees: float) -> tuple[float, float]:
+    """Centre of the fixed grid cell containing (lng, lat)."""
+    return (
+        round((math.floor(lng / cell_degrees) + 0.5) * cell_degrees, 6),
+        round((math.floor(lat / cell_degrees) + 0.5) * cell_degrees, 6),
+    )
+
+
+def canonicalize_result(result: GeocodingResult, *, cell_degrees: float | None) -> GeocodingResult:
+    """Snap point results to grid-cell centres so nearby addresses share one buffered region."""
+    geometry = result.geometry
+    if not cell_degrees or not isinstance(geometry, dict) or geometry.get("type") != "Point":
+        return result
+    lng, lat = geometry["coordinates"]
+    snapped = snap_point(float(lng), float(lat), cell_degrees=cell_degrees)
+    return replace(result, geometry={"type": "Point", "coordinates": list(snapped)})
+
+
+def canonicalize_dates(start: date, end: date, *, mode: str) -> tuple[date, date]:
+    """Widen a range to whole months in "month" mode; "day" (the default) leaves it as is.
+
+    The snapped end never moves past today, so it stays a valid request.
+    """
+    if mode != "month":
+        return start, end
+    month_end = date(end.year, end.month, monthrange(end.year, end.month)[1])
+    return date(start.year, start.month, 1), min(month_end, max(end, date.today()))
+
+
+def location_id(result: GeocodingResult) -> str:
+    """Content-derived id: the same geometry always gets the same id."""
+    payload = json.dumps({"geometry": result.geometry, "bbox": result.bbox}, sort_keys=True, default=list)
+    return "loc-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def canonical_location(location_text: str, result: GeocodingResult) -> Location:
+    """Build the request Location, snapping point regions to the grid when canonicalization is on."""
+    result = canonicalize_result(result, cell_degrees=AppConfig().canonical_grid_degrees)
+    return location_from_geocoding(location_id(result), location_text, result)
+
+
+def canonical_dates(start: date, end: date) -> tuple[date, date]:
+    return canonicalize_dates(start, end, mode=AppConfig().canonical_date_mode)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import contextvars
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+import weakref
+
+from backend.src.infra.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FanOutResult(Generic[T]):
+    values: dict[str, T] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+_EE_EXECUTOR: ThreadPoolExecutor | None = None
+_EE_EXECUTOR_LOCK = threading.Lock()
+
+
+def ee_executor() -> ThreadPoolExecutor:
+    """Bounded pool for blocking Earth Engine round trips (getMapId, getInfo)."""
+    global _EE_EXECUTOR
+    with _EE_EXECUTOR_LOCK:
+        if _EE_EXECUTOR is None:
+            _EE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=AppConfig().ee_max_concurrency,
+                thread_name_prefix="ee",
+            )
+        return _EE_EXECUTOR
+
+
+def fan_out(
+    tasks: dict[str, Callable[[], T]],
+    *,
+    timeout_seconds: float,
+    executor: Executor | None = None,
+) -> FanOutResult[T]:
+    """Run independent blocking calls concurrently and collect per-task results.
+
+    Every task shares one deadline, so total latency tracks the slowest task rather
+    than the sum. Failed or timed-out tasks are reported in `errors` instead of
+    raising, leaving the caller to decide which failures are fatal.
+    """
+    pool = executor or ee_executor()
+    futures: dict[str, Future[T]] = {}
+    for name, task in tasks.items():
+        # Copy the context so request-id logging survives the hop to a worker thread.
+        ctx = contextvars.copy_context()
+        futures[name] = pool.submit(ctx.run, task)
+
+    deadline = time.monotonic() + timeout_seconds
+    result: FanOutResult[T] = FanOutResult()
+    for name, future in futures.items():
+        remaining = max(0.0, deadline - time.monotonic())
+        try:
+            result.values[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(f"Task {name} timed out after {timeout_seconds:.1f}s")
+            result.errors[name] = f"Timed out after {timeout_seconds:.0f}s"
+        except Exception as e:
+            logger.warning(f"Task {name} failed: {e}")
+            result.errors[name] = str(e) or type(e).__name__
+    return result
+
+
+_UPSTREAM_LIMITERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def upstream_limiter(upstream: str) -> asyncio.Semaphore:
+    """Per-event-loop semaphore capping in-flight calls to one upstream service."""
+    loop = asyncio.get_running_loop()
+    limiters = _UPSTREAM_LIMITERS.setdefault(loop, {})
+    limiter = limiters.get(upstream)
+    if limiter is None:
+        capacity = AppConfig().upstream_limits.get(upstream)
+        if capacity is None:
+            raise ValueError(f"Unknown upstream: {upstream}")
+        limiter = asyncio.Semaphore(capacity)
+        limiters[upstream] = limiter
+    return limiter
+
+
+async def run_blocking(fn: Callable[[], T], *, upstream: str) -> T:
+    """Bridge a blocking call (e.g. an Earth Engine pipeline) onto a worker thread.
+
+    Waiting for the upstream limiter costs a suspended coroutine rather than a thread,
+    so a single worker can hold many queued requests.
+    """
+    async with upstream_limiter(upstream):
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(None, ctx.run, fn)
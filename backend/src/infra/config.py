@@ -1,6 +1,86 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
+from backend.src.domain.errors import DataUnavailableError
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError as e:
+        raise ValueError(f"{name} must be an integer") from e
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError as e:
+        raise ValueError(f"{name} must be a number") from e
+
 
 class AppConfig:
     def __init__(self) -> None:
         self.environment = "dev"
+        # Earth Engine OAuth access tokens live for an hour; re-initialize well before that.
+        self.ee_refresh_interval_seconds = _env_int("GEOEMERGE_EE_REFRESH_SECONDS", 45 * 60)
+        self.ee_health_check_interval_seconds = _env_int("GEOEMERGE_EE_HEALTH_CHECK_SECONDS", 5 * 60)
+        # Map ids share the lifetime of the token they were minted with.
+        self.mapid_cache_ttl_seconds = _env_int("GEOEMERGE_MAPID_CACHE_TTL_SECONDS", 45 * 60)
+        self.mapid_cache_max_entries = _env_int("GEOEMERGE_MAPID_CACHE_MAX_ENTRIES", 512)
+        # Regional means depend only on (region, window, sources); past windows never change.
+        self.regional_means_ttl_seconds = _env_int("GEOEMERGE_REGIONAL_MEANS_TTL_SECONDS", 24 * 60 * 60)
+        # Monthly driver means share that TTL; cached per (region, month), so series grow incrementally.
+        self.timeseries_cache_max_entries = _env_int("GEOEMERGE_TIMESERIES_CACHE_MAX_ENTRIES", 8192)
+        self.timeseries_max_months = _env_int("GEOEMERGE_TIMESERIES_MAX_MONTHS", 120)
+        # The /api/risk/default response is recomputed in the background before its map tokens expire.
+        # A value <= 0 disables the background refresh.
+        self.default_response_refresh_seconds = _env_int("GEOEMERGE_DEFAULT_RESPONSE_REFRESH_SECONDS", 30 * 60)
+        self.default_response_retry_seconds = _env_int("GEOEMERGE_DEFAULT_RESPONSE_RETRY_SECONDS", 60)
+        self.ee_max_concurrency = _env_int("GEOEMERGE_EE_MAX_CONCURRENCY", 8)
+        self.ee_layer_timeout_seconds = _env_int("GEOEMERGE_EE_LAYER_TIMEOUT_SECONDS", 30)
+        # POST /api/risk/batch: distinct locations per request, and how many are computed at once.
+        self.risk_batch_max_locations = _env_int("GEOEMERGE_RISK_BATCH_MAX_LOCATIONS", 500)
+        self.risk_batch_concurrency = _env_int("GEOEMERGE_RISK_BATCH_CONCURRENCY", 4)
+        # Opt-in canonicalization: snap point regions to a grid (degrees; 0 = off) and date
+        # ranges to "day" (unchanged) or "month", so nearby and repeated queries share layers.
+        self.canonical_grid_degrees = _env_float("GEOEMERGE_CANONICAL_GRID_DEGREES", 0.0) or None
+        self.canonical_date_mode = os.environ.get("GEOEMERGE_CANONICAL_DATES", "day").strip().lower() or "day"
+        if self.canonical_date_mode not in {"day", "month"}:
+            raise ValueError("GEOEMERGE_CANONICAL_DATES must be 'day' or 'month'")
+        # Geocoded polygons are simplified to this many vertices before they reach Earth Engine.
+        self.geometry_max_vertices = _env_int("GEOEMERGE_GEOMETRY_MAX_VERTICES", 2000)
+        self.florida_boundary_max_vertices = _env_int("GEOEMERGE_FLORIDA_BOUNDARY_MAX_VERTICES", 5000)
+        self.geocode_memory_entries = _env_int("GEOEMERGE_GEOCODE_MEMORY_ENTRIES", 4096)
+        # Tile proxy: when a base URL (e.g. "http://127.0.0.1:8000") is set, responses point clients at
+        # /tiles/... on this server instead of Earth Engine, so tokens stay server-side.
+        self.tile_proxy_base_url = os.environ.get("GEOEMERGE_TILE_PROXY_BASE_URL", "").strip().rstrip("/") or None
+        self.tile_cache_max_bytes = _env_int("GEOEMERGE_TILE_CACHE_MAX_MB", 512) * 1024 * 1024
+        self.tile_cache_max_age_seconds = _env_int("GEOEMERGE_TILE_CACHE_MAX_AGE_SECONDS", 24 * 60 * 60)
+        self.tile_upstream_timeout_seconds = _env_int("GEOEMERGE_TILE_UPSTREAM_TIMEOUT_SECONDS", 20)
+        # Scheduled warm-up of map ids and tiles for Florida counties; a value <= 0 disables it.
+        self.preseed_interval_seconds = _env_int("GEOEMERGE_PRESEED_INTERVAL_SECONDS", 0)
+        self.preseed_min_zoom = _env_int("GEOEMERGE_PRESEED_MIN_ZOOM", 6)
+        self.preseed_max_zoom = _env_int("GEOEMERGE_PRESEED_MAX_ZOOM", 10)
+        # Cached dataset downloads are revalidated with a conditional GET once this old; 0 = never.
+        self.dataset_revalidate_seconds = _env_int("GEOEMERGE_DATASET_REVALIDATE_SECONDS", 0) or None
+        # Concurrency caps for the async request path, per upstream service.
+        self.upstream_limits = {
+            "earthengine": _env_int("GEOEMERGE_EE_MAX_INFLIGHT", 16),
+            "nominatim": _env_int("GEOEMERGE_NOMINATIM_MAX_CONCURRENCY", 2),
+        }
+
+
+def find_repo_root(start: str | Path | None = None) -> Path:
+    current = Path(start).resolve() if start is not None else Path(__file__).resolve()
+    for parent in [current.parent, *current.parents]:
+        if (parent / "pyproject.toml").exists():
+            return parent
+    raise DataUnavailableError("Could not locate repo root (pyproject.toml not found)")
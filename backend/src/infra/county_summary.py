@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable
+
+import numpy as np
+
+from backend.src.domain.errors import LocationNotFoundError
+from backend.src.infra.cache import cache_paths
+from backend.src.infra.gazetteer import normalize_county_name
+from backend.src.infra.metrics import metrics
+from backend.src.infra.observations import ObservationIndex
+from backend.src.infra.sources import SourcesConfig
+
+logger = logging.getLogger(__name__)
+
+_TABLE_VERSION = 2
+_UNKNOWN = "unknown"
+_NO_YEAR = -1
+
+
+@dataclass(frozen=True)
+class Counties:
+    """County ids, names and shapely polygons, index-aligned."""
+
+    geoids: tuple[str, ...]
+    names: tuple[str, ...]
+    geometries: Any
+
+
+CountiesLoader = Callable[[], Counties]
+
+
+def florida_counties_loader(*, repo_root: Path, sources: SourcesConfig) -> CountiesLoader:
+    def _load() -> Counties:
+        from backend.src.infra.regions import florida_counties_geodataframe
+
+        gdf = florida_counties_geodataframe(repo_root=repo_root, sources=sources)
+        return Counties(
+            geoids=tuple(gdf["GEOID"].astype(str)),
+            names=tuple(gdf["NAME"].astype(str)),
+            geometries=gdf.geometry.to_numpy(),
+        )
+
+    return _load
+
+
+def assign_counties(lon: np.ndarray, lat: np.ndarray, counties: Counties) -> np.ndarray:
+    """Index into `counties` of the polygon containing each point, or -1 outside all of them.
+
+    One STRtree query over prepared polygons replaces a spatial join per county.
+    """
+    import shapely
+
+    shapely.prepare(counties.geometries)
+    tree = shapely.STRtree(counties.geometries)
+    point_idx, county_idx = tree.query(shapely.points(lon, lat), predicate="within")
+    out = np.full(len(lon), -1, dtype=np.int64)
+    out[point_idx] = county_idx
+    return out
+
+
+def observation_keys(table) -> np.ndarray:
+    """Identity of every row: a 128-bit digest of all its fields plus its ordinal among identical rows.
+
+    Observations carry no row id of their own. Identical rows stay distinct through the
+    ordinal, and the digest is wide enough that different rows do not collide in practice.
+    """
+    import pandas as pd
+
+    frame = table.drop_columns([c for c in ("cell",) if c in table.column_names]).to_pandas()
+    lo = pd.util.hash_pandas_object(frame, index=False, hash_key="geoemerge-rows-0").to_numpy(np.uint64)
+    hi = pd.util.hash_pandas_object(frame, index=False, hash_key="geoemerge-rows-1").to_numpy(np.uint64)
+    digest = np.stack([lo, hi], axis=1)
+    ordinal = pd.DataFrame(digest).groupby([0, 1]).cumcount().to_numpy(np.uint64)
+    return np.ascontiguousarray(np.column_stack([digest, ordinal])).view("S24").ravel()
+
+
+class CountySummaryTable:
+    """Per-county sighting counts by year and water source, with mitigation (eliminated) counts.
+
+    Each observation is assigned to its county once. `refresh` counts only rows it has
+    not seen before, so a re-ingest with new sightings never re-joins the whole dataset.
+    If a re-ingest removed or changed any counted row, the table is rebuilt instead, so
+    totals always match a full count. The table and the keys of counted rows persist
+    under `root`.
+    """
+
+    def __init__(self, root: Path, *, counties: CountiesLoader) -> None:
+        self._root = root
+        self._load_counties = counties
+        self._counties: Counties | None = None
+        self._lock = threading.Lock()
+        self._names: dict[str, str] = {}
+        # (geoid, year, water_source_type, water_source) -> [total, eliminated]
+        self._counts: dict[tuple[str, int, str, str], list[int]] = {}
+        self._seen = np.empty(0, dtype="S24")
+        self._refreshed_from: ObservationIndex | None = None
+        self._load()
+
+    def _load(self) -> None:
+        path = self._root / "mosquito.json"
+        seen_path = self._root / "mosquito_seen.npy"
+        if not (path.exists() and seen_path.exists()):
+            return
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        if raw.get("version") != _TABLE_VERSION:
+            return
+        self._names = raw["counties"]
+        self._counts = {(g, y, t, s): [n, e] for g, y, t, s, n, e in raw["counts"]}
+        self._seen = np.load(seen_path)
+
+    def _save(self) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        seen_tmp = self._root / "mosquito_seen.npy.tmp"
+        with seen_tmp.open("wb") as f:
+            np.save(f, self._seen)
+        os.replace(seen_tmp, self._root / "mosquito_seen.npy")
+        tmp = self._root / "mosquito.json.tmp"
+        payload = {
+            "version": _TABLE_VERSION,
+            "counties": self._names,
+            "counts": [[*key, *value] for key, value in sorted(self._counts.items())],
+        }
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self._root / "mosquito.json")
+
+    def refresh(self, index: ObservationIndex) -> int:
+        """Bring the table up to date with `index`; returns how many rows were counted."""
+        with self._lock:
+            if self._refreshed_from is index:
+                return 0
+            table = index.table
+            keys = observation_keys(table)
+            if not np.isin(self._seen, keys).all():
+                logger.info("Observations were removed or changed since the last count; rebuilding county summary")
+                metrics().increment("counties.rebuilds")
+                self._counts = {}
+                self._seen = np.empty(0, dtype="S24")
+            new = ~np.isin(keys, self._seen)
+            added = int(new.sum())
+            if added:
+                self._add(table, np.flatnonzero(new))
+                self._seen = np.union1d(self._seen, keys[new])
+                self._save()
+                logger.info(f"County summary counted {added} observations")
+            metrics().increment("counties.rows_assigned", added)
+            self._refreshed_from = index
+            return added
+
+    def _add(self, table, rows: np.ndarray) -> None:
+        import pyarrow.compute as pc
+
+        if self._counties is None:
+            self._counties = self._load_counties()
+        counties = self._counties
+        # Every county gets a row, so ones without sightings report zeros rather than "not found".
+        self._names.update(zip(counties.geoids, counties.names))
+        subset = table.take(rows)
+        county = assign_counties(subset.column("lon").to_numpy(), subset.column("lat").to_numpy(), counties)
+        years = pc.fill_null(pc.year(subset.column("measured_at")), _NO_YEAR).to_numpy()
+        kinds = pc.fill_null(subset.column("water_source_type"), _UNKNOWN).to_pylist()
+        sources = pc.fill_null(subset.column("water_source"), _UNKNOWN).to_pylist()
+        eliminated = pc.fill_null(subset.column("breeding_ground_eliminated"), False).to_numpy(zero_copy_only=False)
+
+        for i in np.flatnonzero(county >= 0):
+            geoid = counties.geoids[county[i]]
+            counts = self._counts.setdefault((geoid, int(years[i]), kinds[i], sources[i]), [0, 0])
+            counts[0] += 1
+            counts[1] += int(bool(eliminated[i]))
+
+    def find(self, name: str) -> str | None:
+        """GEOID for a county name such as "Broward", "broward county" or "Broward County, FL"."""
+        wanted = _county_key(name)
+        with self._lock:
+            for geoid, county in self._names.items():
+                if _county_key(county) == wanted:
+                    return geoid
+        return None
+
+    def summary(self, geoid: str) -> dict[str, Any]:
+        with self._lock:
+            rows = [(key, value) for key, value in self._counts.items() if key[0] == geoid]
+            name = self._names.get(geoid)
+        if name is None:
+            raise LocationNotFoundError(f"Unknown county {geoid}")
+
+        total = sum(v[0] for _, v in rows)
+        eliminated = sum(v[1] for _, v in rows)
+        by_year: dict[int, list[int]] = {}
+        by_type: dict[str, int] = {}
+        by_source: dict[str, int] = {}
+        for (_, year, kind, source), (n, e) in rows:
+            if year != _NO_YEAR:
+                acc = by_year.setdefault(year, [0, 0])
+                acc[0] += n
+                acc[1] += e
+            by_type[kind] = by_type.get(kind, 0) + n
+            by_source[source] = by_source.get(source, 0) + n
+
+        return {
+            "county": name,
+            "geoid": geoid,
+            "total": total,
+            "eliminated": eliminated,
+            "mitigation_rate": eliminated / total if total else None,
+            "by_year": [
+                {"year": year, "count": n, "eliminated": e, "mitigation_rate": e / n if n else None}
+                for year, (n, e) in sorted(by_year.items())
+            ],
+            "by_water_source_type": _ranked(by_type),
+            "by_water_source": _ranked(by_source),
+        }
+
+
+def _county_key(name: str) -> str:
+    """`normalize_county_name` of the county part of "Broward County, FL" and similar, as the geocoder does."""
+    return normalize_county_name(name.split(",")[0].strip().lower().removesuffix(" county"))
+
+
+def _ranked(counts: dict[str, int]) -> list[dict[str, Any]]:
+    return [{"value": k, "count": n} for k, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+
+_TABLES: dict[Path, CountySummaryTable] = {}
+_TABLES_LOCK = threading.Lock()
+
+
+def county_summary_table(repo_root: Path, *, sources: SourcesConfig) -> CountySummaryTable:
+    key = Path(repo_root).resolve()
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is None:
+            table = CountySummaryTable(
+                cache_paths(key).subdir("counties"),
+                counties=florida_counties_loader(repo_root=key, sources=sources),
+            )
+            _TABLES[key] = table
+        return table
+
+
+def reset_county_summaries() -> None:
+    with _TABLES_LOCK:
+        _TABLES.clear()
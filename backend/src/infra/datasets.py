@@ -1,15 +1,30 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import json
+import logging
+import os
+import urllib.error
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
-import shutil
+import threading
+import time
 from zipfile import ZipFile
 
 from backend.src.domain.errors import DataUnavailableError
 from backend.src.infra.cache import CachePaths
+from backend.src.infra.config import AppConfig
+from backend.src.infra.metrics import metrics
+from backend.src.infra.sources import SourcesConfig
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+_CHUNK_BYTES = 1024 * 1024
+_MANIFEST_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -23,44 +38,191 @@ def _sha256(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _DownloadManifest:
+    """Per-URL validators (ETag/Last-Modified) and the hash of each file as it was downloaded.
+
+    The hash is not checked against a published value; it only detects a cached copy
+    that was truncated or changed on disk after the download. Stored as `manifest.json`
+    next to the downloads. Every update re-reads the file under a process-wide lock, so
+    parallel prefetches never drop each other's entries.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def _read(self) -> dict:
+        if self._path.exists():
+            try:
+                raw = json.loads(self._path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"Ignoring unreadable dataset manifest {self._path}")
+                raw = {}
+            if raw.get("version") == _MANIFEST_VERSION:
+                return raw
+        return {"version": _MANIFEST_VERSION, "files": {}}
+
+    def get(self, url: str) -> dict | None:
+        with _MANIFEST_LOCK:
+            return self._read()["files"].get(url)
+
+    def update(self, url: str, **fields) -> dict:
+        with _MANIFEST_LOCK:
+            manifest = self._read()
+            entry = {**manifest["files"].get(url, {}), **fields}
+            manifest["files"][url] = entry
+            tmp = self._path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self._path)
+            return entry
+
+
+def _record(manifest: _DownloadManifest, url: str, dest: Path, **fields) -> dict:
+    stat = dest.stat()
+    return manifest.update(
+        url,
+        file=dest.name,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=_file_sha256(dest),
+        checked_at=time.time(),
+        **fields,
+    )
+
+
+def _verified(manifest: _DownloadManifest, url: str, dest: Path, entry: dict) -> bool:
+    """Whether `dest` is the file the manifest describes; re-hashes only if its mtime moved."""
+    stat = dest.stat()
+    if stat.st_size != entry.get("size"):
+        return False
+    if stat.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    if _file_sha256(dest) != entry.get("sha256"):
+        return False
+    manifest.update(url, mtime_ns=stat.st_mtime_ns)
+    return True
+
+
+def _fetch(url: str, dest: Path, manifest: _DownloadManifest, entry: dict | None, *, timeout: float) -> Path:
+    part = dest.with_suffix(dest.suffix + ".part")
+    headers: dict[str, str] = {}
+    partial = (entry or {}).get("partial") or {}
+    offset = part.stat().st_size if part.exists() else 0
+    if offset and (partial.get("etag") or partial.get("last_modified")):
+        # If-Range makes the server send the whole file instead if it changed meanwhile.
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+    else:
+        offset = 0
+        if entry is not None and dest.exists():
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            resumed = response.status == 206
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            manifest.update(url, partial=validators)
+            expected = response.headers.get("Content-Length")
+            written = 0
+            with part.open("ab" if resumed else "wb") as f:
+                for chunk in iter(lambda: response.read(_CHUNK_BYTES), b""):
+                    f.write(chunk)
+                    written += len(chunk)
+            if expected is not None and written != int(expected):
+                raise DataUnavailableError(f"Download of {url} was truncated at {offset + written} bytes")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            metrics().increment("datasets.not_modified")
+            manifest.update(url, checked_at=time.time())
+            return dest
+        if e.code == 416 and offset:
+            # The partial file no longer lines up with the remote one; start over.
+            part.unlink(missing_ok=True)
+            manifest.update(url, partial=None)
+            return _fetch(url, dest, manifest, manifest.get(url), timeout=timeout)
+        raise DataUnavailableError(f"Failed to download dataset from {url}") from e
+    except DataUnavailableError:
+        raise
+    except Exception as e:
+        # The partial file is kept so the next attempt resumes where this one stopped.
+        raise DataUnavailableError(f"Failed to download dataset from {url}") from e
+
+    part.replace(dest)
+    metrics().increment("datasets.resumed" if resumed else "datasets.downloaded")
+    _record(manifest, url, dest, partial=None, **validators)
+    return dest
+
+
 def download_to_cache(
     url: str,
     cache: CachePaths,
     *,
     subdir: str = "datasets",
     ttl_seconds: int | None = None,
+    timeout: float = 60.0,
 ) -> Path:
+    """Download `url` into the cache once and reuse it while it matches the download manifest.
+
+    A cached file is reused as long as its size and hash match what was recorded when it
+    was downloaded; otherwise it is downloaded again. Once
+    `ttl_seconds` has passed, it is revalidated with a conditional GET, so an unchanged file
+    is not downloaded again. An interrupted download resumes with a Range request.
+    """
     target_dir = cache.subdir(subdir)
     filename = Path(urllib.parse.urlparse(url).path).name or _sha256(url)
     dest = target_dir / filename
+    manifest = _DownloadManifest(target_dir / "manifest.json")
+    entry = manifest.get(url)
 
     if dest.exists() and dest.stat().st_size > 0:
-        if ttl_seconds is None:
-            return dest
-        age = (dest.stat().st_mtime)
-        # simple TTL: compare mtime to now
-        import time
+        if entry is None or "sha256" not in entry:
+            # Downloaded before the manifest existed: adopt it as-is.
+            entry = _record(manifest, url, dest)
+        if _verified(manifest, url, dest, entry):
+            if ttl_seconds is None or (time.time() - entry["checked_at"]) <= ttl_seconds:
+                return dest
+        else:
+            logger.warning(f"Cached dataset {dest.name} changed since it was downloaded; downloading again")
+            dest.unlink()
+            entry = None
 
-        if (time.time() - age) <= ttl_seconds:
-            return dest
+    return _fetch(url, dest, manifest, entry, timeout=timeout)
 
-    tmp = dest.with_suffix(dest.suffix + ".tmp")
-    if tmp.exists():
-        tmp.unlink(missing_ok=True)
 
-    try:
-        with urllib.request.urlopen(url) as response:
-            with tmp.open("wb") as f:
-                shutil.copyfileobj(response, f, length=1024 * 1024)
-        tmp.replace(dest)
-        return dest
-    except Exception as e:
-        raise DataUnavailableError(f"Failed to download dataset from {url}") from e
+def _extracted_tree_matches(zf: ZipFile, out_dir: Path) -> bool:
+    for member in zf.infolist():
+        if member.is_dir():
+            continue
+        path = out_dir / member.filename
+        if not path.is_file() or path.stat().st_size != member.file_size:
+            return False
+    return True
+
 
 def extract_zip(zip_path: Path, cache: CachePaths, *, subdir: str) -> Path:
     out_dir = cache.subdir(subdir)
+    marker = out_dir / ".extracted.json"
+    stat = zip_path.stat()
+    source = {"archive": zip_path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
     try:
         with ZipFile(zip_path) as zf:
+            if marker.exists() and json.loads(marker.read_text(encoding="utf-8")) == source:
+                if _extracted_tree_matches(zf, out_dir):
+                    metrics().increment("datasets.extract_skipped")
+                    return out_dir
             for member in zf.infolist():
                 member_path = out_dir / member.filename
                 resolved = member_path.resolve()
@@ -69,11 +231,12 @@ def extract_zip(zip_path: Path, cache: CachePaths, *, subdir: str) -> Path:
             zf.extractall(out_dir)
     except Exception as e:
         raise DataUnavailableError(f"Failed to extract zip {zip_path}") from e
+    marker.write_text(json.dumps(source), encoding="utf-8")
     return out_dir
 
 
 def prepare_dataset(name: str, url: str, cache: CachePaths) -> DatasetArtifact:
-    downloaded = download_to_cache(url, cache)
+    downloaded = download_to_cache(url, cache, ttl_seconds=AppConfig().dataset_revalidate_seconds)
     suffix = downloaded.suffix.lower()
 
     if suffix == ".zip":
@@ -81,3 +244,24 @@ def prepare_dataset(name: str, url: str, cache: CachePaths) -> DatasetArtifact:
         return DatasetArtifact(name=name, url=url, local_path=extracted_dir)
 
     return DatasetArtifact(name=name, url=url, local_path=downloaded)
+
+
+def prefetch_datasets(
+    sources: SourcesConfig,
+    cache: CachePaths,
+    *,
+    max_workers: int = 4,
+) -> dict[str, DatasetArtifact | DataUnavailableError]:
+    """Prepare every `sources.datasets` entry in parallel; failures are returned, not raised."""
+
+    def _prepare(item: tuple[str, str]) -> DatasetArtifact | DataUnavailableError:
+        name, url = item
+        try:
+            return prepare_dataset(name, url, cache)
+        except DataUnavailableError as e:
+            logger.warning(f"Failed to prefetch dataset {name!r}: {e}")
+            return e
+
+    items = sorted(sources.datasets.items())
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="datasets") as pool:
+        return dict(zip((name for name, _ in items), pool.map(_prepare, items)))
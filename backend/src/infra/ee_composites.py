@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.sources import SourcesConfig
+
+
+@dataclass(frozen=True)
+class DriverComposites:
+    """Environmental driver images for one (region, date range, sources) request.
+
+    Built once per request and shared by the risk classifier and the overlay/driver
+    tiles, so each Earth Engine collection is filtered and reduced a single time.
+    """
+
+    region: Any
+    start_date: date
+    end_date: date
+    ndvi: Any
+    ndwi: Any
+    lst_c: Any
+    precip_mm: Any
+
+    @property
+    def window_days(self) -> int:
+        return (self.end_date - self.start_date).days + 1
+
+
+def _mask_s2_clouds(img):
+    qa = img.select("QA60")
+    cloud_bit_mask = 1 << 10
+    cirrus_bit_mask = 1 << 11
+    mask = qa.bitwiseAnd(cloud_bit_mask).eq(0).And(qa.bitwiseAnd(cirrus_bit_mask).eq(0))
+    return img.updateMask(mask)
+
+
+@dataclass(frozen=True)
+class DriverCollections:
+    """The filtered source collections behind `DriverComposites` (cloud-masked S2, raw MODIS LST, CHIRPS)."""
+
+    s2: Any
+    lst: Any
+    chirps: Any
+
+
+def driver_collections(
+    *, region: Any, start_date: date, end_date: date, sources: SourcesConfig, bounds: Any | None = None
+) -> DriverCollections:
+    """`bounds` (e.g. the region's bbox rectangle) is used for the cheap `filterBounds` scene selection."""
+    import ee  # type: ignore
+
+    s2_id = sources.eeimagesets.get("vegetation")
+    lst_id = sources.eeimagesets.get("land_surface_temperature")
+    chirps_id = sources.eeimagesets.get("precipitation")
+    if not (s2_id and lst_id and chirps_id):
+        raise DataUnavailableError("Earth Engine image sets are not configured")
+
+    footprint = bounds if bounds is not None else region
+    s2 = (
+        ee.ImageCollection(s2_id)
+        .filterDate(str(start_date), str(end_date))
+        .filterBounds(footprint)
+        .map(_mask_s2_clouds)
+    )
+    lst = (
+        ee.ImageCollection(lst_id)
+        .filterDate(str(start_date), str(end_date))
+        .filterBounds(footprint)
+        .select(["LST_Day_1km"])
+    )
+    chirps = (
+        ee.ImageCollection(chirps_id)
+        .filterDate(str(start_date), str(end_date))
+        .filterBounds(footprint)
+    )
+    return DriverCollections(s2=s2, lst=lst, chirps=chirps)
+
+
+def build_driver_composites(
+    *, region: Any, start_date: date, end_date: date, sources: SourcesConfig, bounds: Any | None = None
+) -> DriverComposites:
+    collections = driver_collections(
+        region=region, start_date=start_date, end_date=end_date, sources=sources, bounds=bounds
+    )
+
+    # Vegetation + standing water: one cloud-masked Sentinel-2 SR median feeds both NDVI and NDWI.
+    s2_img = collections.s2.median()
+    ndvi = s2_img.normalizedDifference(["B8", "B4"]).rename("ndvi").clip(region)
+    ndwi = s2_img.normalizedDifference(["B3", "B8"]).rename("ndwi").clip(region)
+
+    # Temperature: MODIS LST Day (Kelvin * 0.02), converted to Celsius.
+    lst_c = collections.lst.mean().multiply(0.02).subtract(273.15).rename("lst_c").clip(region)
+
+    # Precipitation: CHIRPS daily mm/day, summed over the window.
+    precip_mm = collections.chirps.sum().rename("precip_mm").clip(region)
+
+    return DriverComposites(
+        region=region,
+        start_date=start_date,
+        end_date=end_date,
+        ndvi=ndvi,
+        ndwi=ndwi,
+        lst_c=lst_c,
+        precip_mm=precip_mm,
+    )
+
@@ -1,6 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import hashlib
+import json
+import math
+from typing import Any
+
+from backend.src.infra.cache import TtlLruCache
+from backend.src.infra.config import AppConfig
+from backend.src.infra.metrics import metrics
+from backend.src.infra.regions import statewide_ee_region
+
+BBox = tuple[float, float, float, float]
+
+# Point locations (e.g. ZIP centroids) are widened to a 100-mile square.
+POINT_RADIUS_METERS = 160_934.0
+_METERS_PER_DEGREE = 111_320.0
 
 
 @dataclass(frozen=True)
@@ -10,11 +25,95 @@ class Viewport:
     radius_meters: float
 
 
-def region_and_viewport_from_location(*, location_geometry: dict, location_bbox: tuple[float, float, float, float] | None):
+@dataclass(frozen=True)
+class PreparedGeometry:
+    """A GeoJSON geometry simplified to the vertex budget, with its bounding box."""
+
+    geometry: dict
+    bbox: BBox
+    vertex_count: int
+    original_vertex_count: int
+
+
+@dataclass(frozen=True)
+class PreparedRegion:
+    """EE region for clip/reduce, a cheap rectangle for `filterBounds`, and the map viewport."""
+
+    region: Any
+    bounds: Any
+    viewport: dict
+
+
+@dataclass(frozen=True)
+class LocalRegion:
+    """The area `prepare_region` reduces over, without Earth Engine: a bbox, masked by `geometry` when set."""
+
+    bbox: BBox
+    geometry: dict | None = None
+
+
+def _new_prepared_cache() -> TtlLruCache[str, PreparedGeometry]:
+    return TtlLruCache(max_entries=AppConfig().geocode_memory_entries, ttl_seconds=24 * 60 * 60)
+
+
+_PREPARED_GEOMETRIES = _new_prepared_cache()
+
+
+def reset_prepared_geometries() -> None:
+    _PREPARED_GEOMETRIES.clear()
+
+
+def _vertex_count(shape) -> int:
+    import shapely
+
+    return int(shapely.get_num_coordinates(shape))
+
+
+def prepare_geometry(geometry: dict, *, max_vertices: int | None = None) -> PreparedGeometry:
+    """Simplify a GeoJSON polygon to at most `max_vertices` with topology preserved.
+
+    The tolerance starts tiny relative to the shape's extent and doubles until the
+    budget is met. Results are cached per geometry, so repeated queries for the same
+    place skip the work.
+    """
+    budget = max_vertices if max_vertices is not None else AppConfig().geometry_max_vertices
+    key = hashlib.sha256(f"{budget}|{json.dumps(geometry, sort_keys=True)}".encode("utf-8")).hexdigest()
+    cached = _PREPARED_GEOMETRIES.get(key)
+    if cached is not None:
+        return cached
+
+    from shapely.geometry import mapping, shape
+
+    original = shape(geometry)
+    if not original.is_valid:
+        from shapely.validation import make_valid
+
+        original = make_valid(original)
+    original_count = _vertex_count(original)
+
+    simplified = original
+    minx, miny, maxx, maxy = original.bounds
+    tolerance = max(maxx - minx, maxy - miny) * 1e-5
+    while _vertex_count(simplified) > budget and tolerance < max(maxx - minx, maxy - miny):
+        simplified = original.simplify(tolerance, preserve_topology=True)
+        tolerance *= 2
+
+    prepared = PreparedGeometry(
+        geometry=json.loads(json.dumps(mapping(simplified))),
+        bbox=(minx, miny, maxx, maxy),
+        vertex_count=_vertex_count(simplified),
+        original_vertex_count=original_count,
+    )
+    if prepared.vertex_count < original_count:
+        metrics().increment("geometry.simplified")
+    _PREPARED_GEOMETRIES.put(key, prepared)
+    return prepared
+
+
+def prepare_region(*, location_geometry: dict, location_bbox: BBox | None) -> PreparedRegion:
     import ee  # type: ignore
 
     geom_type = location_geometry.get("type") if isinstance(location_geometry, dict) else None
-    viewport: dict | None = None
 
     if geom_type == "Point":
         coords = location_geometry.get("coordinates")
@@ -25,12 +124,25 @@ def region_and_viewport_from_location(*, location_geometry: dict, location_bbox:
         ):
             lng = float(coords[0])
             lat = float(coords[1])
-            radius_meters = 160_934.0
+            radius_meters = POINT_RADIUS_METERS
             region = ee.Geometry.Point([lng, lat]).buffer(radius_meters).bounds()
             viewport = {"center_lat": lat, "center_lng": lng, "radius_meters": radius_meters}
-            return region, viewport
+            return PreparedRegion(region=region, bounds=region, viewport=viewport)
+
+    bbox = location_bbox
+    if geom_type in {"Polygon", "MultiPolygon"}:
+        statewide = statewide_ee_region(location_geometry, location_bbox)
+        if statewide is not None:
+            region = statewide
+            metrics().increment("geometry.statewide_hits")
+        else:
+            prepared = prepare_geometry(location_geometry)
+            region = ee.Geometry(prepared.geometry)
+            bbox = bbox or prepared.bbox
+    else:
+        region = ee.Geometry(location_geometry)
 
-    region = ee.Geometry(location_geometry)
+    bounds = ee.Geometry.Rectangle(list(bbox)) if bbox is not None else region
 
     if location_bbox is not None:
         minx, miny, maxx, maxy = location_bbox
@@ -39,7 +151,36 @@ def region_and_viewport_from_location(*, location_geometry: dict, location_bbox:
             "center_lng": (minx + maxx) / 2.0,
             "radius_meters": 160_934.0,
         }
-        return region, viewport
+        return PreparedRegion(region=region, bounds=bounds, viewport=viewport)
 
     viewport = {"center_lat": 27.8, "center_lng": -81.7, "radius_meters": 160_934.0}
-    return region, viewport
+    return PreparedRegion(region=region, bounds=bounds, viewport=viewport)
+
+
+def local_region(*, location_geometry: dict, location_bbox: BBox | None) -> LocalRegion | None:
+    """`prepare_region` for local raster reads; None when the location has no usable extent."""
+    geom_type = location_geometry.get("type") if isinstance(location_geometry, dict) else None
+
+    if geom_type == "Point":
+        coords = location_geometry.get("coordinates")
+        if (
+            isinstance(coords, list)
+            and len(coords) == 2
+            and all(isinstance(x, (int, float)) for x in coords)
+        ):
+            lng, lat = float(coords[0]), float(coords[1])
+            dlat = POINT_RADIUS_METERS / _METERS_PER_DEGREE
+            dlng = dlat / max(math.cos(math.radians(lat)), 1e-6)
+            return LocalRegion(bbox=(lng - dlng, lat - dlat, lng + dlng, lat + dlat))
+
+    if geom_type in {"Polygon", "MultiPolygon"}:
+        prepared = prepare_geometry(location_geometry)
+        return LocalRegion(bbox=location_bbox or prepared.bbox, geometry=prepared.geometry)
+
+    return LocalRegion(bbox=location_bbox) if location_bbox is not None else None
+
+
+def region_and_viewport_from_location(*, location_geometry: dict, location_bbox: BBox | None):
+    prepared = prepare_region(location_geometry=location_geometry, location_bbox=location_bbox)
+    return prepared.region, prepared.viewport
+
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.config import AppConfig
+from backend.src.infra.ee_client import EarthEngineClient
+from backend.src.infra.metrics import MetricsRegistry, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EarthEngineSession:
+    """Long-lived Earth Engine session shared by every request in the process.
+
+    `ee.Initialize` runs once; afterwards it is only repeated when the credentials are
+    close to expiry (`refresh_interval_seconds`) or when a health check fails.
+    """
+
+    def __init__(
+        self,
+        client: EarthEngineClient,
+        *,
+        refresh_interval_seconds: int = 45 * 60,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self._client = client
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._registry = registry or metrics()
+        self._lock = threading.Lock()
+        self._initialized_at: float | None = None
+        self._init_count = 0
+
+    @property
+    def project(self) -> str | None:
+        return self._client.project
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._initialized_at is not None
+
+    def ensure_initialized(self) -> None:
+        if self._is_current():
+            return
+        with self._lock:
+            if self._is_current():
+                return
+            self._initialize_locked()
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._initialize_locked()
+
+    def check_health(self) -> bool:
+        try:
+            self.ensure_initialized()
+            import ee  # type: ignore
+
+            ee.Number(1).getInfo()
+        except Exception as e:
+            logger.warning(f"Earth Engine health check failed: {e}")
+            self._registry.set_gauge("ee.session.healthy", 0)
+            with self._lock:
+                self._initialized_at = None
+            return False
+        self._registry.set_gauge("ee.session.healthy", 1)
+        return True
+
+    def _is_current(self) -> bool:
+        initialized_at = self._initialized_at
+        if initialized_at is None:
+            return False
+        return (time.monotonic() - initialized_at) < self._refresh_interval_seconds
+
+    def _initialize_locked(self) -> None:
+        is_reinit = self._init_count > 0
+        start = time.perf_counter()
+        try:
+            self._client.initialize()
+        except DataUnavailableError:
+            self._registry.increment("ee.session.init_failures")
+            self._initialized_at = None
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        self._initialized_at = time.monotonic()
+        self._init_count += 1
+        self._registry.set_gauge("ee.session.init_latency_ms", latency_ms)
+        self._registry.increment("ee.session.reinit_count" if is_reinit else "ee.session.init_count")
+        logger.info(f"Earth Engine initialized in {latency_ms:.1f} ms (reinit={is_reinit})")
+
+
+_SESSIONS: dict[str | None, EarthEngineSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def ee_session(project: str | None) -> EarthEngineSession:
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(project)
+        if session is None:
+            session = EarthEngineSession(
+                EarthEngineClient(project=project),
+                refresh_interval_seconds=AppConfig().ee_refresh_interval_seconds,
+            )
+            _SESSIONS[project] = session
+        return session
+
+
+def reset_ee_sessions() -> None:
+    with _SESSIONS_LOCK:
+        _SESSIONS.clear()
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
+import hashlib
 import json
 import logging
-import time
-from typing import Any
+from typing import Any, Iterator
 
 from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import TtlLruCache
+from backend.src.infra.config import AppConfig
+from backend.src.infra.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +19,76 @@ logger = logging.getLogger(__name__)
 @dataclass(frozen=True)
 class TileUrlTemplate:
     url: str
+    layer_key: str | None = None
 
 
-_MAPID_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
-_MAPID_CACHE_TTL_SECONDS = 60 * 60
+def _new_mapid_cache() -> TtlLruCache[str, TileUrlTemplate]:
+    config = AppConfig()
+    return TtlLruCache(max_entries=config.mapid_cache_max_entries, ttl_seconds=config.mapid_cache_ttl_seconds)
 
 
-def _cache_key(image: Any, vis_params: dict[str, Any]) -> str:
-    return json.dumps(
-        {"image_id": id(image), "vis": vis_params},
-        sort_keys=True,
-        default=str,
-    )
+_MAPID_CACHE = _new_mapid_cache()
+_SKIP_CACHED_MAPIDS: ContextVar[bool] = ContextVar("skip_cached_mapids", default=False)
+
+
+def ee_fingerprint(obj: Any) -> str | None:
+    """Stable hash of an Earth Engine object's serialized expression graph.
+
+    Two independently built but identical graphs hash the same, unlike `id(obj)`.
+    Returns None for objects that cannot be serialized.
+    """
+    serialize = getattr(obj, "serialize", None)
+    if not callable(serialize):
+        return None
+    try:
+        payload = serialize()
+    except Exception:
+        return None
+    if not isinstance(payload, str):
+        return None
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_key(image: Any, vis_params: dict[str, Any]) -> str | None:
+    fingerprint = ee_fingerprint(image)
+    if fingerprint is None:
+        return None
+    vis = json.dumps(vis_params, sort_keys=True, default=str)
+    return hashlib.sha256(f"{fingerprint}|{vis}".encode("utf-8")).hexdigest()
+
+
+def reset_mapid_cache() -> None:
+    _MAPID_CACHE.clear()
+
+
+def cached_map_id_template(layer_key: str) -> TileUrlTemplate | None:
+    """Upstream template for a layer key handed out earlier, while its token is still live."""
+    return _MAPID_CACHE.get(layer_key)
+
+
+@contextmanager
+def fresh_map_ids() -> Iterator[None]:
+    """Mint new map ids inside this block instead of reusing cached ones.
+
+    Fresh results still replace the cache entries. Background refreshes use this so
+    the tokens they hand out get a full lifetime. `fan_out` workers inherit it.
+    """
+    reset_token = _SKIP_CACHED_MAPIDS.set(True)
+    try:
+        yield
+    finally:
+        _SKIP_CACHED_MAPIDS.reset(reset_token)
+
 
 # TODO: at some point, we should validate the url is NOT logged; as it can leak the token value
 def ee_image_tile_url_template(image: Any, vis_params: dict[str, Any]) -> TileUrlTemplate:
     key = _cache_key(image, vis_params)
-    cached = _MAPID_CACHE.get(key)
-    if cached is not None:
-        ts, map_id = cached
-        if (time.time() - ts) <= _MAPID_CACHE_TTL_SECONDS:
-            mapid = map_id.get("mapid")
-            token = map_id.get("token")
-            if isinstance(mapid, str) and isinstance(token, str):
-                url = f"https://earthengine.googleapis.com/map/{mapid}/{{z}}/{{x}}/{{y}}?token={token}"
-                return TileUrlTemplate(url=url)
+    if key is not None and not _SKIP_CACHED_MAPIDS.get():
+        cached = _MAPID_CACHE.get(key)
+        if cached is not None:
+            metrics().increment("ee.mapid.cache_hits")
+            return cached
+    metrics().increment("ee.mapid.cache_misses")
 
     try:
         logger.info(f"Calling image.getMapId with vis_params: {vis_params}")
@@ -48,26 +98,28 @@ def ee_image_tile_url_template(image: Any, vis_params: dict[str, Any]) -> TileUr
         logger.error(f"Failed to call image.getMapId: {e}", exc_info=True)
         raise DataUnavailableError("Failed to generate Earth Engine tile URL") from e
 
+    template = _template_from_map_id(map_id, layer_key=key)
+    if key is not None:
+        _MAPID_CACHE.put(key, template)
+    return template
+
+
+def _template_from_map_id(map_id: Any, *, layer_key: str | None) -> TileUrlTemplate:
     # Prefer the canonical URL format when available. The Earth Engine Python API often
     # returns a tile_fetcher with a fully-formed url_format including token handling.
     try:
         tile_fetcher = map_id.get("tile_fetcher") if isinstance(map_id, dict) else None
         url_format = getattr(tile_fetcher, "url_format", None)
         if isinstance(url_format, str) and "{z}" in url_format and "{x}" in url_format and "{y}" in url_format:
-            if isinstance(map_id, dict):
-                _MAPID_CACHE[key] = (time.time(), map_id)
-            return TileUrlTemplate(url=url_format)
+            return TileUrlTemplate(url=url_format, layer_key=layer_key)
     except Exception:
         # Fall back to mapid/token assembly below.
         pass
 
-    if isinstance(map_id, dict):
-        _MAPID_CACHE[key] = (time.time(), map_id)
-
-    mapid = map_id.get("mapid")
-    token = map_id.get("token")
+    mapid = map_id.get("mapid") if isinstance(map_id, dict) else None
+    token = map_id.get("token") if isinstance(map_id, dict) else None
     if not isinstance(mapid, str) or not isinstance(token, str) or not token:
         raise DataUnavailableError("Earth Engine returned invalid map id")
 
     url = f"https://earthengine.googleapis.com/map/{mapid}/{{z}}/{{x}}/{{y}}?token={token}"
-    return TileUrlTemplate(url=url)
+    return TileUrlTemplate(url=url, layer_key=layer_key)
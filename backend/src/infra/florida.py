@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+FLORIDA_COUNTIES: tuple[str, ...] = (
+    "Alachua", "Baker", "Bay", "Bradford", "Brevard", "Broward", "Calhoun", "Charlotte", "Citrus",
+    "Clay", "Collier", "Columbia", "DeSoto", "Dixie", "Duval", "Escambia", "Flagler", "Franklin",
+    "Gadsden", "Gilchrist", "Glades", "Gulf", "Hamilton", "Hardee", "Hendry", "Hernando",
+    "Highlands", "Hillsborough", "Holmes", "Indian River", "Jackson", "Jefferson", "Lafayette",
+    "Lake", "Lee", "Leon", "Levy", "Liberty", "Madison", "Manatee", "Marion", "Martin",
+    "Miami-Dade", "Monroe", "Nassau", "Okaloosa", "Okeechobee", "Orange", "Osceola", "Palm Beach",
+    "Pasco", "Pinellas", "Polk", "Putnam", "St. Johns", "St. Lucie", "Santa Rosa", "Sarasota",
+    "Seminole", "Sumter", "Suwannee", "Taylor", "Union", "Volusia", "Wakulla", "Walton",
+    "Washington",
+)
+
+# (west, south, east, north) in degrees, covering the Keys and the Panhandle.
+FLORIDA_BBOX = (-87.7, 24.4, -79.9, 31.1)
+
+# USPS assigns the 320xx-349xx ZIP prefixes to Florida.
+FLORIDA_ZIP_PREFIX_RANGE = (320, 349)
+
+
+def florida_county_queries() -> list[str]:
+    return [f"{name} County, Florida" for name in FLORIDA_COUNTIES]
+
+
+def florida_zip_candidates() -> Iterator[str]:
+    lo, hi = FLORIDA_ZIP_PREFIX_RANGE
+    for prefix in range(lo, hi + 1):
+        for suffix in range(100):
+            yield f"{prefix}{suffix:02d}"
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Callable
+
+from backend.src.domain.errors import DataUnavailableError, DomainError
+from backend.src.infra.cache import cache_paths, read_json, write_json
+from backend.src.infra.datasets import prepare_dataset
+from backend.src.infra.florida import FLORIDA_ZIP_PREFIX_RANGE
+from backend.src.infra.geocoding import Geocoder, GeocodingResult
+from backend.src.infra.metrics import metrics
+from backend.src.infra.sources import SourcesConfig, default_sources_yaml_path, load_sources_config
+
+logger = logging.getLogger(__name__)
+
+_INDEX_VERSION = 1
+_ZIP_RE = re.compile(r"(\d{5})(?:-\d{4})?")
+_STATE_SUFFIX_RE = re.compile(r"(,?\s*\b(fl|florida))?(,?\s*\b(us|usa|united states))?$")
+_STATEWIDE_RE = re.compile(r"(state of )?(fl|florida)( state)?(,?\s*\b(us|usa|united states))?")
+FLORIDA_LABEL = "Florida, United States"
+
+
+@dataclass(frozen=True)
+class GazetteerIndex:
+    zips: dict[str, GeocodingResult]
+    counties: dict[str, GeocodingResult]
+
+
+def normalize_county_name(name: str) -> str:
+    text = name.lower().replace("-", " ").replace(".", "")
+    text = re.sub(r"\bsaint\b", "st", text)
+    # Census spells it "DeSoto"; "De Soto" is common too.
+    text = re.sub(r"\bde soto\b", "desoto", text)
+    return " ".join(text.split())
+
+
+def is_statewide_query(location_text: str) -> bool:
+    """"Florida", "FL", "State of Florida, USA" and similar."""
+    text = " ".join(location_text.strip().lower().split()).strip(" ,.")
+    return _STATEWIDE_RE.fullmatch(text) is not None
+
+
+def _match_key(location_text: str) -> tuple[str, str] | None:
+    text = " ".join(location_text.strip().lower().split())
+    stripped = _STATE_SUFFIX_RE.sub("", text).strip(" ,")
+    zip_match = _ZIP_RE.fullmatch(stripped)
+    if zip_match:
+        return "zip", zip_match.group(1)
+
+    # Bare "<name> County" is ambiguous across states; only answer when Florida is explicit.
+    if stripped == text or not stripped.endswith(" county"):
+        return None
+    return "county", normalize_county_name(stripped[: -len(" county")])
+
+
+class GazetteerGeocoder(Geocoder):
+    """Answers Florida ZIPs and "<name> County, FL" from an in-memory index.
+
+    Anything the index does not cover goes to `fallback`. If the index cannot be
+    loaded, lookups fall through until `retry_seconds` have passed. With `statewide`,
+    queries for the whole state resolve to the cached Florida boundary. Async lookups
+    load the index or the boundary on a worker thread; only dict lookups run inline.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], GazetteerIndex],
+        fallback: Geocoder,
+        *,
+        retry_seconds: float = 15 * 60,
+        statewide: Callable[[], GeocodingResult] | None = None,
+    ) -> None:
+        self._loader = loader
+        self._fallback = fallback
+        self._statewide = statewide
+        self._retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._index: GazetteerIndex | None = None
+        self._failed_at: float | None = None
+        self._statewide_result: GeocodingResult | None = None
+
+    def load(self) -> GazetteerIndex | None:
+        if self._index is not None:
+            return self._index
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            if self._failed_at is not None and (time.monotonic() - self._failed_at) < self._retry_seconds:
+                return None
+            try:
+                self._index = self._loader()
+                self._failed_at = None
+                logger.info(
+                    f"Loaded gazetteer with {len(self._index.zips)} ZIPs and {len(self._index.counties)} counties"
+                )
+            except Exception as e:
+                logger.warning(f"Gazetteer unavailable, using fallback geocoder: {e}")
+                self._failed_at = time.monotonic()
+        return self._index
+
+    def _statewide_lookup(self) -> GeocodingResult | None:
+        if self._statewide_result is None:
+            try:
+                self._statewide_result = self._statewide()
+            except DomainError as e:
+                logger.warning(f"Florida boundary unavailable, using fallback geocoder: {e}")
+                return None
+        return self._statewide_result
+
+    def _needs_load(self, location_text: str) -> bool:
+        """Whether `lookup` would first have to load the index or the statewide boundary."""
+        if self._statewide is not None and is_statewide_query(location_text):
+            return self._statewide_result is None
+        return self._index is None and _match_key(location_text) is not None
+
+    def lookup(self, location_text: str) -> GeocodingResult | None:
+        if self._statewide is not None and is_statewide_query(location_text):
+            return self._statewide_lookup()
+        key = _match_key(location_text)
+        if key is None:
+            return None
+        index = self.load()
+        if index is None:
+            return None
+        kind, value = key
+        return (index.zips if kind == "zip" else index.counties).get(value)
+
+    def geocode(self, location_text: str) -> GeocodingResult:
+        hit = self.lookup(location_text)
+        if hit is not None:
+            metrics().increment("geocode.gazetteer_hits")
+            return hit
+        return self._fallback.geocode(location_text)
+
+    async def ageocode(self, location_text: str) -> GeocodingResult:
+        if self._needs_load(location_text):
+            hit = await asyncio.to_thread(self.lookup, location_text)
+        else:
+            hit = self.lookup(location_text)
+        if hit is not None:
+            metrics().increment("geocode.gazetteer_hits")
+            return hit
+        return await self._fallback.ageocode(location_text)
+
+
+def _read_zip_centroids(path: Path) -> dict[str, tuple[float, float]]:
+    lo, hi = FLORIDA_ZIP_PREFIX_RANGE
+    out: dict[str, tuple[float, float]] = {}
+    with path.open(encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = [h.strip() for h in next(reader)]
+        geoid_i, lat_i, lng_i = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+        for row in reader:
+            zip_code = row[geoid_i].strip()
+            if len(zip_code) == 5 and lo <= int(zip_code[:3]) <= hi:
+                out[zip_code] = (float(row[lng_i]), float(row[lat_i]))
+    return out
+
+
+def build_florida_gazetteer(*, repo_root: Path, sources: SourcesConfig) -> GazetteerIndex:
+    from shapely.geometry import Point
+
+    from backend.src.infra.regions import florida_counties_geodataframe
+
+    url = sources.datasets.get("uszipcentroids")
+    if not url:
+        raise DataUnavailableError("Dataset source 'uszipcentroids' is not configured")
+    artifact = prepare_dataset("uszipcentroids", url, cache_paths(repo_root))
+    gazetteer_files = sorted(artifact.local_path.glob("*.txt"))
+    if not gazetteer_files:
+        raise DataUnavailableError(f"No ZCTA gazetteer file found in {artifact.local_path}")
+    centroids = _read_zip_centroids(gazetteer_files[0])
+
+    counties_gdf = florida_counties_geodataframe(repo_root=repo_root, sources=sources)
+    counties: dict[str, GeocodingResult] = {}
+    county_shapes: list[tuple[str, object]] = []
+    for row in counties_gdf.itertuples(index=False):
+        label = f"{row.NAME} County, Florida, United States"
+        minx, miny, maxx, maxy = row.geometry.bounds
+        counties[normalize_county_name(row.NAME)] = GeocodingResult(
+            label=label,
+            geometry=json.loads(json.dumps(row.geometry.__geo_interface__)),
+            bbox=(minx, miny, maxx, maxy),
+        )
+        county_shapes.append((row.NAME, row.geometry))
+
+    zips: dict[str, GeocodingResult] = {}
+    for zip_code, (lng, lat) in centroids.items():
+        point = Point(lng, lat)
+        county_name = next((name for name, shape in county_shapes if shape.covers(point)), None)
+        parts = [zip_code, f"{county_name} County" if county_name else None, "Florida", "United States"]
+        zips[zip_code] = GeocodingResult(
+            label=", ".join(p for p in parts if p),
+            geometry={"type": "Point", "coordinates": [lng, lat]},
+        )
+
+    return GazetteerIndex(zips=zips, counties=counties)
+
+
+def florida_statewide_result(repo_root: Path) -> GeocodingResult:
+    """The whole state, as the simplified boundary that `prepare_region` serves prebuilt."""
+    from backend.src.infra.regions import florida_boundary
+
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    boundary = florida_boundary(repo_root=repo_root, sources=sources)
+    return GeocodingResult(label=FLORIDA_LABEL, geometry=boundary.geometry, bbox=boundary.bbox)
+
+
+def _encode(result: GeocodingResult) -> dict:
+    return {"label": result.label, "geometry": result.geometry, "bbox": list(result.bbox) if result.bbox else None}
+
+
+def _decode(raw: dict) -> GeocodingResult:
+    bbox = raw.get("bbox")
+    return GeocodingResult(
+        label=raw["label"],
+        geometry=raw["geometry"],
+        bbox=tuple(float(x) for x in bbox) if bbox else None,
+    )
+
+
+def load_florida_gazetteer(repo_root: Path) -> GazetteerIndex:
+    """Load the compact gazetteer index, building it from the source datasets on first use."""
+    sources = load_sources_config(default_sources_yaml_path(repo_root))
+    source_urls = [sources.datasets.get("uszipcentroids"), sources.datasets.get("uscounties")]
+    index_path = cache_paths(repo_root).file_path("gazetteer", "florida.json")
+
+    if index_path.exists():
+        raw = read_json(index_path)
+        if raw.get("version") == _INDEX_VERSION and raw.get("sources") == source_urls:
+            return GazetteerIndex(
+                zips={k: _decode(v) for k, v in raw["zips"].items()},
+                counties={k: _decode(v) for k, v in raw["counties"].items()},
+            )
+
+    index = build_florida_gazetteer(repo_root=repo_root, sources=sources)
+    write_json(
+        index_path,
+        {
+            "version": _INDEX_VERSION,
+            "sources": source_urls,
+            "zips": {k: _encode(v) for k, v in index.zips.items()},
+            "counties": {k: _encode(v) for k, v in index.counties.items()},
+        },
+    )
+    return index
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Iterator
+
+from backend.src.domain.errors import InvalidLocationError, LocationNotFoundError
+from backend.src.infra.geocoding import Geocoder, GeocodingResult, geocode_key
+from backend.src.infra.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StoredGeocode:
+    """A persisted lookup; `result` is None for a cached "location not found"."""
+
+    result: GeocodingResult | None
+    stored_at: float
+
+
+class SqliteGeocodeStore:
+    """Geocode results shared by every worker process through one SQLite file.
+
+    Positive results are kept for `ttl_seconds`, definitive misses for the shorter
+    `negative_ttl_seconds`. WAL mode lets concurrent workers read while one writes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_seconds: int = 60 * 60 * 24 * 90,
+        negative_ttl_seconds: int = 60 * 60 * 24 * 7,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30.0)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocodes (
+                    key TEXT PRIMARY KEY,
+                    found INTEGER NOT NULL,
+                    label TEXT,
+                    geometry TEXT,
+                    bbox TEXT,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, location_text: str) -> StoredGeocode | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT found, label, geometry, bbox, stored_at FROM geocodes WHERE key = ?",
+                (geocode_key(location_text),),
+            ).fetchone()
+        if row is None:
+            return None
+        stored = self._decode(row)
+        if not self._is_fresh(stored):
+            return None
+        return stored
+
+    def put(self, location_text: str, result: GeocodingResult) -> None:
+        self._write(
+            geocode_key(location_text),
+            1,
+            result.label,
+            json.dumps(result.geometry),
+            json.dumps(list(result.bbox)) if result.bbox is not None else None,
+        )
+
+    def put_not_found(self, location_text: str) -> None:
+        self._write(geocode_key(location_text), 0, None, None, None)
+
+    def fresh_items(self) -> Iterator[tuple[str, StoredGeocode]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, found, label, geometry, bbox, stored_at FROM geocodes ORDER BY stored_at DESC"
+            ).fetchall()
+        for key, *rest in rows:
+            stored = self._decode(tuple(rest))
+            if self._is_fresh(stored):
+                yield key, stored
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, key: str, found: int, label: str | None, geometry: str | None, bbox: str | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocodes (key, found, label, geometry, bbox, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, found, label, geometry, bbox, self._clock()),
+            )
+
+    def _is_fresh(self, stored: StoredGeocode) -> bool:
+        ttl = self._ttl_seconds if stored.result is not None else self._negative_ttl_seconds
+        return (self._clock() - stored.stored_at) <= ttl
+
+    @staticmethod
+    def _decode(row: tuple) -> StoredGeocode:
+        found, label, geometry, bbox, stored_at = row
+        if not found:
+            return StoredGeocode(result=None, stored_at=stored_at)
+        bbox_val = json.loads(bbox) if bbox else None
+        return StoredGeocode(
+            result=GeocodingResult(
+                label=label or "",
+                geometry=json.loads(geometry),
+                bbox=tuple(float(x) for x in bbox_val) if bbox_val else None,
+            ),
+            stored_at=stored_at,
+        )
+
+
+class PersistentGeocoder(Geocoder):
+    """Consults the shared store before the inner provider and records every answer."""
+
+    def __init__(self, inner: Geocoder, store: SqliteGeocodeStore) -> None:
+        self._inner = inner
+        self._store = store
+
+    def geocode(self, location_text: str) -> GeocodingResult:
+        stored = self._store.get(location_text)
+        if stored is not None:
+            return self._from_store(stored)
+        metrics().increment("geocode.store_misses")
+        try:
+            res = self._inner.geocode(location_text)
+        except LocationNotFoundError:
+            self._store.put_not_found(location_text)
+            raise
+        self._store.put(location_text, res)
+        return res
+
+    async def ageocode(self, location_text: str) -> GeocodingResult:
+        # SQLite may wait up to its busy timeout on another worker's write; keep that off the event loop.
+        stored = await asyncio.to_thread(self._store.get, location_text)
+        if stored is not None:
+            return self._from_store(stored)
+        metrics().increment("geocode.store_misses")
+        try:
+            res = await self._inner.ageocode(location_text)
+        except LocationNotFoundError:
+            await asyncio.to_thread(self._store.put_not_found, location_text)
+            raise
+        await asyncio.to_thread(self._store.put, location_text, res)
+        return res
+
+    @staticmethod
+    def _from_store(stored: StoredGeocode) -> GeocodingResult:
+        metrics().increment("geocode.store_hits")
+        if stored.result is None:
+            raise LocationNotFoundError("Location not found")
+        return stored.result
+
+
+@dataclass(frozen=True)
+class PreloadReport:
+    fetched: int = 0
+    skipped: int = 0
+    not_found: int = 0
+    failed: int = 0
+
+
+def preload_geocodes(
+    queries: Iterable[str],
+    *,
+    store: SqliteGeocodeStore,
+    geocoder: Geocoder,
+    min_interval_seconds: float = 1.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> PreloadReport:
+    """Fill the store for `queries`, skipping fresh entries.
+
+    Upstream calls are spaced by `min_interval_seconds` to respect Nominatim's
+    one-request-per-second usage policy.
+    """
+    fetched = skipped = not_found = failed = 0
+    for query in queries:
+        if store.get(query) is not None:
+            skipped += 1
+            continue
+        try:
+            geocoder.geocode(query)
+            fetched += 1
+        except LocationNotFoundError:
+            not_found += 1
+        except InvalidLocationError as e:
+            logger.warning(f"Failed to preload geocode for {query!r}: {e}")
+            failed += 1
+        sleep(min_interval_seconds)
+    return PreloadReport(fetched=fetched, skipped=skipped, not_found=not_found, failed=failed)
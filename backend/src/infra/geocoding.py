@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+import logging
+from pathlib import Path
 import re
+import threading
 import time
-from typing import Any
+from typing import Any, Iterable
 
 import httpx
 
-from backend.src.domain.errors import InvalidLocationError
+from backend.src.domain.errors import InvalidLocationError, LocationNotFoundError
 from backend.src.domain.models import Location, LocationSource
+from backend.src.infra.cache import TtlLruCache, cache_paths
+from backend.src.infra.concurrency import upstream_limiter
+from backend.src.infra.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+def geocode_key(location_text: str) -> str:
+    """Cache key for a query: case-folded with whitespace collapsed."""
+    return " ".join(location_text.strip().lower().split())
 
 
 @dataclass(frozen=True)
@@ -22,6 +36,10 @@ class Geocoder:
     def geocode(self, location_text: str) -> GeocodingResult:
         raise NotImplementedError
 
+    async def ageocode(self, location_text: str) -> GeocodingResult:
+        # Providers without a native async client are bridged onto a worker thread.
+        return await asyncio.to_thread(self.geocode, location_text)
+
 
 class StubGeocoder(Geocoder):
     def geocode(self, location_text: str) -> GeocodingResult:
@@ -30,22 +48,20 @@ class StubGeocoder(Geocoder):
         )
 
 
+_NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+_NOMINATIM_HEADERS = {"User-Agent": "geoemerge/0.1 (local dev)"}
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
 class NominatimGeocoder(Geocoder):
     def geocode(self, location_text: str) -> GeocodingResult:
-        if not location_text.strip():
-            raise InvalidLocationError("Location text is required")
-
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"q": location_text, "format": "geojson", "limit": 1}
-        if re.fullmatch(r"\d{5}(-\d{4})?", location_text.strip()):
-            params["countrycodes"] = "us"
-        headers = {"User-Agent": "geoemerge/0.1 (local dev)"}
+        params = self._params(location_text)
 
         last_exc: Exception | None = None
         for attempt in range(3):
             try:
-                resp = httpx.get(url, params=params, headers=headers, timeout=10.0)
-                if resp.status_code in {429, 500, 502, 503, 504}:
+                resp = httpx.get(_NOMINATIM_URL, params=params, headers=_NOMINATIM_HEADERS, timeout=10.0)
+                if resp.status_code in _RETRYABLE_STATUS:
                     raise httpx.HTTPStatusError("retryable", request=resp.request, response=resp)
                 resp.raise_for_status()
                 last_exc = None
@@ -58,6 +74,42 @@ class NominatimGeocoder(Geocoder):
         if last_exc is not None:
             raise InvalidLocationError("Failed to geocode location") from last_exc
 
+        return self._parse(resp, location_text)
+
+    async def ageocode(self, location_text: str) -> GeocodingResult:
+        params = self._params(location_text)
+
+        last_exc: Exception | None = None
+        async with upstream_limiter("nominatim"):
+            async with httpx.AsyncClient(headers=_NOMINATIM_HEADERS, timeout=10.0) as client:
+                for attempt in range(3):
+                    try:
+                        resp = await client.get(_NOMINATIM_URL, params=params)
+                        if resp.status_code in _RETRYABLE_STATUS:
+                            raise httpx.HTTPStatusError("retryable", request=resp.request, response=resp)
+                        resp.raise_for_status()
+                        last_exc = None
+                        break
+                    except Exception as e:
+                        last_exc = e
+                        if attempt < 2:
+                            await asyncio.sleep(0.5 * (2**attempt))
+                            continue
+        if last_exc is not None:
+            raise InvalidLocationError("Failed to geocode location") from last_exc
+
+        return self._parse(resp, location_text)
+
+    def _params(self, location_text: str) -> dict[str, Any]:
+        if not location_text.strip():
+            raise InvalidLocationError("Location text is required")
+
+        params: dict[str, Any] = {"q": location_text, "format": "geojson", "limit": 1}
+        if re.fullmatch(r"\d{5}(-\d{4})?", location_text.strip()):
+            params["countrycodes"] = "us"
+        return params
+
+    def _parse(self, resp: Any, location_text: str) -> GeocodingResult:
         data: Any
         try:
             data = resp.json()
@@ -66,11 +118,11 @@ class NominatimGeocoder(Geocoder):
 
         features = data.get("features") if isinstance(data, dict) else None
         if not isinstance(features, list) or not features:
-            raise InvalidLocationError("Location not found")
+            raise LocationNotFoundError("Location not found")
 
         f0 = features[0]
         if not isinstance(f0, dict):
-            raise InvalidLocationError("Location not found")
+            raise LocationNotFoundError("Location not found")
 
         geometry = f0.get("geometry")
         if not isinstance(geometry, dict):
@@ -87,33 +139,95 @@ class NominatimGeocoder(Geocoder):
         return GeocodingResult(label=label, geometry=geometry, bbox=bbox)
 
 
-def default_geocoder() -> Geocoder:
-    return CachedGeocoder(NominatimGeocoder())
-
-
 class CachedGeocoder(Geocoder):
+    """In-memory LRU in front of `inner`, keyed like the persistent store and safe to share across threads."""
+
     def __init__(self, inner: Geocoder, *, ttl_seconds: int = 60 * 60 * 24, max_entries: int = 256) -> None:
         self._inner = inner
-        self._ttl_seconds = ttl_seconds
         self._max_entries = max_entries
-        self._cache: dict[str, tuple[float, GeocodingResult]] = {}
+        self._cache: TtlLruCache[str, GeocodingResult] = TtlLruCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
 
     def geocode(self, location_text: str) -> GeocodingResult:
-        key = location_text.strip().lower()
-        now = time.time()
+        key = geocode_key(location_text)
         cached = self._cache.get(key)
         if cached is not None:
-            ts, res = cached
-            if (now - ts) <= self._ttl_seconds:
-                return res
+            return cached
 
         res = self._inner.geocode(location_text)
-        if len(self._cache) >= self._max_entries:
-            oldest_key = min(self._cache.items(), key=lambda kv: kv[1][0])[0]
-            self._cache.pop(oldest_key, None)
-        self._cache[key] = (now, res)
+        self._cache.put(key, res)
+        return res
+
+    async def ageocode(self, location_text: str) -> GeocodingResult:
+        key = geocode_key(location_text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        res = await self._inner.ageocode(location_text)
+        self._cache.put(key, res)
         return res
 
+    def warm(self, entries: Iterable[tuple[str, GeocodingResult]]) -> int:
+        """Seed the in-memory cache (e.g. from the persistent store at startup)."""
+        loaded = 0
+        for location_text, res in entries:
+            if loaded >= self._max_entries:
+                break
+            self._cache.put(geocode_key(location_text), res)
+            loaded += 1
+        return loaded
+
+
+_DEFAULT_GEOCODERS: dict[Path | None, Geocoder] = {}
+_DEFAULT_GEOCODERS_LOCK = threading.Lock()
+
+
+def default_geocoder(*, repo_root: Path | None = None) -> Geocoder:
+    """Process-wide geocoder; with a repo root it is backed by the persistent store."""
+    with _DEFAULT_GEOCODERS_LOCK:
+        geocoder = _DEFAULT_GEOCODERS.get(repo_root)
+        if geocoder is None:
+            geocoder = _build_default_geocoder(repo_root)
+            _DEFAULT_GEOCODERS[repo_root] = geocoder
+        return geocoder
+
+
+def reset_default_geocoders() -> None:
+    with _DEFAULT_GEOCODERS_LOCK:
+        _DEFAULT_GEOCODERS.clear()
+
+
+def default_geocode_store(repo_root: Path):
+    from backend.src.infra.geocode_store import SqliteGeocodeStore
+
+    return SqliteGeocodeStore(cache_paths(repo_root).file_path("geocoding", "geocodes.sqlite3"))
+
+
+def _build_default_geocoder(repo_root: Path | None) -> Geocoder:
+    if repo_root is None:
+        return CachedGeocoder(NominatimGeocoder())
+
+    from backend.src.infra.gazetteer import GazetteerGeocoder, florida_statewide_result, load_florida_gazetteer
+    from backend.src.infra.geocode_store import PersistentGeocoder
+
+    store = default_geocode_store(repo_root)
+    cached = CachedGeocoder(
+        PersistentGeocoder(NominatimGeocoder(), store),
+        max_entries=AppConfig().geocode_memory_entries,
+    )
+    warmed = cached.warm(
+        (key, stored.result) for key, stored in store.fresh_items() if stored.result is not None
+    )
+    logger.info(f"Warmed geocoder with {warmed} entries from {store.path}")
+    # Florida ZIPs, counties and the state itself are answered locally; everything else goes to Nominatim.
+    return GazetteerGeocoder(
+        lambda: load_florida_gazetteer(repo_root),
+        fallback=cached,
+        statewide=lambda: florida_statewide_result(repo_root),
+    )
+
 
 def location_from_geocoding(id_: str, location_text: str, result: GeocodingResult) -> Location:
     return Location(
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+import numpy as np
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import cache_paths
+from backend.src.infra.datasets import prepare_dataset
+from backend.src.infra.metrics import metrics
+from backend.src.infra.sources import SourcesConfig
+
+logger = logging.getLogger(__name__)
+
+BBox = tuple[float, float, float, float]
+
+_INGEST_VERSION = 1
+# Side of the lon/lat grid cells rows are sorted by; ~11 km, a few dozen GLOBE sites per cell.
+CELL_DEGREES = 0.1
+_GRID_COLUMNS = math.ceil(360 / CELL_DEGREES)
+
+
+@dataclass(frozen=True)
+class ObservationColumn:
+    """One typed output column and the source attribute names it may be read from."""
+
+    name: str
+    kind: str  # "int" | "float" | "string" | "bool" | "datetime"
+    sources: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ObservationDataset:
+    name: str
+    columns: tuple[ObservationColumn, ...]
+
+
+_COMMON_COLUMNS = (
+    ObservationColumn("site_id", "int", ("SiteId",)),
+    ObservationColumn("measured_at", "datetime", ("MeasuredAt", "MeasuredDate")),
+    ObservationColumn("country_code", "string", ("CountryCode",)),
+)
+
+OBSERVATION_DATASETS: dict[str, ObservationDataset] = {
+    "mosquito": ObservationDataset(
+        "mosquito",
+        _COMMON_COLUMNS
+        + (
+            ObservationColumn("water_source_type", "string", ("WaterSourceType",)),
+            ObservationColumn("water_source", "string", ("WaterSource",)),
+            ObservationColumn("larvae_count", "float", ("LarvaeCountProcessed",)),
+            ObservationColumn("breeding_ground_eliminated", "bool", ("BreedingGroundEliminated",)),
+        ),
+    ),
+    "landcover": ObservationDataset(
+        "landcover",
+        _COMMON_COLUMNS
+        + (
+            ObservationColumn("muc_code", "string", ("MucCode",)),
+            ObservationColumn("muc_description", "string", ("MucDescription",)),
+        ),
+    ),
+}
+
+
+def observation_dataset(name: str) -> ObservationDataset:
+    dataset = OBSERVATION_DATASETS.get(name)
+    if dataset is None:
+        raise DataUnavailableError(f"Unknown observation dataset {name!r}")
+    return dataset
+
+
+def _cell_xy(lon, lat) -> tuple[np.ndarray, np.ndarray]:
+    cx = np.floor((np.asarray(lon, dtype=np.float64) + 180.0) / CELL_DEGREES).astype(np.int64)
+    cy = np.floor((np.asarray(lat, dtype=np.float64) + 90.0) / CELL_DEGREES).astype(np.int64)
+    return np.clip(cx, 0, _GRID_COLUMNS - 1), cy
+
+
+def cell_ids(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Row-major ids of the global CELL_DEGREES grid; a row of cells has consecutive ids."""
+    cx, cy = _cell_xy(lon, lat)
+    return cy * _GRID_COLUMNS + cx
+
+
+def _source_file(path: Path) -> Path:
+    if path.is_file():
+        return path
+    for pattern in ("*.shp", "*.gpkg", "*.geojson"):
+        found = sorted(path.rglob(pattern))
+        if found:
+            return found[0]
+    raise DataUnavailableError(f"No vector file found in {path}")
+
+
+def _typed(frame, column: ObservationColumn):
+    import pandas as pd
+
+    source = next((s for s in column.sources if s in frame.columns), None)
+    if source is None:
+        logger.warning(f"Observation column {column.name!r} not found (tried {', '.join(column.sources)})")
+        values = pd.Series([None] * len(frame), index=frame.index)
+    else:
+        values = frame[source]
+
+    if column.kind == "int":
+        return pd.to_numeric(values, errors="coerce").astype("Int64")
+    if column.kind == "float":
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+    if column.kind == "bool":
+        return values.astype("string").str.strip().str.lower().map({"true": True, "false": False}).astype("boolean")
+    if column.kind == "datetime":
+        return pd.to_datetime(values, errors="coerce", utc=True).dt.tz_localize(None).astype("datetime64[ms]")
+    return values.astype("string")
+
+
+def _parquet_path(repo_root: Path, name: str) -> Path:
+    return cache_paths(repo_root).subdir("observations") / f"{name}.parquet"
+
+
+def ingest_observations(name: str, *, repo_root: Path, sources: SourcesConfig, force: bool = False) -> Path:
+    """Convert a GLOBE point dataset into typed, cell-sorted GeoParquet once.
+
+    Rows are sorted by grid cell, then by time, so the file itself is the spatial
+    index: each cell's rows are contiguous. Re-running is a no-op until the
+    downloaded source changes.
+    """
+    dataset = observation_dataset(name)
+    url = sources.datasets.get(name)
+    if not url:
+        raise DataUnavailableError(f"Dataset source {name!r} is not configured")
+
+    cache = cache_paths(repo_root)
+    source = _source_file(prepare_dataset(name, url, cache).local_path)
+    parquet_path = _parquet_path(repo_root, name)
+    meta_path = parquet_path.with_suffix(".json")
+    stat = source.stat()
+    stamp = {"version": _INGEST_VERSION, "source": source.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if not force and parquet_path.exists() and meta_path.exists():
+        if json.loads(meta_path.read_text(encoding="utf-8")).get("stamp") == stamp:
+            return parquet_path
+
+    import geopandas as gpd
+
+    try:
+        gdf = gpd.read_file(source)
+    except Exception as e:
+        raise DataUnavailableError(f"Failed to read observations from {source}") from e
+    if gdf.crs is not None:
+        gdf = gdf.to_crs(epsg=4326)
+    gdf = gdf[gdf.geometry.notna() & (gdf.geometry.geom_type == "Point")]
+
+    frame = gdf.drop(columns="geometry")
+    out = gpd.GeoDataFrame(
+        {column.name: _typed(frame, column) for column in dataset.columns},
+        geometry=gpd.points_from_xy(gdf.geometry.x, gdf.geometry.y),
+        crs="EPSG:4326",
+    )
+    out["lon"] = gdf.geometry.x.to_numpy(dtype=np.float64)
+    out["lat"] = gdf.geometry.y.to_numpy(dtype=np.float64)
+    out["cell"] = cell_ids(out["lon"].to_numpy(), out["lat"].to_numpy())
+    out = out.sort_values(["cell", "measured_at"], kind="stable").reset_index(drop=True)
+
+    tmp = parquet_path.with_suffix(".parquet.tmp")
+    try:
+        out.to_parquet(tmp, index=False)
+    except Exception as e:
+        raise DataUnavailableError(f"Failed to write GeoParquet for {name!r}") from e
+    os.replace(tmp, parquet_path)
+    meta_path.write_text(
+        json.dumps({"stamp": stamp, "rows": len(out), "cell_degrees": CELL_DEGREES}),
+        encoding="utf-8",
+    )
+    logger.info(f"Ingested {len(out)} {name} observations into {parquet_path}")
+    return parquet_path
+
+
+class ObservationIndex:
+    """In-memory observations answering bbox and date-range queries.
+
+    A bbox maps to one contiguous run of cell ids per grid row; each run is found with
+    two binary searches, and only those rows are filtered exactly.
+    """
+
+    def __init__(self, table) -> None:
+        self._table = table
+        self._lon = table.column("lon").to_numpy()
+        self._lat = table.column("lat").to_numpy()
+        self._cells = table.column("cell").to_numpy()
+        self._times = table.column("measured_at").to_numpy(zero_copy_only=False).astype("datetime64[ms]")
+        if len(self._cells) and np.any(np.diff(self._cells) < 0):
+            raise DataUnavailableError("Observation table is not sorted by grid cell; re-run the ingest")
+
+    @classmethod
+    def load(cls, path: Path) -> "ObservationIndex":
+        import pyarrow.parquet as pq
+
+        try:
+            table = pq.read_table(path).drop_columns(["geometry"])
+        except Exception as e:
+            raise DataUnavailableError(f"Failed to read observations from {path}") from e
+        return cls(table)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @property
+    def table(self):
+        """The underlying Arrow table (without geometry), in index order."""
+        return self._table
+
+    def rows(self, bbox: BBox, *, start: date | None = None, end: date | None = None) -> np.ndarray:
+        """Row numbers inside `bbox` (inclusive edges) measured within [start, end], in index order."""
+        minx, miny, maxx, maxy = bbox
+        (lo_x, hi_x), (lo_y, hi_y) = _cell_xy([minx, maxx], [miny, maxy])
+        cy = np.arange(lo_y, hi_y + 1, dtype=np.int64)
+        starts = np.searchsorted(self._cells, cy * _GRID_COLUMNS + lo_x, side="left")
+        stops = np.searchsorted(self._cells, cy * _GRID_COLUMNS + hi_x, side="right")
+        candidates = np.concatenate([np.arange(a, b) for a, b in zip(starts, stops)] or [np.empty(0, np.int64)])
+
+        lon, lat, times = self._lon[candidates], self._lat[candidates], self._times[candidates]
+        mask = (lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy)
+        if start is not None:
+            mask &= times >= np.datetime64(start, "ms")
+        if end is not None:
+            mask &= times < np.datetime64(end + timedelta(days=1), "ms")
+        metrics().increment("observations.rows_scanned", len(candidates))
+        return candidates[mask]
+
+    def records(self, rows: np.ndarray) -> list[dict[str, Any]]:
+        return self._table.take(rows).drop_columns(["cell"]).to_pylist()
+
+
+_INDEXES: dict[tuple[Path, str], tuple[tuple[int, int], ObservationIndex]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def observation_index(repo_root: Path, name: str, *, sources: SourcesConfig) -> ObservationIndex:
+    """Process-wide index for one dataset, ingesting it first if it has never been converted.
+
+    Each call re-stats the GeoParquet file, so a re-ingest (e.g. `ingest-observations`
+    run from another process) is picked up by the next query without a restart.
+    """
+    key = (Path(repo_root).resolve(), name)
+    with _INDEX_LOCK:
+        cached = _INDEXES.get(key)
+        path = _parquet_path(key[0], name)
+        if cached is not None:
+            stamp = _file_stamp(path)
+            if cached[0] == stamp:
+                return cached[1]
+        if cached is None or stamp is None:
+            path = ingest_observations(name, repo_root=key[0], sources=sources)
+        index = ObservationIndex.load(path)
+        _INDEXES[key] = (_file_stamp(path), index)
+        if cached is not None:
+            metrics().increment("observations.index_reloads")
+            logger.info(f"Reloaded {name} observations after a re-ingest ({len(index)} rows)")
+        return index
+
+
+def reset_observation_indexes() -> None:
+    with _INDEX_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Iterable, Iterator, Mapping
+
+import numpy as np
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import cache_paths
+from backend.src.infra.sources import SourcesConfig
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+DRIVER_BANDS: tuple[str, ...] = ("ndvi", "ndwi", "lst_c", "precip_mm")
+# computePixels cannot emit NaN for masked pixels, so exports unmask to this and it is mapped back.
+_EXPORT_NODATA = -9999.0
+
+BBox = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class RasterGrid:
+    """North-up EPSG:4326 grid: the top-left corner, square pixel size in degrees, and shape."""
+
+    west: float
+    north: float
+    pixel_size: float
+    width: int
+    height: int
+    crs: str = "EPSG:4326"
+
+    @property
+    def bbox(self) -> BBox:
+        return (
+            self.west,
+            self.north - self.height * self.pixel_size,
+            self.west + self.width * self.pixel_size,
+            self.north,
+        )
+
+    def window(self, bbox: BBox) -> tuple[slice, slice] | None:
+        """Row/column slices covering `bbox`, clipped to the grid; None if they do not overlap."""
+        minx, miny, maxx, maxy = bbox
+        col0 = max(0, math.floor((minx - self.west) / self.pixel_size))
+        col1 = min(self.width, math.ceil((maxx - self.west) / self.pixel_size))
+        row0 = max(0, math.floor((self.north - maxy) / self.pixel_size))
+        row1 = min(self.height, math.ceil((self.north - miny) / self.pixel_size))
+        if col0 >= col1 or row0 >= row1:
+            return None
+        return slice(row0, row1), slice(col0, col1)
+
+    def subgrid(self, rows: slice, cols: slice) -> "RasterGrid":
+        """The grid of the pixels selected by `window`."""
+        return RasterGrid(
+            west=self.west + cols.start * self.pixel_size,
+            north=self.north - rows.start * self.pixel_size,
+            pixel_size=self.pixel_size,
+            width=cols.stop - cols.start,
+            height=rows.stop - rows.start,
+            crs=self.crs,
+        )
+
+    def pixel_centers(self) -> tuple[np.ndarray, np.ndarray]:
+        """Longitude and latitude of every pixel centre, each shaped (height, width)."""
+        lon = self.west + (np.arange(self.width) + 0.5) * self.pixel_size
+        lat = self.north - (np.arange(self.height) + 0.5) * self.pixel_size
+        return np.meshgrid(lon, lat)
+
+    @classmethod
+    def covering(cls, bbox: BBox, *, pixel_size: float) -> "RasterGrid":
+        minx, miny, maxx, maxy = bbox
+        return cls(
+            west=minx,
+            north=maxy,
+            pixel_size=pixel_size,
+            width=max(1, math.ceil((maxx - minx) / pixel_size)),
+            height=max(1, math.ceil((maxy - miny) / pixel_size)),
+        )
+
+
+@dataclass(frozen=True)
+class RasterTile:
+    """One stored (region tile, month); band arrays are read-only memory maps."""
+
+    region_id: str
+    month: str
+    grid: RasterGrid
+    bands: Mapping[str, np.ndarray]
+
+    def window(self, bbox: BBox) -> dict[str, np.ndarray] | None:
+        """Views (no copies) of every band over the part of `bbox` this tile covers."""
+        slices = self.grid.window(bbox)
+        if slices is None:
+            return None
+        rows, cols = slices
+        return {name: arr[rows, cols] for name, arr in self.bands.items()}
+
+    def clip(self, bbox: BBox) -> tuple[RasterGrid, dict[str, np.ndarray]] | None:
+        """Like `window`, together with the grid of the returned views."""
+        slices = self.grid.window(bbox)
+        if slices is None:
+            return None
+        rows, cols = slices
+        return self.grid.subgrid(rows, cols), {name: arr[rows, cols] for name, arr in self.bands.items()}
+
+
+def month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """First day of `month` and first day of the following month (exclusive end)."""
+    year, mon = (int(p) for p in month.split("-"))
+    start = date(year, mon, 1)
+    end = date(year + (mon == 12), mon % 12 + 1, 1)
+    return start, end
+
+
+def months_between(start: date, end: date) -> list[str]:
+    months: list[str] = []
+    year, mon = start.year, start.month
+    while (year, mon) <= (end.year, end.month):
+        months.append(f"{year:04d}-{mon:02d}")
+        year, mon = year + (mon == 12), mon % 12 + 1
+    return months
+
+
+def _overlap_area(a: BBox, b: BBox) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0.0, width) * max(0.0, height)
+
+
+def region_means(
+    parts: Iterable[tuple[RasterGrid, Mapping[str, np.ndarray]]], geometry: dict | None = None
+) -> dict[str, float | None]:
+    """Mean of every band over the pixels whose centres fall in `geometry` (every pixel without one).
+
+    NaN pixels are skipped; a band with no valid pixels has a None mean.
+    """
+    inside_of = None
+    if geometry is not None:
+        import shapely
+        from shapely.geometry import shape
+
+        region = shape(geometry)
+        shapely.prepare(region)
+        inside_of = lambda grid: shapely.contains_xy(region, *grid.pixel_centers())  # noqa: E731
+
+    sums: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    for grid, bands in parts:
+        inside = inside_of(grid) if inside_of is not None else None
+        for name, arr in bands.items():
+            values = np.asarray(arr[inside] if inside is not None else arr, dtype=np.float64)
+            valid = values[~np.isnan(values)]
+            sums[name] = sums.get(name, 0.0) + float(valid.sum())
+            counts[name] = counts.get(name, 0) + int(valid.size)
+    return {name: (sums[name] / counts[name] if counts[name] else None) for name in sums}
+
+
+def region_tiles(bbox: BBox, *, tile_degrees: float) -> list[tuple[str, BBox]]:
+    """Split `bbox` into a fixed lon/lat grid; ids encode the tile's south-west corner."""
+    minx, miny, maxx, maxy = bbox
+    tiles: list[tuple[str, BBox]] = []
+    x0 = math.floor(minx / tile_degrees)
+    y0 = math.floor(miny / tile_degrees)
+    for iy in range(y0, math.ceil(maxy / tile_degrees)):
+        for ix in range(x0, math.ceil(maxx / tile_degrees)):
+            west, south = ix * tile_degrees, iy * tile_degrees
+            region_id = f"r{tile_degrees:g}_{south:+.4f}_{west:+.4f}"
+            tiles.append((region_id, (west, south, west + tile_degrees, south + tile_degrees)))
+    return tiles
+
+
+class RasterStore:
+    """Driver composites exported per (region tile, month) as `.npy` files plus a JSON manifest.
+
+    Reads memory-map the arrays, so windows are served straight from the page cache
+    without copying. Writes go to temporary files and are renamed into place. The
+    manifest is re-read when another process (e.g. `export-rasters`) rewrites it.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._manifest_path = root / "manifest.json"
+        self._lock = threading.Lock()
+        self._manifest: dict | None = None
+        self._manifest_stamp: tuple[int, int] | None = None
+        self._open: dict[tuple[str, str], RasterTile] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = self._manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_manifest(self) -> dict:
+        stamp = self._stamp()
+        if self._manifest is None or stamp != self._manifest_stamp:
+            self._manifest = None
+            # Entries may have been re-exported under the same name; drop maps of the old files.
+            self._open.clear()
+            if stamp is not None:
+                raw = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+                if raw.get("version") == _MANIFEST_VERSION:
+                    self._manifest = raw
+            if self._manifest is None:
+                self._manifest = {"version": _MANIFEST_VERSION, "tiles": {}}
+            self._manifest_stamp = stamp
+        return self._manifest
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp = self._manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self._manifest_path)
+        self._manifest_stamp = self._stamp()
+
+    def put(self, region_id: str, month: str, grid: RasterGrid, bands: Mapping[str, np.ndarray]) -> None:
+        directory = self._root / region_id / month
+        directory.mkdir(parents=True, exist_ok=True)
+        entries: dict[str, dict] = {}
+        for name, arr in bands.items():
+            arr = np.asarray(arr)
+            if arr.shape != (grid.height, grid.width):
+                raise ValueError(f"Band {name!r} has shape {arr.shape}, expected {(grid.height, grid.width)}")
+            path = directory / f"{name}.npy"
+            tmp = directory / f"{name}.npy.tmp"
+            with tmp.open("wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp, path)
+            entries[name] = {"file": str(path.relative_to(self._root)), "dtype": str(arr.dtype)}
+
+        with self._lock:
+            manifest = self._load_manifest()
+            manifest["tiles"][f"{region_id}/{month}"] = {
+                "region_id": region_id,
+                "month": month,
+                "grid": asdict(grid),
+                "bands": entries,
+                "stored_at": time.time(),
+            }
+            self._write_manifest(manifest)
+            self._open.pop((region_id, month), None)
+
+    def has(self, region_id: str, month: str) -> bool:
+        with self._lock:
+            return f"{region_id}/{month}" in self._load_manifest()["tiles"]
+
+    def grid(self, region_id: str) -> RasterGrid | None:
+        """The grid `region_id` was stored on (taken from any of its months), or None if it has none."""
+        with self._lock:
+            for entry in self._load_manifest()["tiles"].values():
+                if entry["region_id"] == region_id:
+                    return RasterGrid(**entry["grid"])
+        return None
+
+    def get(self, region_id: str, month: str) -> RasterTile | None:
+        with self._lock:
+            entry = self._load_manifest()["tiles"].get(f"{region_id}/{month}")
+            tile = self._open.get((region_id, month))
+            if tile is not None:
+                return tile
+            if entry is None:
+                return None
+            try:
+                bands = {
+                    name: np.load(self._root / meta["file"], mmap_mode="r") for name, meta in entry["bands"].items()
+                }
+            except FileNotFoundError:
+                logger.warning(f"Raster store entry {region_id}/{month} is missing files")
+                return None
+            tile = RasterTile(region_id=region_id, month=month, grid=RasterGrid(**entry["grid"]), bands=bands)
+            self._open[(region_id, month)] = tile
+            return tile
+
+    def tiles_for(self, month: str, bbox: BBox) -> Iterator[RasterTile]:
+        """Stored tiles for `month` whose grid overlaps `bbox`."""
+        with self._lock:
+            entries = [e for e in self._load_manifest()["tiles"].values() if e["month"] == month]
+        for entry in entries:
+            if RasterGrid(**entry["grid"]).window(bbox) is None:
+                continue
+            tile = self.get(entry["region_id"], month)
+            if tile is not None:
+                yield tile
+
+    def covers(self, month: str, bbox: BBox) -> bool:
+        """Whether the tiles stored for `month` cover all of `bbox` (tiles come from one non-overlapping grid)."""
+        with self._lock:
+            grids = [RasterGrid(**e["grid"]) for e in self._load_manifest()["tiles"].values() if e["month"] == month]
+        area = _overlap_area(bbox, bbox)
+        covered = sum(_overlap_area(grid.bbox, bbox) for grid in grids)
+        return area > 0 and covered >= area * (1 - 1e-9)
+
+    def read_window(self, month: str, bbox: BBox) -> list[dict[str, np.ndarray]]:
+        """Zero-copy band windows over `bbox` for `month`, one per overlapping region tile."""
+        return [bands for _grid, bands in self.clipped(month, bbox)]
+
+    def clipped(self, month: str, bbox: BBox) -> list[tuple[RasterGrid, dict[str, np.ndarray]]]:
+        """`read_window`, with the grid of each window."""
+        parts = [tile.clip(bbox) for tile in self.tiles_for(month, bbox)]
+        return [p for p in parts if p is not None]
+
+    def region_means(self, month: str, bbox: BBox, geometry: dict | None = None) -> dict[str, float | None] | None:
+        """Band means for `month` over `geometry` (or all of `bbox`); None unless the store covers `bbox`."""
+        if not self.covers(month, bbox):
+            return None
+        return region_means(self.clipped(month, bbox), geometry)
+
+
+# One store per directory, so memory maps and the parsed manifest are shared across requests.
+_STORES: dict[Path, RasterStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def shared_store(root: Path) -> RasterStore:
+    with _STORES_LOCK:
+        store = _STORES.get(root)
+        if store is None:
+            store = _STORES[root] = RasterStore(root)
+        return store
+
+
+def reset_raster_stores() -> None:
+    with _STORES_LOCK:
+        _STORES.clear()
+
+
+def raster_store(repo_root: Path) -> RasterStore:
+    return shared_store(cache_paths(repo_root).subdir("rasters"))
+
+
+def compute_pixels(image, grid: RasterGrid, band_names: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """Pull an Earth Engine image onto `grid` as float32 arrays, with NaN for masked pixels."""
+    import ee  # type: ignore
+
+    prepared = image.rename(list(band_names)).unmask(_EXPORT_NODATA).toFloat()
+    try:
+        pixels = ee.data.computePixels(
+            {
+                "expression": prepared,
+                "fileFormat": "NUMPY_NDARRAY",
+                "grid": {
+                    "dimensions": {"width": grid.width, "height": grid.height},
+                    "affineTransform": {
+                        "scaleX": grid.pixel_size,
+                        "shearX": 0,
+                        "translateX": grid.west,
+                        "shearY": 0,
+                        "scaleY": -grid.pixel_size,
+                        "translateY": grid.north,
+                    },
+                    "crsCode": grid.crs,
+                },
+            }
+        )
+    except Exception as e:
+        raise DataUnavailableError("Failed to compute Earth Engine pixels") from e
+
+    bands: dict[str, np.ndarray] = {}
+    for name in band_names:
+        arr = np.asarray(pixels[name], dtype=np.float32)
+        bands[name] = np.where(arr == _EXPORT_NODATA, np.nan, arr).astype(np.float32)
+    return bands
+
+
+def export_driver_month(
+    *,
+    store: RasterStore,
+    region_id: str,
+    bbox: BBox,
+    month: str,
+    sources: SourcesConfig,
+    pixel_size: float,
+) -> RasterGrid:
+    """Compute one month of driver composites over `bbox` in Earth Engine and store the pixels."""
+    import ee  # type: ignore
+
+    from backend.src.infra.ee_composites import build_driver_composites
+
+    start, end = month_bounds(month)
+    region = ee.Geometry.Rectangle(list(bbox))
+    composites = build_driver_composites(region=region, start_date=start, end_date=end, sources=sources)
+    stacked = ee.Image.cat([composites.ndvi, composites.ndwi, composites.lst_c, composites.precip_mm])
+
+    grid = RasterGrid.covering(bbox, pixel_size=pixel_size)
+    try:
+        bands = compute_pixels(stacked, grid, DRIVER_BANDS)
+    except DataUnavailableError as e:
+        raise DataUnavailableError(f"Failed to export driver composites for {region_id} {month}") from e
+    store.put(region_id, month, grid, bands)
+    return grid
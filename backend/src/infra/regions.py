@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+import hashlib
+import logging
 from pathlib import Path
-
-import geopandas as gpd
+import threading
+from typing import Any
 
 from backend.src.domain.errors import DataUnavailableError
-from backend.src.infra.cache import cache_paths
+from backend.src.infra.cache import cache_paths, read_json, write_json
+from backend.src.infra.config import AppConfig
 from backend.src.infra.datasets import prepare_dataset
 from backend.src.infra.sources import SourcesConfig
 
+logger = logging.getLogger(__name__)
+
 
 def florida_boundary_geojson_path(*, repo_root: Path, sources: SourcesConfig) -> Path:
     url = sources.datasets.get("floridaboundaries")
@@ -20,9 +26,36 @@ def florida_boundary_geojson_path(*, repo_root: Path, sources: SourcesConfig) ->
     return artifact.local_path
 
 
-# TODO: instead of gdf.geometry.unary_union, use a more robust method, eg union_all
-def florida_geojson_geometry(*, repo_root: Path, sources: SourcesConfig) -> dict:
-    path = florida_boundary_geojson_path(repo_root=repo_root, sources=sources)
+@dataclass(frozen=True)
+class FloridaBoundary:
+    """The unioned, simplified Florida boundary as GeoJSON, with provenance of its source file."""
+
+    geometry: dict
+    bbox: tuple[float, float, float, float]
+    vertex_count: int
+    source_sha256: str
+
+
+_BOUNDARY_VERSION = 1
+_BOUNDARIES: dict[Path, FloridaBoundary] = {}
+_EE_GEOMETRIES: dict[Path, Any] = {}
+# Guards the two dicts above and is only ever held for a lookup or an insert.
+_BOUNDARY_LOCK = threading.Lock()
+# Serializes builds (download, union, simplify) so concurrent callers do not repeat them.
+_BUILD_LOCK = threading.Lock()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _union_florida_boundary(path: Path) -> dict:
+    import geopandas as gpd
+
     try:
         gdf = gpd.read_file(path)
     except Exception as e:
@@ -35,14 +68,150 @@ def florida_geojson_geometry(*, repo_root: Path, sources: SourcesConfig) -> dict
     return geom.__geo_interface__
 
 
-def florida_ee_geometry(*, repo_root: Path, sources: SourcesConfig):
+def _build_florida_boundary(*, repo_root: Path, sources: SourcesConfig) -> FloridaBoundary:
+    from shapely.geometry import shape
+
+    from backend.src.infra.ee_geometry import prepare_geometry
+
+    path = florida_boundary_geojson_path(repo_root=repo_root, sources=sources)
+    source_sha256 = _file_sha256(path)
+    boundary_dir = cache_paths(repo_root).subdir("boundaries")
+    meta_path = boundary_dir / "florida.json"
+    if meta_path.exists():
+        meta = read_json(meta_path)
+        if meta.get("version") == _BOUNDARY_VERSION and meta.get("source_sha256") == source_sha256:
+            return FloridaBoundary(
+                geometry=read_json(boundary_dir / "florida.geojson"),
+                bbox=tuple(float(v) for v in meta["bbox"]),
+                vertex_count=int(meta["vertex_count"]),
+                source_sha256=source_sha256,
+            )
+
+    prepared = prepare_geometry(
+        _union_florida_boundary(path), max_vertices=AppConfig().florida_boundary_max_vertices
+    )
+    write_json(boundary_dir / "florida.geojson", prepared.geometry)
+    (boundary_dir / "florida.wkb").write_bytes(shape(prepared.geometry).wkb)
+    write_json(
+        meta_path,
+        {
+            "version": _BOUNDARY_VERSION,
+            "source_url": sources.datasets.get("floridaboundaries"),
+            "source_sha256": source_sha256,
+            "bbox": list(prepared.bbox),
+            "vertex_count": prepared.vertex_count,
+            "original_vertex_count": prepared.original_vertex_count,
+        },
+    )
+    logger.info(
+        f"Cached Florida boundary with {prepared.vertex_count} vertices "
+        f"(from {prepared.original_vertex_count})"
+    )
+    return FloridaBoundary(
+        geometry=prepared.geometry,
+        bbox=prepared.bbox,
+        vertex_count=prepared.vertex_count,
+        source_sha256=source_sha256,
+    )
+
+
+def florida_boundary(*, repo_root: Path, sources: SourcesConfig) -> FloridaBoundary:
+    """The simplified statewide boundary, built once into the cache and then held in memory.
+
+    The cached copy is rebuilt only when the checksum of the source file changes.
+    """
+    key = Path(repo_root).resolve()
+    with _BOUNDARY_LOCK:
+        boundary = _BOUNDARIES.get(key)
+    if boundary is not None:
+        return boundary
+    # Built outside _BOUNDARY_LOCK so `statewide_ee_region` never waits on a download.
+    with _BUILD_LOCK:
+        with _BOUNDARY_LOCK:
+            boundary = _BOUNDARIES.get(key)
+        if boundary is None:
+            boundary = _build_florida_boundary(repo_root=key, sources=sources)
+            with _BOUNDARY_LOCK:
+                _BOUNDARIES[key] = boundary
+    return boundary
+
+
+def florida_geojson_geometry(*, repo_root: Path, sources: SourcesConfig) -> dict:
+    return florida_boundary(repo_root=repo_root, sources=sources).geometry
+
+
+def _ee_geometry(key: Path, boundary: FloridaBoundary):
     try:
         import ee  # type: ignore
     except Exception as e:  # pragma: no cover
         raise DataUnavailableError("earthengine-api is not available") from e
 
-    geojson = florida_geojson_geometry(repo_root=repo_root, sources=sources)
+    with _BOUNDARY_LOCK:
+        cached = _EE_GEOMETRIES.get(key)
+    if cached is not None:
+        return cached
     try:
-        return ee.Geometry(geojson)
+        geometry = ee.Geometry(boundary.geometry)
     except Exception as e:
         raise DataUnavailableError("Failed to convert Florida geometry to Earth Engine geometry") from e
+    with _BOUNDARY_LOCK:
+        return _EE_GEOMETRIES.setdefault(key, geometry)
+
+
+def florida_ee_geometry(*, repo_root: Path, sources: SourcesConfig):
+    boundary = florida_boundary(repo_root=repo_root, sources=sources)
+    return _ee_geometry(Path(repo_root).resolve(), boundary)
+
+
+def statewide_ee_region(geometry: dict, bbox: tuple[float, float, float, float] | None):
+    """The prebuilt ee.Geometry when `geometry` is an already-loaded Florida boundary, else None.
+
+    Statewide queries are geocoded to the boundary itself (see the gazetteer), so they
+    reuse one ee.Geometry instead of simplifying and converting the polygon per request.
+    Never loads or downloads a boundary, nor waits for one being built.
+    """
+    if bbox is None:
+        return None
+    bbox = tuple(float(v) for v in bbox)
+    with _BOUNDARY_LOCK:
+        loaded = list(_BOUNDARIES.items())
+    match = next(
+        ((key, boundary) for key, boundary in loaded if boundary.bbox == bbox and boundary.geometry == geometry),
+        None,
+    )
+    if match is None:
+        return None
+    return _ee_geometry(*match)
+
+
+def reset_florida_boundaries() -> None:
+    with _BOUNDARY_LOCK:
+        _BOUNDARIES.clear()
+        _EE_GEOMETRIES.clear()
+
+
+FLORIDA_STATE_FIPS = "12"
+
+
+def florida_counties_geodataframe(*, repo_root: Path, sources: SourcesConfig):
+    import geopandas as gpd
+
+    url = sources.datasets.get("uscounties")
+    if not url:
+        raise DataUnavailableError("Dataset source 'uscounties' is not configured")
+
+    cache = cache_paths(repo_root)
+    artifact = prepare_dataset("uscounties", url, cache)
+    shapefiles = sorted(artifact.local_path.glob("*.shp"))
+    if not shapefiles:
+        raise DataUnavailableError(f"No county shapefile found in {artifact.local_path}")
+
+    try:
+        gdf = gpd.read_file(shapefiles[0])
+    except Exception as e:
+        raise DataUnavailableError(f"Failed to read county boundaries from {shapefiles[0]}") from e
+
+    gdf = gdf[gdf["STATEFP"] == FLORIDA_STATE_FIPS]
+    if gdf.empty:
+        raise DataUnavailableError("County boundary dataset has no Florida counties")
+    return gdf[["GEOID", "NAME", "geometry"]].to_crs(epsg=4326).reset_index(drop=True)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import threading
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+import weakref
+
+from backend.src.infra.metrics import MetricsRegistry, metrics
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    done: threading.Event = field(default_factory=threading.Event)
+    result: T | None = None
+    error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Collapse concurrent calls with the same key onto one in-flight computation.
+
+    The first caller for a key runs the work; callers arriving while it is running
+    wait for and share its result (or exception). Nothing is cached afterwards.
+    Counts go to `singleflight.<name>.executed` and `singleflight.<name>.coalesced`.
+    """
+
+    def __init__(self, name: str, *, registry: MetricsRegistry | None = None) -> None:
+        self._name = name
+        self._registry = registry or metrics()
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._tasks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Future[Any]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            self._registry.increment(f"singleflight.{self._name}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        self._registry.increment(f"singleflight.{self._name}.executed")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        inflight = self._tasks.setdefault(loop, {})
+        task = inflight.get(key)
+        if task is not None:
+            self._registry.increment(f"singleflight.{self._name}.coalesced")
+        else:
+            self._registry.increment(f"singleflight.{self._name}.executed")
+            task = asyncio.ensure_future(fn())
+            inflight[key] = task
+
+            def _forget(finished: asyncio.Future[Any]) -> None:
+                if inflight.get(key) is finished:
+                    del inflight[key]
+
+            task.add_done_callback(_forget)
+        # Shield: one caller disconnecting must not cancel the work the others wait on.
+        return await asyncio.shield(task)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Callable
+
+import httpx
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import TtlLruCache, cache_paths
+from backend.src.infra.config import AppConfig, find_repo_root
+from backend.src.infra.ee_tiles import TileUrlTemplate, cached_map_id_template
+from backend.src.infra.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_LAYER_KEY_RE = re.compile(r"[0-9a-f]{64}")
+_MAX_ZOOM = 24
+
+
+def is_valid_tile(layer_key: str, z: int, x: int, y: int) -> bool:
+    if not _LAYER_KEY_RE.fullmatch(layer_key) or not 0 <= z <= _MAX_ZOOM:
+        return False
+    return 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def _lng_to_x(lng: float, z: int) -> int:
+    return int((lng + 180.0) / 360.0 * 2**z)
+
+
+def _lat_to_y(lat: float, z: int) -> int:
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    rad = math.radians(lat)
+    return int((1.0 - math.asinh(math.tan(rad)) / math.pi) / 2.0 * 2**z)
+
+
+def tiles_for_bbox(bbox: tuple[float, float, float, float], z: int) -> list[tuple[int, int]]:
+    """XYZ (x, y) tiles at zoom `z` covering a (minx, miny, maxx, maxy) lon/lat box."""
+    minx, miny, maxx, maxy = bbox
+    last = 2**z - 1
+    x0, x1 = max(0, _lng_to_x(minx, z)), min(last, _lng_to_x(maxx, z))
+    y0, y1 = max(0, _lat_to_y(maxy, z)), min(last, _lat_to_y(miny, z))
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def tile_etag(layer_key: str, z: int, x: int, y: int) -> str:
+    # A layer key hashes the expression graph and vis params, so a tile's bytes never change.
+    return '"' + hashlib.sha256(f"{layer_key}/{z}/{x}/{y}".encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def client_tile_url(template: TileUrlTemplate) -> str:
+    """The tile URL handed to clients: the proxy route when enabled, otherwise Earth Engine's.
+
+    Proxied layer keys are also recorded next to the disk tile cache, so any worker on
+    this host can resolve them until the map id expires.
+    """
+    base_url = AppConfig().tile_proxy_base_url
+    if base_url is None or template.layer_key is None:
+        return template.url
+    tile_proxy(find_repo_root()).remember(template)
+    return f"{base_url}/tiles/{template.layer_key}/{{z}}/{{x}}/{{y}}.png"
+
+
+class DiskTileCache:
+    """PNG tiles on local disk under `<root>/<layer_key>/<z>/<x>/<y>.png`, bounded by total size.
+
+    Reads bump a tile's mtime; when a write pushes the total over `max_bytes`, the
+    least recently used tiles are removed until the cache is back under 90% of it.
+    Each layer directory also keeps the upstream template its key stands for.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    def _path(self, layer_key: str, z: int, x: int, y: int) -> Path:
+        return self._root / layer_key / str(z) / str(x) / f"{y}.png"
+
+    def get(self, layer_key: str, z: int, x: int, y: int) -> bytes | None:
+        path = self._path(layer_key, z, x, y)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def has(self, layer_key: str, z: int, x: int, y: int) -> bool:
+        return self._path(layer_key, z, x, y).exists()
+
+    def get_template(self, layer_key: str, *, max_age_seconds: float) -> TileUrlTemplate | None:
+        path = self._root / layer_key / "template.json"
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - float(stored.get("stored_at", 0)) > max_age_seconds:
+            return None
+        return TileUrlTemplate(url=stored["url"], layer_key=layer_key)
+
+    def put_template(self, template: TileUrlTemplate) -> None:
+        path = self._root / str(template.layer_key) / "template.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"url": template.url, "stored_at": time.time()}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def put(self, layer_key: str, z: int, x: int, y: int, data: bytes) -> None:
+        path = self._path(layer_key, z, x, y)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self._max_bytes:
+                self._evict_locked(target_bytes=int(self._max_bytes * 0.9))
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return self._size
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self._root.rglob("*.png"))
+
+    def _evict_locked(self, *, target_bytes: int) -> None:
+        entries = []
+        for p in self._root.rglob("*.png"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        evicted = 0
+        for _mtime, file_size, p in entries:
+            if size <= target_bytes:
+                break
+            p.unlink(missing_ok=True)
+            size -= file_size
+            evicted += 1
+        self._size = size
+        metrics().increment("tiles.cache_evictions", evicted)
+
+
+class TileProxy:
+    """Serves tiles from the disk cache, fetching misses from Earth Engine over a pooled client.
+
+    Layer keys resolve through this process's map-id cache, then through the templates
+    recorded on disk by `remember`. Both last only as long as the map id token, and the
+    disk copy is shared only by workers using the same cache directory; anything else
+    is treated as expired.
+    """
+
+    def __init__(
+        self,
+        cache: DiskTileCache,
+        *,
+        client: httpx.Client | None = None,
+        resolve: Callable[[str], TileUrlTemplate | None] = cached_map_id_template,
+    ) -> None:
+        config = AppConfig()
+        self._cache = cache
+        self._resolve = resolve
+        self._template_ttl_seconds = config.mapid_cache_ttl_seconds
+        # Keys written recently; rewritten after half a token lifetime so the disk copy stays current.
+        self._remembered: TtlLruCache[str, bool] = TtlLruCache(
+            max_entries=config.mapid_cache_max_entries, ttl_seconds=config.mapid_cache_ttl_seconds / 2
+        )
+        self._client = client or httpx.Client(
+            timeout=config.tile_upstream_timeout_seconds,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+
+    def remember(self, template: TileUrlTemplate) -> None:
+        """Record `template` on disk for other workers."""
+        if template.layer_key is None or self._remembered.get(template.layer_key):
+            return
+        self._remembered.put(template.layer_key, True)
+        self._cache.put_template(template)
+
+    def resolve(self, layer_key: str) -> TileUrlTemplate | None:
+        template = self._resolve(layer_key)
+        if template is None:
+            template = self._cache.get_template(layer_key, max_age_seconds=self._template_ttl_seconds)
+        return template
+
+    def knows(self, layer_key: str, z: int, x: int, y: int) -> bool:
+        """Whether this tile can be served: it is on disk or its layer key still resolves."""
+        return self._cache.has(layer_key, z, x, y) or self.resolve(layer_key) is not None
+
+    def cached(self, layer_key: str, z: int, x: int, y: int) -> bytes | None:
+        data = self._cache.get(layer_key, z, x, y)
+        if data is not None:
+            metrics().increment("tiles.cache_hits")
+        return data
+
+    def fetch(self, layer_key: str, z: int, x: int, y: int) -> bytes | None:
+        """Fetch and store a tile; None if the layer key is unknown or its token has expired."""
+        data = self.cached(layer_key, z, x, y)
+        if data is not None:
+            return data
+
+        template = self.resolve(layer_key)
+        if template is None:
+            return None
+        metrics().increment("tiles.cache_misses")
+        url = template.url.replace("{z}", str(z)).replace("{x}", str(x)).replace("{y}", str(y))
+        started = time.perf_counter()
+        try:
+            resp = self._client.get(url)
+        except httpx.HTTPError as e:
+            raise DataUnavailableError("Failed to fetch Earth Engine tile") from e
+        metrics().set_gauge("tiles.upstream_latency_ms", (time.perf_counter() - started) * 1000)
+        if resp.status_code != 200:
+            logger.warning(f"Earth Engine tile request failed with status {resp.status_code}")
+            raise DataUnavailableError(f"Earth Engine tile request failed ({resp.status_code})")
+
+        data = resp.content
+        self._cache.put(layer_key, z, x, y, data)
+        return data
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_PROXIES: dict[Path, TileProxy] = {}
+_PROXIES_LOCK = threading.Lock()
+
+
+def tile_proxy(repo_root: Path) -> TileProxy:
+    """Process-wide proxy per repo root so the connection pool is shared across requests."""
+    key = Path(repo_root).resolve()
+    with _PROXIES_LOCK:
+        proxy = _PROXIES.get(key)
+        if proxy is None:
+            cache = DiskTileCache(cache_paths(key).subdir("tiles"), max_bytes=AppConfig().tile_cache_max_bytes)
+            proxy = TileProxy(cache)
+            _PROXIES[key] = proxy
+        return proxy
+
+
+def reset_tile_proxies() -> None:
+    with _PROXIES_LOCK:
+        proxies = list(_PROXIES.values())
+        _PROXIES.clear()
+    for proxy in proxies:
+        proxy.close()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from backend.src.domain.errors import LocationNotFoundError
+from backend.src.infra.config import find_repo_root
+from backend.src.infra.sources import default_sources_yaml_path, load_sources_config
+
+
+class CountyService:
+    def __init__(self, *, repo_root: Path) -> None:
+        self._repo_root = repo_root
+
+    @classmethod
+    def from_repo_root(cls) -> "CountyService":
+        return cls(repo_root=find_repo_root())
+
+    def summary(self, *, name: str) -> dict:
+        # Imported here so building the app does not pull in NumPy.
+        from backend.src.infra.county_summary import county_summary_table
+        from backend.src.infra.observations import observation_index
+
+        sources = load_sources_config(default_sources_yaml_path(self._repo_root))
+        table = county_summary_table(self._repo_root, sources=sources)
+        # Counts only sightings added since the last refresh; a no-op for the same index.
+        table.refresh(observation_index(self._repo_root, "mosquito", sources=sources))
+        geoid = table.find(name)
+        if geoid is None:
+            raise LocationNotFoundError(f"Unknown Florida county: {name}")
+        return table.summary(geoid)
@@ -2,24 +2,26 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 from pathlib import Path
-from uuid import uuid4
 
 from backend.src.domain.errors import DataUnavailableError
-from backend.src.domain.models import DateRange
+from backend.src.domain.models import DateRange, Location
 from backend.src.domain.validation import validate_date_range
-from backend.src.infra.ee_client import EarthEngineClient
+from backend.src.infra.canonical import canonical_dates, canonical_location
+from backend.src.infra.concurrency import fan_out, run_blocking
+from backend.src.infra.config import AppConfig, find_repo_root
+from backend.src.infra.ee_composites import build_driver_composites
 from backend.src.infra.ee_tiles import ee_image_tile_url_template
-from backend.src.infra.ee_geometry import region_and_viewport_from_location
-from backend.src.infra.geocoding import default_geocoder, location_from_geocoding
+from backend.src.infra.ee_geometry import local_region, prepare_region
+from backend.src.infra.ee_session import ee_session
+from backend.src.infra.geocode_store import geocode_key
+from backend.src.infra.geocoding import default_geocoder
+from backend.src.infra.singleflight import SingleFlight
 from backend.src.infra.sources import default_sources_yaml_path, load_sources_config, merge_local_auth_token
+from backend.src.infra.tile_proxy import client_tile_url
 
 
-def _repo_root_from_here() -> Path:
-    current = Path(__file__).resolve()
-    for parent in [current.parent, *current.parents]:
-        if (parent / "pyproject.toml").exists():
-            return parent
-    raise DataUnavailableError("Could not locate repo root (pyproject.toml not found)")
+_DRIVERS_QUERIES: SingleFlight[dict] = SingleFlight("drivers_query")
+_TIMESERIES_QUERIES: SingleFlight[dict] = SingleFlight("drivers_timeseries")
 
 
 class DriversService:
@@ -28,13 +30,53 @@ class DriversService:
 
     @classmethod
     def from_repo_root(cls) -> "DriversService":
-        return cls(repo_root=_repo_root_from_here())
+        return cls(repo_root=find_repo_root())
 
     def query(self, *, location_text: str, start_date: date | None = None, end_date: date | None = None) -> dict:
-        geocoder = default_geocoder()
-        result = geocoder.geocode(location_text)
-        location = location_from_geocoding(str(uuid4()), location_text, result)
+        start, end = self._date_window(start_date, end_date)
+        return _DRIVERS_QUERIES.do(
+            (geocode_key(location_text), start, end),
+            lambda: self._query(location_text=location_text, start=start, end=end),
+        )
+
+    async def aquery(self, *, location_text: str, start_date: date | None = None, end_date: date | None = None) -> dict:
+        start, end = self._date_window(start_date, end_date)
+        return await _DRIVERS_QUERIES.ado(
+            (geocode_key(location_text), start, end),
+            lambda: self._aquery(location_text=location_text, start=start, end=end),
+        )
 
+    def _query(self, *, location_text: str, start: date, end: date) -> dict:
+        result = default_geocoder(repo_root=self._repo_root).geocode(location_text)
+        location = canonical_location(location_text, result)
+        return self._drivers_response(location=location, start=start, end=end)
+
+    async def _aquery(self, *, location_text: str, start: date, end: date) -> dict:
+        result = await default_geocoder(repo_root=self._repo_root).ageocode(location_text)
+        location = canonical_location(location_text, result)
+        return await run_blocking(
+            lambda: self._drivers_response(location=location, start=start, end=end),
+            upstream="earthengine",
+        )
+
+    async def atimeseries(
+        self, *, location_text: str, start_date: date | None = None, end_date: date | None = None
+    ) -> dict:
+        start, end = self._date_window(start_date, end_date)
+        return await _TIMESERIES_QUERIES.ado(
+            (geocode_key(location_text), start, end),
+            lambda: self._atimeseries(location_text=location_text, start=start, end=end),
+        )
+
+    async def _atimeseries(self, *, location_text: str, start: date, end: date) -> dict:
+        result = await default_geocoder(repo_root=self._repo_root).ageocode(location_text)
+        location = canonical_location(location_text, result)
+        return await run_blocking(
+            lambda: self._timeseries_response(location=location, start=start, end=end),
+            upstream="earthengine",
+        )
+
+    def _date_window(self, start_date: date | None, end_date: date | None) -> tuple[date, date]:
         if start_date is None or end_date is None:
             end = date.today()
             start = end - timedelta(days=365 * 2)
@@ -43,74 +85,84 @@ class DriversService:
             end = end_date
 
         validate_date_range(DateRange(start_date=start, end_date=end))
+        return canonical_dates(start, end)
+
+    def _timeseries_response(self, *, location: Location, start: date, end: date) -> dict:
+        # The raster store pulls in numpy; keep it off the import path.
+        from backend.src.eda.driver_timeseries import driver_timeseries, stored_driver_timeseries
+        from backend.src.infra.raster_store import raster_store
+
+        store = raster_store(self._repo_root)
+        local = local_region(location_geometry=location.geometry, location_bbox=location.bbox)
+        # Exported history is served from local disk before Earth Engine is touched at all.
+        series = (
+            stored_driver_timeseries(store=store, local=local, start_date=start, end_date=end)
+            if local is not None
+            else None
+        )
+        if series is None:
+            sources = load_sources_config(default_sources_yaml_path(self._repo_root))
+            sources = merge_local_auth_token(sources, repo_root=self._repo_root)
+
+            ee_session(sources.googleearthengine.projectid).ensure_initialized()
+
+            prepared = prepare_region(location_geometry=location.geometry, location_bbox=location.bbox)
+            series = driver_timeseries(
+                region=prepared.region,
+                start_date=start,
+                end_date=end,
+                sources=sources,
+                bounds=prepared.bounds,
+                store=store,
+                local=local,
+            )
+        return {
+            "location_label": location.label,
+            "date_range": {"start_date": start, "end_date": end},
+            **series,
+        }
 
+    def _drivers_response(self, *, location: Location, start: date, end: date) -> dict:
         sources = load_sources_config(default_sources_yaml_path(self._repo_root))
         sources = merge_local_auth_token(sources, repo_root=self._repo_root)
 
-        client = EarthEngineClient(project=sources.googleearthengine.projectid)
-        client.initialize()
+        ee_session(sources.googleearthengine.projectid).ensure_initialized()
 
-        import ee  # type: ignore
+        prepared = prepare_region(location_geometry=location.geometry, location_bbox=location.bbox)
+        viewport = prepared.viewport
 
-        region, viewport = region_and_viewport_from_location(
-            location_geometry=location.geometry,
-            location_bbox=location.bbox,
+        composites = build_driver_composites(
+            region=prepared.region, start_date=start, end_date=end, sources=sources, bounds=prepared.bounds
         )
 
-        window_days = (end - start).days + 1
-
-        def _mask_s2_clouds(img):
-            qa = img.select("QA60")
-            cloud_bit_mask = 1 << 10
-            cirrus_bit_mask = 1 << 11
-            mask = qa.bitwiseAnd(cloud_bit_mask).eq(0).And(qa.bitwiseAnd(cirrus_bit_mask).eq(0))
-            return img.updateMask(mask)
-
-        s2_id = sources.eeimagesets.get("vegetation")
-        lst_id = sources.eeimagesets.get("land_surface_temperature")
-        chirps_id = sources.eeimagesets.get("precipitation")
-        if not (s2_id and lst_id and chirps_id):
-            raise DataUnavailableError("Earth Engine image sets are not configured")
-
-        # Vegetation: NDVI from Sentinel-2 SR (B8 NIR, B4 RED)
-        s2 = (
-            ee.ImageCollection(s2_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-            .map(_mask_s2_clouds)
-        )
-        s2_img = s2.median()
-        ndvi = s2_img.normalizedDifference(["B8", "B4"]).rename("ndvi").clip(region)
+        ndvi = composites.ndvi
         ndvi_vis = {"min": 0.0, "max": 1.0, "palette": ["#f7fcf5", "#74c476", "#00441b"]}
 
-        # Temperature: MODIS LST Day (Kelvin * 0.02). Convert to Celsius for visualization.
-        lst = (
-            ee.ImageCollection(lst_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-            .select(["LST_Day_1km"])
-        )
-        lst_img = lst.mean().multiply(0.02).subtract(273.15).rename("lst_c").clip(region)
+        lst_img = composites.lst_c
         lst_vis = {"min": 10, "max": 40, "palette": ["#2c7bb6", "#ffffbf", "#d7191c"]}
 
-        # Precipitation: CHIRPS daily mm/day, sum over window
-        chirps = (
-            ee.ImageCollection(chirps_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-        )
-        precip = chirps.sum().rename("precip_mm").clip(region)
-        precip_max = min(3000, max(100, window_days * 20))
+        precip = composites.precip_mm
+        precip_max = min(3000, max(100, composites.window_days * 20))
         precip_vis = {"min": 0, "max": precip_max, "palette": ["#f7fbff", "#6baed6", "#08306b"]}
 
-        # Standing water proxy: NDWI from Sentinel-2 (B3 green, B8 NIR)
-        ndwi = s2_img.normalizedDifference(["B3", "B8"]).rename("ndwi").clip(region)
+        ndwi = composites.ndwi
         ndwi_vis = {"min": -0.3, "max": 0.6, "palette": ["#bdbdbd", "#41b6c4", "#0c2c84"]}
 
-        ndvi_tile = ee_image_tile_url_template(ndvi, ndvi_vis)
-        lst_tile = ee_image_tile_url_template(lst_img, lst_vis)
-        precip_tile = ee_image_tile_url_template(precip, precip_vis)
-        ndwi_tile = ee_image_tile_url_template(ndwi, ndwi_vis)
+        map_tiles = fan_out(
+            {
+                "vegetation": lambda: ee_image_tile_url_template(ndvi, ndvi_vis),
+                "temperature": lambda: ee_image_tile_url_template(lst_img, lst_vis),
+                "precipitation": lambda: ee_image_tile_url_template(precip, precip_vis),
+                "standing_water": lambda: ee_image_tile_url_template(ndwi, ndwi_vis),
+            },
+            timeout_seconds=AppConfig().ee_layer_timeout_seconds,
+        )
+        if not map_tiles.values:
+            raise DataUnavailableError("Failed to generate Earth Engine tile URLs")
+
+        def _url(driver_type: str) -> str | None:
+            tile = map_tiles.values.get(driver_type)
+            return client_tile_url(tile) if tile is not None else None
 
         tiles = [
             {
@@ -118,7 +170,7 @@ class DriversService:
                 "title": "Vegetation",
                 "summary": "NDVI composite for the selected date range.",
                 "metrics": {"index": "NDVI"},
-                "tile_url_template": ndvi_tile.url,
+                "tile_url_template": _url("vegetation"),
                 "attribution": "Sentinel-2 SR Harmonized (Copernicus) via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -133,7 +185,7 @@ class DriversService:
                 "title": "Temperature",
                 "summary": "Mean land surface temperature (°C) for the selected date range.",
                 "metrics": {"units": "C"},
-                "tile_url_template": lst_tile.url,
+                "tile_url_template": _url("temperature"),
                 "attribution": "MODIS LST (MOD11A1) via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -148,7 +200,7 @@ class DriversService:
                 "title": "Precipitation / Standing Water",
                 "summary": "Total precipitation (mm) and NDWI standing-water proxy for the selected date range.",
                 "metrics": {"precip_units": "mm", "index": "NDWI"},
-                "tile_url_template": precip_tile.url,
+                "tile_url_template": _url("precipitation"),
                 "attribution": "CHIRPS Daily Precipitation via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -163,7 +215,7 @@ class DriversService:
                 "title": "Standing Water (proxy)",
                 "summary": "NDWI composite (water proxy) for the selected date range.",
                 "metrics": {"index": "NDWI"},
-                "tile_url_template": ndwi_tile.url,
+                "tile_url_template": _url("standing_water"),
                 "attribution": "Sentinel-2 SR Harmonized (Copernicus) via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -179,5 +231,8 @@ class DriversService:
             "location_label": location.label,
             "date_range": {"start_date": start, "end_date": end},
             "tiles": tiles,
+            "layer_errors": [
+                {"layer_id": driver_type, "detail": detail} for driver_type, detail in map_tiles.errors.items()
+            ],
             "viewport": viewport,
         }
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+from typing import Any
+
+from backend.src.infra.config import find_repo_root
+from backend.src.infra.sources import default_sources_yaml_path, load_sources_config
+
+BBox = tuple[float, float, float, float]
+
+# (repo_root, dataset) -> (observation index the pyramid was built from, pyramid)
+_PYRAMIDS: dict[tuple[Path, str], tuple[Any, Any]] = {}
+_PYRAMIDS_LOCK = threading.Lock()
+
+
+def reset_hotspot_pyramids() -> None:
+    with _PYRAMIDS_LOCK:
+        _PYRAMIDS.clear()
+
+
+class HotspotService:
+    def __init__(self, *, repo_root: Path) -> None:
+        self._repo_root = repo_root
+
+    @classmethod
+    def from_repo_root(cls) -> "HotspotService":
+        return cls(repo_root=find_repo_root())
+
+    def _pyramid(self, dataset: str):
+        # Imported here so building the app does not pull in NumPy.
+        from backend.src.eda.hotspots import HotspotPyramid
+        from backend.src.infra.observations import observation_index
+
+        sources = load_sources_config(default_sources_yaml_path(self._repo_root))
+        index = observation_index(self._repo_root, dataset, sources=sources)
+        key = (Path(self._repo_root).resolve(), dataset)
+        with _PYRAMIDS_LOCK:
+            cached = _PYRAMIDS.get(key)
+            if cached is None or cached[0] is not index:
+                table = index.table
+                pyramid = HotspotPyramid.build(table.column("lon").to_numpy(), table.column("lat").to_numpy())
+                cached = (index, pyramid)
+                _PYRAMIDS[key] = cached
+            return cached[1]
+
+    def query(self, *, dataset: str, bbox: BBox, z: int, smooth: bool = False) -> dict:
+        cells = self._pyramid(dataset).query(bbox, z, smooth=smooth)
+        return {"dataset": dataset, "bbox": bbox, "smoothed": smooth, **cells}
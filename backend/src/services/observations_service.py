@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from backend.src.domain.models import DateRange
+from backend.src.domain.validation import validate_date_range
+from backend.src.infra.config import find_repo_root
+from backend.src.infra.sources import default_sources_yaml_path, load_sources_config
+
+BBox = tuple[float, float, float, float]
+
+# Columns every observation response carries at the top level; the rest go under "properties".
+_TOP_LEVEL = ("lon", "lat", "site_id", "measured_at", "country_code")
+
+
+class ObservationsService:
+    def __init__(self, *, repo_root: Path) -> None:
+        self._repo_root = repo_root
+
+    @classmethod
+    def from_repo_root(cls) -> "ObservationsService":
+        return cls(repo_root=find_repo_root())
+
+    def query(
+        self,
+        *,
+        dataset: str,
+        bbox: BBox,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int = 1000,
+    ) -> dict:
+        if start_date is not None and end_date is not None:
+            validate_date_range(DateRange(start_date=start_date, end_date=end_date), allow_future=True)
+
+        # Imported here so building the app does not pull in NumPy.
+        from backend.src.infra.observations import observation_index
+
+        sources = load_sources_config(default_sources_yaml_path(self._repo_root))
+        index = observation_index(self._repo_root, dataset, sources=sources)
+        rows = index.rows(bbox, start=start_date, end=end_date)
+        observations = []
+        for record in index.records(rows[:limit]):
+            top = {key: record.pop(key, None) for key in _TOP_LEVEL}
+            observations.append({**top, "properties": record})
+
+        return {
+            "dataset": dataset,
+            "bbox": bbox,
+            "date_range": (
+                {"start_date": start_date, "end_date": end_date}
+                if start_date is not None and end_date is not None
+                else None
+            ),
+            "count": int(len(rows)),
+            "truncated": len(rows) > limit,
+            "observations": observations,
+        }
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import logging
+import threading
+import time
+from typing import Callable, Iterator
+
+from backend.src.domain.errors import DomainError
+from backend.src.domain.models import Location
+from backend.src.infra.config import AppConfig
+from backend.src.infra.ee_geometry import local_region
+from backend.src.infra.florida import florida_county_queries
+from backend.src.infra.metrics import metrics
+from backend.src.infra.tile_proxy import TileProxy, tiles_for_bbox
+from backend.src.services.risk_service import RiskService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_DAYS: tuple[int, ...] = (30, 90, 365)
+
+
+@dataclass(frozen=True)
+class PreseedPlan:
+    """What to warm: every (location, trailing window, layer) and its tiles over a zoom range."""
+
+    locations: tuple[str, ...] = field(default_factory=lambda: tuple(florida_county_queries()))
+    window_days: tuple[int, ...] = DEFAULT_WINDOW_DAYS
+    layer_ids: tuple[str, ...] | None = None
+    min_zoom: int = 6
+    max_zoom: int = 10
+    tile_concurrency: int = 4
+    # Earth Engine quota guards: a hard cap on tile requests per run and a steady request rate.
+    max_tile_requests: int = 20_000
+    requests_per_second: float = 10.0
+
+    @classmethod
+    def from_config(cls, config: AppConfig | None = None) -> "PreseedPlan":
+        config = config or AppConfig()
+        return cls(min_zoom=config.preseed_min_zoom, max_zoom=config.preseed_max_zoom)
+
+
+@dataclass(frozen=True)
+class PreseedReport:
+    map_ids: int = 0
+    map_id_failures: int = 0
+    tiles_fetched: int = 0
+    tiles_failed: int = 0
+    tiles_skipped: int = 0
+    # Tiles already in the disk cache: no upstream request was made for them.
+    tiles_cached: int = 0
+
+
+class _RateLimiter:
+    def __init__(self, per_second: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_at)
+            self._next_at = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _location_bbox(location: Location) -> tuple[float, float, float, float] | None:
+    if location.bbox is not None:
+        return location.bbox
+    region = local_region(location_geometry=location.geometry or {}, location_bbox=location.bbox)
+    return region.bbox if region is not None else None
+
+
+def trailing_windows(window_days: tuple[int, ...], *, today: date | None = None) -> Iterator[tuple[date, date]]:
+    end = today or date.today()
+    for days in window_days:
+        yield end - timedelta(days=days), end
+
+
+def preseed(
+    plan: PreseedPlan,
+    *,
+    risk_service: RiskService,
+    proxy: TileProxy | None,
+    today: date | None = None,
+) -> PreseedReport:
+    """Resolve map ids for each (location, window, layer) and, with a proxy, fill its tile cache.
+
+    Map ids land in the process-wide map-id cache, so later requests for the same
+    combination skip `getMapId`. Only `plan.layer_ids` are resolved. Each entry's tiles
+    are fetched right after its map ids, while the tokens are fresh, with
+    `plan.tile_concurrency` workers paced at `plan.requests_per_second`; fetching stops
+    at `plan.max_tile_requests`.
+    """
+    limiter = _RateLimiter(plan.requests_per_second)
+    map_ids = map_id_failures = skipped = 0
+    budget = plan.max_tile_requests
+    outcomes = {"fetched": 0, "cached": 0, "failed": 0}
+
+    def _fetch(job: tuple[str, int, int, int]) -> str:
+        layer_key, z, x, y = job
+        if proxy.cached(layer_key, z, x, y) is not None:
+            return "cached"
+        limiter.wait()
+        try:
+            return "fetched" if proxy.fetch(layer_key, z, x, y) is not None else "failed"
+        except DomainError as e:
+            logger.warning(f"Preseed tile {z}/{x}/{y} failed: {e}")
+            return "failed"
+
+    with ThreadPoolExecutor(max_workers=max(1, plan.tile_concurrency), thread_name_prefix="preseed") as pool:
+        for location_text in plan.locations:
+            for start, end in trailing_windows(plan.window_days, today=today):
+                try:
+                    location, tiles = risk_service.layer_tiles(
+                        location_text=location_text, start_date=start, end_date=end, layer_ids=plan.layer_ids
+                    )
+                except DomainError as e:
+                    logger.warning(f"Preseed skipped {location_text!r} {start}..{end}: {e}")
+                    map_id_failures += 1
+                    continue
+                map_id_failures += len(tiles.errors)
+                map_ids += len(tiles.values)
+                if proxy is None:
+                    continue
+                bbox = _location_bbox(location)
+                jobs: list[tuple[str, int, int, int]] = []
+                for template in tiles.values.values():
+                    if bbox is None or template.layer_key is None:
+                        continue
+                    for z in range(plan.min_zoom, plan.max_zoom + 1):
+                        jobs.extend((template.layer_key, z, x, y) for x, y in tiles_for_bbox(bbox, z))
+                skipped += max(0, len(jobs) - budget)
+                jobs = jobs[:budget]
+                budget -= len(jobs)
+                for outcome in pool.map(_fetch, jobs):
+                    outcomes[outcome] += 1
+
+    if skipped:
+        logger.warning(f"Preseed capped at {plan.max_tile_requests} tiles; skipped {skipped}")
+    metrics().increment("preseed.map_ids", map_ids)
+    metrics().increment("preseed.tiles_fetched", outcomes["fetched"])
+    metrics().increment("preseed.tiles_cached", outcomes["cached"])
+    return PreseedReport(
+        map_ids=map_ids,
+        map_id_failures=map_id_failures,
+        tiles_fetched=outcomes["fetched"],
+        tiles_failed=outcomes["failed"],
+        tiles_skipped=skipped,
+        tiles_cached=outcomes["cached"],
+    )
@@ -1,28 +1,96 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import asdict
-from datetime import date, timedelta
+from datetime import date
+import logging
 from pathlib import Path
-from uuid import uuid4
+from typing import AsyncIterator, Collection
 
-from backend.src.domain.errors import DataUnavailableError, InvalidDateRangeError
-from backend.src.domain.models import DateRange, RiskBand, default_risk_bands
+from backend.src.domain.errors import DataUnavailableError, DomainError, InvalidLocationError
+from backend.src.domain.models import DateRange, Location, RegionalMeans, RiskBand, default_risk_bands
 from backend.src.domain.validation import validate_date_range
-from backend.src.eda.risk_mapping import build_default_risk_image
-from backend.src.infra.ee_client import EarthEngineClient
-from backend.src.infra.ee_tiles import ee_image_tile_url_template
-from backend.src.infra.ee_geometry import region_and_viewport_from_location
-from backend.src.infra.geocoding import default_geocoder, location_from_geocoding
-from backend.src.infra.regions import florida_ee_geometry
-from backend.src.infra.sources import default_sources_yaml_path, load_sources_config, merge_local_auth_token
+from backend.src.eda.risk_mapping import build_risk_image, cube_regional_means, regional_means
+from backend.src.infra.cache import TtlLruCache
+from backend.src.infra.canonical import canonical_dates, canonical_location
+from backend.src.infra.concurrency import FanOutResult, fan_out, run_blocking
+from backend.src.infra.config import AppConfig, find_repo_root
+from backend.src.infra.ee_composites import DriverComposites, build_driver_composites
+from backend.src.infra.ee_tiles import ee_image_tile_url_template, fresh_map_ids
+from backend.src.infra.ee_geometry import PreparedRegion, prepare_region
+from backend.src.infra.ee_session import ee_session
+from backend.src.infra.geocode_store import geocode_key
+from backend.src.infra.geocoding import default_geocoder
+from backend.src.infra.metrics import metrics
+from backend.src.infra.singleflight import SingleFlight
+from backend.src.infra.sources import (
+    SourcesConfig,
+    default_sources_yaml_path,
+    load_sources_config,
+    merge_local_auth_token,
+)
+from backend.src.infra.tile_proxy import client_tile_url
 
+logger = logging.getLogger(__name__)
 
-def _repo_root_from_here() -> Path:
-    current = Path(__file__).resolve()
-    for parent in [current.parent, *current.parents]:
-        if (parent / "pyproject.toml").exists():
-            return parent
-    raise DataUnavailableError("Could not locate repo root (pyproject.toml not found)")
+# Fixed default parameters per spec: ZIP 33172, date range 2023-01-01 to 2024-12-31
+DEFAULT_LOCATION_TEXT = "33172"
+DEFAULT_START_DATE = date(2023, 1, 1)
+DEFAULT_END_DATE = date(2024, 12, 31)
+
+# Identical concurrent queries (e.g. after a county health alert) share one computation.
+_RISK_QUERIES: SingleFlight[dict] = SingleFlight("risk_query")
+_DEFAULT_QUERY_KEY = ("default",)
+
+
+def _query_key(location_text: str, start_date: date, end_date: date) -> tuple:
+    return ("query", geocode_key(location_text), start_date, end_date)
+
+
+# The default response never changes except for its map tokens, so it is held for
+# the token lifetime and refreshed ahead of expiry by the app lifespan.
+_DEFAULT_RESPONSE: TtlLruCache[tuple, dict] = TtlLruCache(
+    max_entries=1, ttl_seconds=AppConfig().mapid_cache_ttl_seconds
+)
+
+
+def _cached_default_response() -> dict | None:
+    cached = _DEFAULT_RESPONSE.get(_DEFAULT_QUERY_KEY)
+    metrics().increment("risk.default_response.hits" if cached is not None else "risk.default_response.misses")
+    return cached
+
+
+def _store_default_response(response: dict) -> dict:
+    _DEFAULT_RESPONSE.put(_DEFAULT_QUERY_KEY, response)
+    return response
+
+
+def reset_default_response() -> None:
+    _DEFAULT_RESPONSE.clear()
+
+
+def _batch_groups(location_texts: list[str]) -> dict[str, list[str]]:
+    """Inputs grouped by geocode key, in first-seen order; each group is computed once."""
+    groups: dict[str, list[str]] = {}
+    for text in location_texts:
+        groups.setdefault(geocode_key(text), []).append(text)
+    return groups
+
+
+def _batch_ok(inputs: list[str], result: dict) -> dict:
+    return {"location_text": inputs[0], "inputs": inputs, "status": 200, "result": result}
+
+
+def _batch_error(inputs: list[str], exc: BaseException) -> dict:
+    """Per-location failure, with the status the single-location endpoints would have returned."""
+    if isinstance(exc, DataUnavailableError):
+        status, detail = 503, str(exc) or "Data unavailable"
+    elif isinstance(exc, DomainError):
+        status, detail = 400, str(exc) or "Request error"
+    else:
+        logger.exception(f"Batch risk query failed for {inputs[0]!r}", exc_info=exc)
+        status, detail = 500, "Internal error"
+    return {"location_text": inputs[0], "inputs": inputs, "status": status, "detail": detail}
 
 
 class RiskService:
@@ -31,72 +99,90 @@ class RiskService:
 
     @classmethod
     def from_repo_root(cls) -> "RiskService":
-        return cls(repo_root=_repo_root_from_here())
+        return cls(repo_root=find_repo_root())
 
     def _legend(self) -> list[dict]:
         bands: list[RiskBand] = default_risk_bands()
         return [asdict(b) | {"code": b.code.value} for b in bands]
 
-    def _layers(self, *, region, start: date, end: date, sources) -> list[dict]:
-        import ee  # type: ignore
-
-        s2_id = sources.eeimagesets.get("vegetation")
-        lst_id = sources.eeimagesets.get("land_surface_temperature")
-        chirps_id = sources.eeimagesets.get("precipitation")
-        
-        if not (s2_id and lst_id and chirps_id):
-            raise DataUnavailableError("Earth Engine image sets are not configured")
-
-        def _mask_s2_clouds(img):
-            qa = img.select("QA60")
-            cloud_bit_mask = 1 << 10
-            cirrus_bit_mask = 1 << 11
-            mask = qa.bitwiseAnd(cloud_bit_mask).eq(0).And(qa.bitwiseAnd(cirrus_bit_mask).eq(0))
-            return img.updateMask(mask)
-
-        s2 = (
-            ee.ImageCollection(s2_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-            .map(_mask_s2_clouds)
-        )
-        s2_img = s2.median()
-        ndvi = s2_img.normalizedDifference(["B8", "B4"]).rename("ndvi").clip(region)
-
-        lst = (
-            ee.ImageCollection(lst_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-            .select(["LST_Day_1km"])
-        )
-        lst_img = lst.mean().multiply(0.02).subtract(273.15).rename("lst_c").clip(region)
-
-        chirps = (
-            ee.ImageCollection(chirps_id)
-            .filterDate(str(start), str(end))
-            .filterBounds(region)
-        )
-        precip_img = chirps.sum().rename("precip_mm").clip(region)
-
-        risk_image = build_default_risk_image(region=region, start_date=start, end_date=end, sources=sources)
+    def _layer_tiles(
+        self,
+        *,
+        region,
+        start: date,
+        end: date,
+        sources,
+        bounds=None,
+        composites: DriverComposites | None = None,
+        means: RegionalMeans | None = None,
+        layer_ids: Collection[str] | None = None,
+    ) -> tuple[FanOutResult, dict[str, dict]]:
+        """Map ids for every risk-page layer (or only `layer_ids`), plus the vis params each was rendered with.
+
+        Without `means` the risk layer reduces the composites over the region first.
+        """
+        if composites is None:
+            composites = build_driver_composites(
+                region=region, start_date=start, end_date=end, sources=sources, bounds=bounds
+            )
+        lst_img = composites.lst_c
+        ndvi = composites.ndvi
+        precip_img = composites.precip_mm
 
         risk_vis = {"min": 0, "max": 2, "palette": ["#2E7D32", "#F9A825", "#C62828"]}
         lst_vis = {"min": 10, "max": 40, "palette": ["#2c7bb6", "#ffffbf", "#d7191c"]}
         ndvi_vis = {"min": 0.0, "max": 1.0, "palette": ["#f7fcf5", "#74c476", "#00441b"]}
-        window_days = (end - start).days + 1
-        precip_max = min(3000, max(100, window_days * 20))
+        precip_max = min(3000, max(100, composites.window_days * 20))
         precip_vis = {"min": 0, "max": precip_max, "palette": ["#f7fbff", "#6baed6", "#08306b"]}
 
-        risk_tile = ee_image_tile_url_template(risk_image, risk_vis)
-        lst_tile = ee_image_tile_url_template(lst_img, lst_vis)
-        ndvi_tile = ee_image_tile_url_template(ndvi, ndvi_vis)
-        precip_tile = ee_image_tile_url_template(precip_img, precip_vis)
-
-        return [
+        tasks = {
+            # Regional means are fetched inside the fan-out so the other layers' map ids overlap them.
+            "risk": lambda: ee_image_tile_url_template(build_risk_image(composites, means=means), risk_vis),
+            "land_surface_temperature": lambda: ee_image_tile_url_template(lst_img, lst_vis),
+            "land_cover": lambda: ee_image_tile_url_template(ndvi, ndvi_vis),
+            "precipitation": lambda: ee_image_tile_url_template(precip_img, precip_vis),
+        }
+        if layer_ids is not None:
+            tasks = {name: task for name, task in tasks.items() if name in layer_ids}
+        tiles = fan_out(tasks, timeout_seconds=AppConfig().ee_layer_timeout_seconds)
+        vis = {
+            "risk": risk_vis,
+            "land_surface_temperature": lst_vis,
+            "land_cover": ndvi_vis,
+            "precipitation": precip_vis,
+        }
+        return tiles, vis
+
+    def _layers(
+        self,
+        *,
+        region,
+        start: date,
+        end: date,
+        sources,
+        bounds=None,
+        composites: DriverComposites | None = None,
+        means: RegionalMeans | None = None,
+    ) -> tuple[list[dict], list[dict]]:
+        tiles, vis = self._layer_tiles(
+            region=region, start=start, end=end, sources=sources, bounds=bounds, composites=composites, means=means
+        )
+        risk_vis = vis["risk"]
+        lst_vis = vis["land_surface_temperature"]
+        ndvi_vis = vis["land_cover"]
+        precip_vis = vis["precipitation"]
+        if "risk" not in tiles.values:
+            raise DataUnavailableError(tiles.errors.get("risk") or "Failed to generate Earth Engine tile URL")
+
+        def _url(layer_id: str) -> str | None:
+            tile = tiles.values.get(layer_id)
+            return client_tile_url(tile) if tile is not None else None
+
+        layers = [
             {
                 "layer_id": "risk",
                 "label": "Mosquito Risk",
-                "tile_url_template": risk_tile.url,
+                "tile_url_template": _url("risk"),
                 "attribution": "Google Earth Engine",
                 "legend": {
                     "type": "categorical",
@@ -113,7 +199,7 @@ class RiskService:
             {
                 "layer_id": "land_surface_temperature",
                 "label": "Land Surface Temperature",
-                "tile_url_template": lst_tile.url,
+                "tile_url_template": _url("land_surface_temperature"),
                 "attribution": "MODIS LST (MOD11A1) via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -126,7 +212,7 @@ class RiskService:
             {
                 "layer_id": "land_cover",
                 "label": "Vegetation (NDVI)",
-                "tile_url_template": ndvi_tile.url,
+                "tile_url_template": _url("land_cover"),
                 "attribution": "Sentinel-2 SR Harmonized (Copernicus) via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -139,7 +225,7 @@ class RiskService:
             {
                 "layer_id": "precipitation",
                 "label": "Precipitation",
-                "tile_url_template": precip_tile.url,
+                "tile_url_template": _url("precipitation"),
                 "attribution": "CHIRPS Daily Precipitation via Google Earth Engine",
                 "legend": {
                     "type": "continuous",
@@ -150,32 +236,55 @@ class RiskService:
                 }
             },
         ]
+        # Partial failure: drop layers whose map id could not be generated and report why.
+        layer_errors = [{"layer_id": layer_id, "detail": detail} for layer_id, detail in tiles.errors.items()]
+        return [layer for layer in layers if layer["tile_url_template"]], layer_errors
 
-    def get_default(self) -> dict:
-        # Fixed default parameters per spec: ZIP 33172, date range 2023-01-01 to 2024-12-31
-        default_location = "33172"
-        start = date(2023, 1, 1)
-        end = date(2024, 12, 31)
-
+    def _init_earth_engine(self) -> SourcesConfig:
         sources = load_sources_config(default_sources_yaml_path(self._repo_root))
         sources = merge_local_auth_token(sources, repo_root=self._repo_root)
-
-        ee_project = sources.googleearthengine.projectid
-        client = EarthEngineClient(project=ee_project)
-        client.initialize()
-
-        geocoder = default_geocoder()
-        result = geocoder.geocode(default_location)
-        location = location_from_geocoding(str(uuid4()), default_location, result)
-
-        import ee  # type: ignore
-
-        region, viewport = region_and_viewport_from_location(
+        ee_session(sources.googleearthengine.projectid).ensure_initialized()
+        return sources
+
+    def _cube_means(
+        self, *, location: Location, start: date, end: date, sources: SourcesConfig
+    ) -> RegionalMeans | None:
+        """Regional means from the monthly aggregate cube when it covers the range, else None."""
+        return cube_regional_means(
+            repo_root=self._repo_root,
             location_geometry=location.geometry,
             location_bbox=location.bbox,
+            start_date=start,
+            end_date=end,
+            sources=sources,
         )
 
-        layers = self._layers(region=region, start=start, end=end, sources=sources)
+    def _risk_response(
+        self,
+        *,
+        location: Location,
+        start: date,
+        end: date,
+        sources: SourcesConfig,
+        prepared: PreparedRegion | None = None,
+        composites: DriverComposites | None = None,
+        means: RegionalMeans | None = None,
+    ) -> dict:
+        if prepared is None:
+            prepared = prepare_region(location_geometry=location.geometry, location_bbox=location.bbox)
+        viewport = prepared.viewport
+        if means is None:
+            means = self._cube_means(location=location, start=start, end=end, sources=sources)
+
+        layers, layer_errors = self._layers(
+            region=prepared.region,
+            start=start,
+            end=end,
+            sources=sources,
+            bounds=prepared.bounds,
+            composites=composites,
+            means=means,
+        )
         tile_url = layers[0]["tile_url_template"]
         if not tile_url:
             raise DataUnavailableError("No tile URL returned")
@@ -187,42 +296,191 @@ class RiskService:
             "attribution": layers[0].get("attribution"),
             "legend": self._legend(),
             "layers": layers,
+            "layer_errors": layer_errors,
             "viewport": viewport,
         }
 
+    def layer_tiles(
+        self,
+        *,
+        location_text: str,
+        start_date: date,
+        end_date: date,
+        layer_ids: Collection[str] | None = None,
+    ) -> tuple[Location, FanOutResult]:
+        """Resolve map ids for the risk-page layers (all, or only `layer_ids`) without building a response.
+
+        Used for cache warm-up; layers outside `layer_ids` never reach Earth Engine.
+        """
+        validate_date_range(DateRange(start_date=start_date, end_date=end_date))
+        start_date, end_date = canonical_dates(start_date, end_date)
+        sources = self._init_earth_engine()
+
+        result = default_geocoder(repo_root=self._repo_root).geocode(location_text)
+        location = canonical_location(location_text, result)
+        prepared = prepare_region(location_geometry=location.geometry, location_bbox=location.bbox)
+        tiles, _vis = self._layer_tiles(
+            region=prepared.region,
+            start=start_date,
+            end=end_date,
+            sources=sources,
+            bounds=prepared.bounds,
+            means=(
+                self._cube_means(location=location, start=start_date, end=end_date, sources=sources)
+                if layer_ids is None or "risk" in layer_ids
+                else None
+            ),
+            layer_ids=layer_ids,
+        )
+        return location, tiles
+
+    def batch_query(self, *, location_texts: list[str], start_date: date, end_date: date) -> AsyncIterator[dict]:
+        """Risk responses for many locations sharing one date range, yielded as each completes.
+
+        Request-level problems (dates, batch size) raise here, before anything is streamed;
+        per-location failures become lines with the status a single query would have returned.
+        """
+        validate_date_range(DateRange(start_date=start_date, end_date=end_date))
+        start_date, end_date = canonical_dates(start_date, end_date)
+        groups = _batch_groups(location_texts)
+        max_locations = AppConfig().risk_batch_max_locations
+        if len(groups) > max_locations:
+            raise InvalidLocationError(f"A batch is limited to {max_locations} distinct locations")
+        metrics().increment("risk.batch.locations", len(groups))
+        metrics().increment("risk.batch.duplicates", len(location_texts) - len(groups))
+        return self._abatch(list(groups.values()), start=start_date, end=end_date)
+
+    async def _abatch(self, groups: list[list[str]], *, start: date, end: date) -> AsyncIterator[dict]:
+        try:
+            sources = await run_blocking(self._init_earth_engine, upstream="earthengine")
+        except Exception as e:
+            for inputs in groups:
+                yield _batch_error(inputs, e)
+            return
+
+        geocoder = default_geocoder(repo_root=self._repo_root)
+        results = await asyncio.gather(*(geocoder.ageocode(inputs[0]) for inputs in groups), return_exceptions=True)
+        located: list[tuple[list[str], Location]] = []
+        for inputs, result in zip(groups, results):
+            if isinstance(result, Exception):
+                yield _batch_error(inputs, result)
+            else:
+                located.append((inputs, canonical_location(inputs[0], result)))
+        if not located:
+            return
+
+        limit = asyncio.Semaphore(AppConfig().risk_batch_concurrency)
+
+        async def _one(inputs: list[str], location: Location) -> dict:
+            async with limit:
+                try:
+                    result = await run_blocking(
+                        lambda: self._batch_response(location=location, start=start, end=end, sources=sources),
+                        upstream="earthengine",
+                    )
+                except Exception as e:
+                    return _batch_error(inputs, e)
+                return _batch_ok(inputs, result)
+
+        tasks = [asyncio.create_task(_one(inputs, location)) for inputs, location in located]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            # A client that disconnects mid-stream should not keep Earth Engine busy.
+            for task in tasks:
+                task.cancel()
+
+    def _batch_response(self, *, location: Location, start: date, end: date, sources: SourcesConfig) -> dict:
+        # Composites are built exactly as for a single query: each graph carries only this
+        # location's region, and map ids and regional means hit the same caches as /api/risk/query.
+        prepared = prepare_region(location_geometry=location.geometry, location_bbox=location.bbox)
+        composites = build_driver_composites(
+            region=prepared.region, start_date=start, end_date=end, sources=sources, bounds=prepared.bounds
+        )
+        means = self._cube_means(location=location, start=start, end=end, sources=sources)
+        response = self._risk_response(
+            location=location,
+            start=start,
+            end=end,
+            sources=sources,
+            prepared=prepared,
+            composites=composites,
+            means=means,
+        )
+        # Otherwise the risk layer already fetched these (one getInfo), so this is a cache hit.
+        means = means or regional_means(composites)
+        return response | {"regional_means": asdict(means)}
+
+    def get_default(self) -> dict:
+        cached = _cached_default_response()
+        if cached is not None:
+            return cached
+        return _RISK_QUERIES.do(_DEFAULT_QUERY_KEY, lambda: _store_default_response(self._get_default()))
+
+    def refresh_default(self) -> dict:
+        """Recompute the default response with newly minted map ids and hold it in memory."""
+        with fresh_map_ids():
+            return _store_default_response(self._get_default())
+
     def query(self, *, location_text: str, start_date: date, end_date: date) -> dict:
-        date_range = DateRange(start_date=start_date, end_date=end_date)
-        validate_date_range(date_range)
+        validate_date_range(DateRange(start_date=start_date, end_date=end_date))
+        start_date, end_date = canonical_dates(start_date, end_date)
+        return _RISK_QUERIES.do(
+            _query_key(location_text, start_date, end_date),
+            lambda: self._query(location_text=location_text, start_date=start_date, end_date=end_date),
+        )
 
-        sources = load_sources_config(default_sources_yaml_path(self._repo_root))
-        sources = merge_local_auth_token(sources, repo_root=self._repo_root)
+    async def aget_default(self) -> dict:
+        cached = _cached_default_response()
+        if cached is not None:
+            return cached
+
+        async def _compute() -> dict:
+            return _store_default_response(await self._aget_default())
 
-        ee_project = sources.googleearthengine.projectid
-        client = EarthEngineClient(project=ee_project)
-        client.initialize()
+        return await _RISK_QUERIES.ado(_DEFAULT_QUERY_KEY, _compute)
 
-        geocoder = default_geocoder()
-        result = geocoder.geocode(location_text)
-        location = location_from_geocoding(str(uuid4()), location_text, result)
+    async def aquery(self, *, location_text: str, start_date: date, end_date: date) -> dict:
+        validate_date_range(DateRange(start_date=start_date, end_date=end_date))
+        start_date, end_date = canonical_dates(start_date, end_date)
+        return await _RISK_QUERIES.ado(
+            _query_key(location_text, start_date, end_date),
+            lambda: self._aquery(location_text=location_text, start_date=start_date, end_date=end_date),
+        )
 
-        import ee  # type: ignore
+    def _get_default(self) -> dict:
+        sources = self._init_earth_engine()
 
-        region, viewport = region_and_viewport_from_location(
-            location_geometry=location.geometry,
-            location_bbox=location.bbox,
+        result = default_geocoder(repo_root=self._repo_root).geocode(DEFAULT_LOCATION_TEXT)
+        location = canonical_location(DEFAULT_LOCATION_TEXT, result)
+        return self._risk_response(location=location, start=DEFAULT_START_DATE, end=DEFAULT_END_DATE, sources=sources)
+
+    def _query(self, *, location_text: str, start_date: date, end_date: date) -> dict:
+        sources = self._init_earth_engine()
+
+        result = default_geocoder(repo_root=self._repo_root).geocode(location_text)
+        location = canonical_location(location_text, result)
+        return self._risk_response(location=location, start=start_date, end=end_date, sources=sources)
+
+    async def _aget_default(self) -> dict:
+        sources = await run_blocking(self._init_earth_engine, upstream="earthengine")
+
+        result = await default_geocoder(repo_root=self._repo_root).ageocode(DEFAULT_LOCATION_TEXT)
+        location = canonical_location(DEFAULT_LOCATION_TEXT, result)
+        return await run_blocking(
+            lambda: self._risk_response(
+                location=location, start=DEFAULT_START_DATE, end=DEFAULT_END_DATE, sources=sources
+            ),
+            upstream="earthengine",
         )
 
-        layers = self._layers(region=region, start=start_date, end=end_date, sources=sources)
-        tile_url = layers[0]["tile_url_template"]
-        if not tile_url:
-            raise DataUnavailableError("No tile URL returned")
+    async def _aquery(self, *, location_text: str, start_date: date, end_date: date) -> dict:
+        sources = await run_blocking(self._init_earth_engine, upstream="earthengine")
 
-        return {
-            "location_label": location.label,
-            "date_range": {"start_date": start_date, "end_date": end_date},
-            "tile_url_template": tile_url,
-            "attribution": layers[0].get("attribution"),
-            "legend": self._legend(),
-            "layers": layers,
-            "viewport": viewport,
-        }
+        result = await default_geocoder(repo_root=self._repo_root).ageocode(location_text)
+        location = canonical_location(location_text, result)
+        return await run_blocking(
+            lambda: self._risk_response(location=location, start=start_date, end=end_date, sources=sources),
+            upstream="earthengine",
+        )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.src.eda.driver_timeseries import reset_driver_timeseries
+from backend.src.eda.risk_mapping import reset_regional_means
+from backend.src.infra.county_summary import reset_county_summaries
+from backend.src.infra.ee_geometry import reset_prepared_geometries
+from backend.src.infra.ee_session import reset_ee_sessions
+from backend.src.infra.ee_tiles import reset_mapid_cache
+from backend.src.infra.geocoding import reset_default_geocoders
+from backend.src.infra.observations import reset_observation_indexes
+from backend.src.infra.raster_store import reset_raster_stores
+from backend.src.infra.regions import reset_florida_boundaries
+from backend.src.infra.tile_proxy import reset_tile_proxies
+from backend.src.services.hotspot_service import reset_hotspot_pyramids
+from backend.src.services.risk_service import reset_default_response
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_state():
+    """Process-wide singletons must not leak monkeypatched state between tests."""
+    _reset()
+    yield
+    _reset()
+
+
+def _reset() -> None:
+    reset_ee_sessions()
+    reset_mapid_cache()
+    reset_default_geocoders()
+    reset_default_response()
+    reset_tile_proxies()
+    reset_regional_means()
+    reset_driver_timeseries()
+    reset_prepared_geometries()
+    reset_florida_boundaries()
+    reset_observation_indexes()
+    reset_raster_stores()
+    reset_county_summaries()
+    reset_hotspot_pyramids()
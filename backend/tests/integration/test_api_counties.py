@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import shapely
+from fastapi.testclient import TestClient
+
+from backend.src.api.app import create_app
+from backend.src.infra import county_summary, observations
+from backend.src.infra.county_summary import Counties, CountySummaryTable
+from backend.src.infra.observations import ObservationIndex, cell_ids
+
+
+def test_county_summary_route(monkeypatch, tmp_path) -> None:
+    lon, lat = [-80.5, -80.4, -80.5], [26.5, 26.2, 25.5]
+    index = ObservationIndex(
+        pa.table(
+            {
+                "site_id": pa.array([1, 2, 3], pa.int64()),
+                "measured_at": pa.array(
+                    [datetime(2020, 5, 1), datetime(2021, 7, 1), datetime(2019, 1, 1)], pa.timestamp("ms")
+                ),
+                "water_source_type": ["container", "still", "still"],
+                "water_source": ["bucket", "pond", "ditch"],
+                "breeding_ground_eliminated": [True, False, False],
+                "lon": lon,
+                "lat": lat,
+                "cell": cell_ids(np.array(lon), np.array(lat)),
+            }
+        ).sort_by("cell")
+    )
+    counties = Counties(
+        geoids=("12011", "12086"),
+        names=("Broward", "Miami-Dade"),
+        geometries=np.array([shapely.box(-81.0, 26.0, -80.0, 27.0), shapely.box(-81.0, 25.0, -80.0, 26.0)]),
+    )
+    table = CountySummaryTable(tmp_path, counties=lambda: counties)
+    monkeypatch.setattr(observations, "observation_index", lambda *_a, **_kw: index)
+    monkeypatch.setattr(county_summary, "county_summary_table", lambda *_a, **_kw: table)
+    client = TestClient(create_app())
+
+    resp = client.get("/api/counties/Broward County/summary")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["geoid"] == "12011"
+    assert body["total"] == 2
+    assert body["mitigation_rate"] == 0.5
+    assert body["by_year"][0] == {"year": 2020, "count": 1, "eliminated": 1, "mitigation_rate": 1.0}
+
+    assert client.get("/api/counties/Atlantis/summary").status_code == 400
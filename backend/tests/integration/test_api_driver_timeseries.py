@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import numpy as np
+
+from backend.src.api.app import create_app
+from backend.src.infra.raster_store import RasterGrid, RasterStore
+
+
+class _FakeGeocoder:
+    async def ageocode(self, location_text: str):
+        _ = location_text
+        return SimpleNamespace(
+            label="Miami, FL",
+            geometry={"type": "Point", "coordinates": [-80.1918, 25.7617]},
+            bbox=None,
+        )
+
+
+def test_post_driver_timeseries_returns_columns(monkeypatch, tmp_path) -> None:
+    import backend.src.eda.driver_timeseries as driver_timeseries
+    import backend.src.infra.raster_store as raster_store
+    import backend.src.services.drivers_service as drivers_service
+
+    calls: list[dict] = []
+
+    def _driver_timeseries(**kwargs) -> dict:
+        calls.append(kwargs)
+        return {
+            "months": ["2024-01", "2024-02"],
+            "ndvi": [0.41, 0.44],
+            "lst_c": [24.5, 26.0],
+            "precip_mm": [60.0, None],
+        }
+
+    monkeypatch.setattr(drivers_service, "default_geocoder", lambda **_kw: _FakeGeocoder())
+    monkeypatch.setattr(
+        drivers_service,
+        "load_sources_config",
+        lambda _path: SimpleNamespace(googleearthengine=SimpleNamespace(projectid=None)),
+    )
+    monkeypatch.setattr(drivers_service, "merge_local_auth_token", lambda cfg, *, repo_root: cfg)
+    monkeypatch.setattr(
+        drivers_service, "ee_session", lambda _project: SimpleNamespace(ensure_initialized=lambda: None)
+    )
+    monkeypatch.setattr(
+        drivers_service, "prepare_region", lambda **_kw: SimpleNamespace(region="region", bounds="bounds")
+    )
+    monkeypatch.setattr(driver_timeseries, "driver_timeseries", _driver_timeseries)
+    monkeypatch.setattr(raster_store, "raster_store", lambda _root: RasterStore(tmp_path))
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/drivers/timeseries",
+        json={"location_text": "Miami", "date_range": {"start_date": "2024-01-01", "end_date": "2024-02-29"}},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["location_label"] == "Miami, FL"
+    assert body["months"] == ["2024-01", "2024-02"]
+    assert body["precip_mm"] == [60.0, None]
+    assert calls[0]["region"] == "region"
+    assert calls[0]["bounds"] == "bounds"
+
+
+def test_post_driver_timeseries_serves_exported_history_without_earth_engine(monkeypatch, tmp_path) -> None:
+    import backend.src.infra.raster_store as raster_store
+    import backend.src.services.drivers_service as drivers_service
+
+    def _no_earth_engine(*_args, **_kwargs):
+        raise AssertionError("Earth Engine must not be used for stored months")
+
+    store = RasterStore(tmp_path)
+    # One tile around Miami holds the whole 100-mile square.
+    grid = RasterGrid(west=-83.0, north=28.0, pixel_size=1.0, width=5, height=4)
+    for month, precip in (("2024-01", 40.0), ("2024-02", 55.0)):
+        bands = {name: np.full((4, 5), 1.0, dtype=np.float32) for name in ("ndvi", "ndwi", "lst_c")}
+        store.put("miami", month, grid, bands | {"precip_mm": np.full((4, 5), precip, dtype=np.float32)})
+
+    monkeypatch.setitem(sys.modules, "ee", None)
+    monkeypatch.setattr(drivers_service, "default_geocoder", lambda **_kw: _FakeGeocoder())
+    monkeypatch.setattr(drivers_service, "load_sources_config", _no_earth_engine)
+    monkeypatch.setattr(drivers_service, "ee_session", _no_earth_engine)
+    monkeypatch.setattr(drivers_service, "prepare_region", _no_earth_engine)
+    monkeypatch.setattr(raster_store, "raster_store", lambda _root: store)
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/drivers/timeseries",
+        json={"location_text": "Miami", "date_range": {"start_date": "2024-01-01", "end_date": "2024-02-29"}},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["months"] == ["2024-01", "2024-02"]
+    assert body["precip_mm"] == [40.0, 55.0]
+
+
+def test_post_driver_timeseries_rejects_an_inverted_range() -> None:
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/drivers/timeseries",
+        json={"location_text": "Miami", "date_range": {"start_date": "2024-03-01", "end_date": "2024-01-01"}},
+    )
+    assert resp.status_code == 400
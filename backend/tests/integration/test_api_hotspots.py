@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+import pyarrow as pa
+from fastapi.testclient import TestClient
+
+from backend.src.api.app import create_app
+from backend.src.infra import observations
+from backend.src.infra.observations import ObservationIndex, cell_ids
+
+
+def test_hotspots_route_returns_columnar_cells(monkeypatch) -> None:
+    rng = np.random.default_rng(11)
+    lon, lat = rng.uniform(-81.0, -80.0, 1_000), rng.uniform(25.0, 26.0, 1_000)
+    table = pa.table(
+        {
+            "measured_at": pa.nulls(1_000, pa.timestamp("ms")),
+            "lon": lon,
+            "lat": lat,
+            "cell": cell_ids(lon, lat),
+        }
+    ).sort_by("cell")
+    monkeypatch.setattr(observations, "observation_index", lambda *_a, **_kw: ObservationIndex(table))
+    client = TestClient(create_app())
+
+    resp = client.get("/api/hotspots", params={"z": 8})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1_000
+    assert len(body["lon"]) == len(body["lat"]) == len(body["count"])
+    assert body["max_count"] == max(body["count"])
+
+    smoothed = client.get("/api/hotspots", params={"z": 8, "smooth": "true", "bbox": "-82,24,-79,27"}).json()
+    assert smoothed["smoothed"] is True
+    assert abs(smoothed["total"] - 1_000) < 1e-6
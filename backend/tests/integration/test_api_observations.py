@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from backend.src.api.app import create_app
+from backend.src.infra import observations
+from backend.src.infra.datasets import DatasetArtifact
+from backend.src.infra.observations import ObservationIndex, ingest_observations
+
+
+def _index(tmp_path, monkeypatch) -> ObservationIndex:
+    path = tmp_path / "globe_mosquito.geojson"
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "SiteId": site_id,
+                "MeasuredAt": measured_at,
+                "CountryCode": "USA",
+                "WaterSourceType": "still: lake/pond/swamp",
+                "BreedingGroundEliminated": "false",
+            },
+        }
+        for site_id, lon, lat, measured_at in [
+            (1, -80.19, 25.77, "2020-06-01T12:00:00"),
+            (2, -80.21, 25.79, "2023-06-01T12:00:00"),
+            (3, -82.46, 27.95, "2021-03-10T08:00:00"),
+        ]
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+    monkeypatch.setattr(
+        observations,
+        "prepare_dataset",
+        lambda name, url, cache: DatasetArtifact(name=name, url=url, local_path=path),
+    )
+    sources = SimpleNamespace(datasets={"mosquito": "https://example.test/globe_mosquito.zip"})
+    return ObservationIndex.load(ingest_observations("mosquito", repo_root=tmp_path, sources=sources))
+
+
+def test_get_observations_filters_by_bbox_and_dates(monkeypatch, tmp_path) -> None:
+    index = _index(tmp_path, monkeypatch)
+    monkeypatch.setattr(observations, "observation_index", lambda *_a, **_kw: index)
+    client = TestClient(create_app())
+
+    resp = client.get(
+        "/api/observations",
+        params={"bbox": "-80.5,25.5,-80.0,26.0", "start_date": "2020-01-01", "end_date": "2021-12-31"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 1
+    assert body["truncated"] is False
+    (obs,) = body["observations"]
+    assert obs["site_id"] == 1
+    assert obs["measured_at"].startswith("2020-06-01")
+    assert obs["properties"]["water_source_type"] == "still: lake/pond/swamp"
+
+    statewide = client.get("/api/observations", params={"limit": 2}).json()
+    assert statewide["count"] == 3
+    assert statewide["truncated"] is True
+    assert len(statewide["observations"]) == 2
+
+
+def test_get_observations_rejects_a_bad_bbox() -> None:
+    client = TestClient(create_app())
+
+    resp = client.get("/api/observations", params={"bbox": "-80,26,-81,25"})
+    assert resp.status_code == 400
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import sys
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from backend.src.api.app import create_app
+from backend.src.domain.errors import LocationNotFoundError
+from backend.src.domain.models import RegionalMeans
+from backend.src.infra.ee_tiles import TileUrlTemplate
+from backend.src.infra.sources import GoogleEarthEngineConfig, SourcesConfig
+
+_PLACES = {
+    "miami": (-80.19, 25.76),
+    "tampa": (-82.46, 27.95),
+    "orlando": (-81.38, 28.54),
+    "jacksonville": (-81.66, 30.33),
+}
+_SOURCES = SourcesConfig(
+    datasets={},
+    eeimagesets={
+        "vegetation": "COPERNICUS/S2_SR_HARMONIZED",
+        "land_surface_temperature": "MODIS/061/MOD11A1",
+        "precipitation": "UCSB-CHG/CHIRPS/DAILY",
+    },
+    googleearthengine=GoogleEarthEngineConfig(projectid=None, token=None),
+)
+
+
+class _FakeGeocoder:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def ageocode(self, location_text: str):
+        self.calls.append(location_text)
+        coords = _PLACES.get(location_text.strip().lower())
+        if coords is None:
+            raise LocationNotFoundError(f"No results for {location_text}")
+        return SimpleNamespace(
+            label=f"{location_text.strip().title()}, FL",
+            geometry={"type": "Point", "coordinates": list(coords)},
+            bbox=None,
+        )
+
+
+class _Expr:
+    """Stand-in for an Earth Engine object whose serialized graph is its call chain."""
+
+    def __init__(self, graph: str) -> None:
+        self.graph = graph
+
+    def serialize(self) -> str:
+        return self.graph
+
+    def __repr__(self) -> str:
+        return self.graph
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def _call(*args, **kwargs) -> "_Expr":
+            parts = [getattr(a, "__name__", repr(a)) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()]
+            return _Expr(f"{self.graph}.{name}({', '.join(parts)})")
+
+        return _call
+
+
+def _install_fakes(monkeypatch) -> dict:
+    import backend.src.services.risk_service as risk_service
+
+    seen: dict = {"graphs": {}, "means": [], "geocoder": _FakeGeocoder()}
+
+    def _tile(img: _Expr, _vis) -> TileUrlTemplate:
+        region = img.graph.rsplit(".clip(", 1)[-1].rstrip(")")
+        seen["graphs"].setdefault(region, set()).add(img.serialize())
+        return TileUrlTemplate(url=f"https://example.com/{region}/{{z}}/{{x}}/{{y}}")
+
+    def _regional_means(composites):
+        seen["means"].append(composites.region)
+        return RegionalMeans(lst_c=27.0, precip_mm=300.0)
+
+    monkeypatch.setitem(sys.modules, "ee", SimpleNamespace(ImageCollection=lambda id_: _Expr(f"IC({id_!r})")))
+    monkeypatch.setattr(risk_service.RiskService, "_init_earth_engine", lambda self: _SOURCES)
+    monkeypatch.setattr(risk_service, "default_geocoder", lambda **_kw: seen["geocoder"])
+    monkeypatch.setattr(
+        risk_service,
+        "prepare_region",
+        lambda *, location_geometry, location_bbox: SimpleNamespace(
+            region=_Expr(f"region{location_geometry['coordinates']}"),
+            bounds=_Expr(f"bounds{location_geometry['coordinates']}"),
+            viewport=None,
+        ),
+    )
+    monkeypatch.setattr(risk_service, "build_risk_image", lambda composites, means=None: composites.ndvi)
+    monkeypatch.setattr(risk_service, "ee_image_tile_url_template", _tile)
+    monkeypatch.setattr(risk_service, "regional_means", _regional_means)
+    return seen
+
+
+def _batch(client: TestClient, locations: list[str]) -> dict[str, dict]:
+    resp = client.post(
+        "/api/risk/batch",
+        json={"locations": locations, "date_range": {"start_date": "2024-01-01", "end_date": "2024-06-30"}},
+    )
+    assert resp.status_code == 200
+    return {line["location_text"]: line for line in map(json.loads, resp.text.splitlines())}
+
+
+def test_post_risk_batch_streams_one_line_per_distinct_location(monkeypatch) -> None:
+    seen = _install_fakes(monkeypatch)
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/risk/batch",
+        json={
+            "locations": ["Miami", "Tampa", " miami ", "Atlantis"],
+            "date_range": {"start_date": "2024-01-01", "end_date": "2024-06-30"},
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = {line["location_text"]: line for line in map(json.loads, resp.text.splitlines())}
+    assert set(lines) == {"Miami", "Tampa", "Atlantis"}
+
+    miami = lines["Miami"]
+    assert miami["status"] == 200
+    assert miami["inputs"] == ["Miami", "miami"]
+    assert miami["result"]["location_label"] == "Miami, FL"
+    assert miami["result"]["tile_url_template"].startswith("https://example.com/region[-80.19, 25.76]/")
+    assert miami["result"]["regional_means"] == {"lst_c": 27.0, "precip_mm": 300.0}
+    assert lines["Tampa"]["status"] == 200
+    assert lines["Atlantis"] == {
+        "location_text": "Atlantis",
+        "inputs": ["Atlantis"],
+        "status": 400,
+        "result": None,
+        "detail": "No results for Atlantis",
+    }
+
+    # Duplicates are geocoded once.
+    assert sorted(seen["geocoder"].calls) == ["Atlantis", "Miami", "Tampa"]
+
+
+def test_post_risk_batch_graphs_do_not_grow_with_batch_size(monkeypatch) -> None:
+    seen = _install_fakes(monkeypatch)
+    client = TestClient(create_app())
+
+    _batch(client, ["Miami"])
+    alone = set(seen["graphs"]["region[-80.19, 25.76]"])
+    seen["graphs"].clear()
+
+    lines = _batch(client, ["Miami", "Tampa", "Orlando", "Jacksonville"])
+    assert {line["status"] for line in lines.values()} == {200}
+
+    # Each location's layers serialize to exactly what a batch of one (or a single query) sends.
+    assert seen["graphs"]["region[-80.19, 25.76]"] == alone
+    assert len(seen["graphs"]) == 4
+    for region, graphs in seen["graphs"].items():
+        others = [name.removeprefix("region") for name in seen["graphs"] if name != region]
+        assert not any(other in graph for graph in graphs for other in others)
+
+
+def test_post_risk_batch_rejects_bad_requests_before_streaming() -> None:
+    client = TestClient(create_app())
+
+    inverted = client.post(
+        "/api/risk/batch",
+        json={"locations": ["Miami"], "date_range": {"start_date": "2024-06-30", "end_date": "2024-01-01"}},
+    )
+    assert inverted.status_code == 400
+
+    empty = client.post(
+        "/api/risk/batch",
+        json={"locations": [], "date_range": {"start_date": "2024-01-01", "end_date": "2024-06-30"}},
+    )
+    assert empty.status_code == 422
+
+
+def test_post_risk_batch_limits_distinct_locations(monkeypatch) -> None:
+    monkeypatch.setenv("GEOEMERGE_RISK_BATCH_MAX_LOCATIONS", "2")
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/risk/batch",
+        json={
+            "locations": ["Miami", "MIAMI", "Tampa", "Orlando"],
+            "date_range": {"start_date": "2024-01-01", "end_date": "2024-06-30"},
+        },
+    )
+    assert resp.status_code == 400
@@ -111,3 +111,81 @@ def test_post_risk_query_point_buffer_is_100_miles(monkeypatch) -> None:
     vp = data.get("viewport")
     assert isinstance(vp, dict)
     assert vp.get("radius_meters") == 160_934.0
+
+
+def test_post_risk_query_takes_regional_means_from_the_aggregate_cube(monkeypatch, tmp_path) -> None:
+    from types import SimpleNamespace
+
+    import numpy as np
+    import pytest
+
+    import backend.src.infra.aggregate_cube as aggregate_cube
+    import backend.src.infra.ee_tiles as ee_tiles
+    import backend.src.services.risk_service as risk_service
+    from backend.src.infra.raster_store import RasterGrid, RasterStore
+
+    def _partials(value: float, shape: tuple[int, int]) -> dict:
+        full = lambda v: np.full(shape, v, dtype=np.float32)  # noqa: E731
+        return {
+            "precip_sum": full(value),
+            "lst_sum": full(value * 2),
+            "lst_count": full(2.0),
+            "ndvi_median": full(0.5),
+            "ndwi_median": full(0.0),
+        }
+
+    store = RasterStore(tmp_path)
+    grid = RasterGrid.covering((-81.0, 26.0, -80.0, 27.0), pixel_size=0.25)
+    store.put("r1_+26.0000_-81.0000", "2024-02", grid, _partials(10.0, (4, 4)))
+    edges: list[tuple[date, date]] = []
+
+    def _edge(_bbox, grid, lo, hi):
+        edges.append((lo, hi))
+        return _partials(1.0, (grid.height, grid.width))
+
+    def _no_reduction(_composites):
+        raise AssertionError("covered ranges must not reduce the daily imagery")
+
+    class _Geocoder:
+        async def ageocode(self, _text: str):
+            polygon = [[-80.9, 26.1], [-80.6, 26.1], [-80.6, 26.4], [-80.9, 26.4], [-80.9, 26.1]]
+            return SimpleNamespace(
+                label="Somewhere, FL", geometry={"type": "Polygon", "coordinates": [polygon]}, bbox=None
+            )
+
+    means_used: list = []
+
+    def _risk_image(_composites, *, means=None):
+        means_used.append(means)
+        return "risk"
+
+    sources = SimpleNamespace(eeimagesets={}, googleearthengine=SimpleNamespace(projectid=None))
+    cube = aggregate_cube.AggregateCube(store, edge_source=_edge)
+    monkeypatch.setattr(aggregate_cube, "aggregate_cube", lambda _root, *, sources: cube)
+    monkeypatch.setattr(risk_service.RiskService, "_init_earth_engine", lambda self: sources)
+    monkeypatch.setattr(risk_service, "default_geocoder", lambda **_kw: _Geocoder())
+    monkeypatch.setattr(
+        risk_service, "prepare_region", lambda **_kw: SimpleNamespace(region="region", bounds="bounds", viewport=None)
+    )
+    monkeypatch.setattr(
+        risk_service,
+        "build_driver_composites",
+        lambda **_kw: SimpleNamespace(ndvi="ndvi", lst_c="lst", precip_mm="precip", window_days=56),
+    )
+    monkeypatch.setattr(risk_service, "build_risk_image", _risk_image)
+    monkeypatch.setattr(risk_service, "regional_means", _no_reduction)
+    fake_tile = lambda _img, _vis: ee_tiles.TileUrlTemplate(url="https://example.com/{z}/{x}/{y}")  # noqa: E731
+    monkeypatch.setattr(risk_service, "ee_image_tile_url_template", fake_tile)
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/api/risk/query",
+        json={"location_text": "Somewhere", "date_range": {"start_date": "2024-01-20", "end_date": "2024-03-05"}},
+    )
+
+    assert resp.status_code == 200
+    # One stored month plus the two partial-month edges: 10 + 1 + 1 mm, and LST of (20 + 2 + 2) / 6.
+    (means,) = means_used
+    assert means.precip_mm == pytest.approx(12.0)
+    assert means.lst_c == pytest.approx(4.0)
+    assert edges == [(date(2024, 1, 20), date(2024, 2, 1)), (date(2024, 3, 1), date(2024, 3, 6))]
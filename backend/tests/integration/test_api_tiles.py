@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import httpx
+from fastapi.testclient import TestClient
+
+from backend.src.api.app import create_app
+from backend.src.infra.ee_tiles import TileUrlTemplate
+from backend.src.infra.tile_proxy import DiskTileCache, TileProxy
+
+_KEY = "c" * 64
+
+
+def test_tile_route_serves_png_with_cache_headers(monkeypatch, tmp_path) -> None:
+    upstream_calls: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        upstream_calls.append(str(request.url))
+        return httpx.Response(200, content=b"\x89PNG")
+
+    proxy = TileProxy(
+        DiskTileCache(tmp_path, max_bytes=1024 * 1024),
+        client=httpx.Client(transport=httpx.MockTransport(_handler)),
+        resolve=lambda key: TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}", layer_key=key),
+    )
+    import backend.src.api.routes.tiles as tiles_routes
+
+    monkeypatch.setattr(tiles_routes, "tile_proxy", lambda _repo_root: proxy)
+    client = TestClient(create_app())
+
+    resp = client.get(f"/tiles/{_KEY}/4/3/2.png")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/png"
+    assert resp.content == b"\x89PNG"
+    assert "max-age=" in resp.headers["cache-control"]
+    etag = resp.headers["etag"]
+
+    again = client.get(f"/tiles/{_KEY}/4/3/2.png")
+    assert again.status_code == 200
+    assert len(upstream_calls) == 1
+
+    not_modified = client.get(f"/tiles/{_KEY}/4/3/2.png", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    assert client.get(f"/tiles/{_KEY}/1/5/0.png").status_code == 404
+
+
+def test_tile_route_reports_unresolvable_layers_as_gone(monkeypatch, tmp_path) -> None:
+    proxy = TileProxy(
+        DiskTileCache(tmp_path, max_bytes=1024 * 1024),
+        client=httpx.Client(transport=httpx.MockTransport(lambda _r: httpx.Response(500))),
+        resolve=lambda _key: None,
+    )
+    import backend.src.api.routes.tiles as tiles_routes
+    from backend.src.infra.tile_proxy import tile_etag
+
+    monkeypatch.setattr(tiles_routes, "tile_proxy", lambda _repo_root: proxy)
+    client = TestClient(create_app())
+
+    assert client.get(f"/tiles/{_KEY}/4/3/2.png").status_code == 410
+    # A matching ETag is not enough: the layer itself has to be known.
+    revalidate = client.get(f"/tiles/{_KEY}/4/3/2.png", headers={"If-None-Match": tile_etag(_KEY, 4, 3, 2)})
+    assert revalidate.status_code == 410
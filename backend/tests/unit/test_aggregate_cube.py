@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.aggregate_cube import AggregateCube, plan_range
+from backend.src.infra.raster_store import RasterGrid, RasterStore
+
+_TILE = (-81.0, 26.0, -80.0, 27.0)
+
+
+def _partials(value: float, *, shape=(4, 4), lst_count: float = 2.0) -> dict[str, np.ndarray]:
+    full = lambda v: np.full(shape, v, dtype=np.float32)  # noqa: E731
+    return {
+        "precip_sum": full(value),
+        "lst_sum": full(value * lst_count),
+        "lst_count": full(lst_count),
+        "ndvi_median": full(value / 100),
+        "ndwi_median": full(0.0),
+    }
+
+
+def test_plan_range_uses_whole_months_plus_two_edges() -> None:
+    plan = plan_range(date(2024, 1, 15), date(2024, 4, 10))
+    assert plan.months == ("2024-02", "2024-03")
+    assert plan.edges == ((date(2024, 1, 15), date(2024, 2, 1)), (date(2024, 4, 1), date(2024, 4, 11)))
+
+    assert plan_range(date(2024, 1, 1), date(2024, 12, 31)).edges == ()
+    assert plan_range(date(2024, 5, 3), date(2024, 5, 9)).months == ()
+
+
+def test_compose_sums_precip_averages_lst_and_reads_edges(tmp_path) -> None:
+    store = RasterStore(tmp_path)
+    grid = RasterGrid.covering(_TILE, pixel_size=0.25)
+    region_id = "r1_+26.0000_-81.0000"
+    store.put(region_id, "2024-02", grid, _partials(10.0))
+    store.put(region_id, "2024-03", grid, _partials(20.0, lst_count=6.0))
+    edges: list[tuple[date, date]] = []
+
+    def _edge(_bbox, edge_grid, lo, hi):
+        edges.append((lo, hi))
+        return _partials(1.0, shape=(edge_grid.height, edge_grid.width))
+
+    cube = AggregateCube(store, pixel_size=0.25, edge_source=_edge)
+    (composite,) = cube.compose(date(2024, 1, 20), date(2024, 4, 5), (-80.9, 26.1, -80.6, 26.4))
+
+    assert len(edges) == 2
+    np.testing.assert_allclose(composite["precip_mm"], 32.0)
+    # (10*2 + 20*6 + 1*2 + 1*2) / (2 + 6 + 2 + 2)
+    np.testing.assert_allclose(composite["lst_c"], 144.0 / 12.0)
+    # Median of the monthly medians 0.1, 0.2 and the two 0.01 edges.
+    np.testing.assert_allclose(composite["ndvi"], 0.055, rtol=1e-6)
+    assert composite["ndvi"].shape == (2, 2)
+
+
+def test_missing_months_without_edge_source_are_unavailable(tmp_path) -> None:
+    cube = AggregateCube(RasterStore(tmp_path), pixel_size=0.25)
+    with pytest.raises(DataUnavailableError):
+        cube.compose(date(2024, 1, 1), date(2024, 1, 31), (-80.9, 26.1, -80.6, 26.4))
+
+
+def test_compose_uses_the_stored_grid_not_the_configured_pixel_size(tmp_path) -> None:
+    store = RasterStore(tmp_path)
+    region_id = "r1_+26.0000_-81.0000"
+    store.put(region_id, "2024-02", RasterGrid.covering(_TILE, pixel_size=0.25), _partials(10.0))
+    edge_grids: list[RasterGrid] = []
+
+    def _edge(_bbox, edge_grid, _lo, _hi):
+        edge_grids.append(edge_grid)
+        return _partials(1.0, shape=(edge_grid.height, edge_grid.width))
+
+    # The cube default (0.01 degrees) differs from how the tile was built.
+    cube = AggregateCube(store, edge_source=_edge)
+    (composite,) = cube.compose(date(2024, 1, 20), date(2024, 3, 5), (-80.9, 26.1, -80.6, 26.4))
+
+    assert composite["precip_mm"].shape == (2, 2)
+    np.testing.assert_allclose(composite["precip_mm"], 12.0)
+    assert {g.pixel_size for g in edge_grids} == {0.25}
+
+
+def test_covers_needs_every_whole_month_of_every_tile(tmp_path) -> None:
+    store = RasterStore(tmp_path)
+    store.put("r1_+26.0000_-81.0000", "2024-02", RasterGrid.covering(_TILE, pixel_size=0.25), _partials(10.0))
+    cube = AggregateCube(store, pixel_size=0.25)
+    inside = (-80.9, 26.1, -80.6, 26.4)
+
+    assert cube.covers(date(2024, 1, 20), date(2024, 3, 5), inside)
+    assert not cube.covers(date(2024, 1, 20), date(2024, 4, 5), inside)
+    # Edges alone are not served from the cube.
+    assert not cube.covers(date(2024, 2, 3), date(2024, 2, 20), inside)
+    # The neighbouring tile to the west has nothing stored.
+    assert not cube.covers(date(2024, 1, 20), date(2024, 3, 5), (-81.2, 26.1, -80.6, 26.4))
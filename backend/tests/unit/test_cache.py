@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from backend.src.infra.cache import TtlLruCache
+
+
+def test_ttl_lru_cache_evicts_least_recently_used() -> None:
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_lru_cache_expires_entries() -> None:
+    now = [1000.0]
+    cache: TtlLruCache[str, int] = TtlLruCache(max_entries=4, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", 1)
+
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import date
+
+from backend.src.infra.canonical import (
+    canonical_location,
+    canonicalize_dates,
+    canonicalize_result,
+    location_id,
+)
+from backend.src.infra.geocoding import GeocodingResult
+
+
+def _point(lng: float, lat: float) -> GeocodingResult:
+    return GeocodingResult(label="Somewhere", geometry={"type": "Point", "coordinates": [lng, lat]})
+
+
+def test_nearby_points_snap_to_the_same_cell_and_id() -> None:
+    a = canonicalize_result(_point(-80.191, 25.761), cell_degrees=0.1)
+    b = canonicalize_result(_point(-80.149, 25.799), cell_degrees=0.1)
+
+    assert a.geometry == b.geometry == {"type": "Point", "coordinates": [-80.15, 25.75]}
+    assert location_id(a) == location_id(b)
+    assert location_id(a) != location_id(canonicalize_result(_point(-80.251, 25.761), cell_degrees=0.1))
+
+
+def test_snapping_is_opt_in(monkeypatch) -> None:
+    raw = _point(-80.191, 25.761)
+    assert canonicalize_result(raw, cell_degrees=None) is raw
+    assert canonical_location("Miami", raw).geometry["coordinates"] == [-80.191, 25.761]
+
+    monkeypatch.setenv("GEOEMERGE_CANONICAL_GRID_DEGREES", "0.1")
+    location = canonical_location("Miami", raw)
+    assert location.geometry["coordinates"] == [-80.15, 25.75]
+    assert location.id == canonical_location("Miami, FL", _point(-80.149, 25.799)).id
+
+
+def test_month_mode_widens_to_whole_months() -> None:
+    start, end = date(2023, 1, 17), date(2023, 3, 2)
+    assert canonicalize_dates(start, end, mode="day") == (start, end)
+    assert canonicalize_dates(start, end, mode="month") == (date(2023, 1, 1), date(2023, 3, 31))
+
+    today = date.today()
+    assert canonicalize_dates(today, today, mode="month")[1] == today
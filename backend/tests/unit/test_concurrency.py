@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.concurrency import fan_out
+
+
+def test_fan_out_runs_tasks_concurrently() -> None:
+    def _slow(value: int):
+        return lambda: (time.sleep(0.2), value)[1]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        started = time.monotonic()
+        result = fan_out({f"t{i}": _slow(i) for i in range(4)}, timeout_seconds=5, executor=pool)
+        elapsed = time.monotonic() - started
+
+    assert result.values == {"t0": 0, "t1": 1, "t2": 2, "t3": 3}
+    assert not result.errors
+    assert elapsed < 0.6
+
+
+def test_fan_out_reports_partial_failures_and_timeouts() -> None:
+    def _fail():
+        raise DataUnavailableError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        result = fan_out(
+            {"ok": lambda: "url", "failed": _fail, "slow": lambda: time.sleep(1.0)},
+            timeout_seconds=0.2,
+            executor=pool,
+        )
+
+    assert result.values == {"ok": "url"}
+    assert result.errors["failed"] == "boom"
+    assert "Timed out" in result.errors["slow"]
+
+
+def test_run_blocking_honours_upstream_limit(monkeypatch) -> None:
+    import asyncio
+    import threading
+
+    from backend.src.infra.concurrency import run_blocking
+
+    monkeypatch.setenv("GEOEMERGE_EE_MAX_INFLIGHT", "1")
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def _work() -> None:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+
+    async def _main() -> None:
+        await asyncio.gather(*(run_blocking(_work, upstream="earthengine") for _ in range(3)))
+
+    asyncio.run(_main())
+    assert state["peak"] == 1
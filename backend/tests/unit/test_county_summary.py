@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from datetime import datetime
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import shapely
+
+from backend.src.domain.errors import LocationNotFoundError
+from backend.src.infra.county_summary import Counties, CountySummaryTable, assign_counties
+from backend.src.infra import observations
+from backend.src.infra.datasets import DatasetArtifact
+from backend.src.infra.observations import ObservationIndex, cell_ids, ingest_observations, observation_index
+
+# Two side-by-side 1x1 degree "counties".
+_COUNTIES = Counties(
+    geoids=("12011", "12086"),
+    names=("Broward", "Miami-Dade"),
+    geometries=np.array([shapely.box(-81.0, 26.0, -80.0, 27.0), shapely.box(-81.0, 25.0, -80.0, 26.0)]),
+)
+
+
+def _index(rows: list[tuple[int, float, float, str, str, bool]]) -> ObservationIndex:
+    site, lon, lat, when, kind, eliminated = (list(col) for col in zip(*rows))
+    table = pa.table(
+        {
+            "site_id": pa.array(site, pa.int64()),
+            "measured_at": pa.array([datetime.fromisoformat(w) for w in when], pa.timestamp("ms")),
+            "water_source_type": kind,
+            "water_source": ["bucket"] * len(rows),
+            "breeding_ground_eliminated": eliminated,
+            "lon": lon,
+            "lat": lat,
+            "cell": cell_ids(np.array(lon), np.array(lat)),
+        }
+    )
+    return ObservationIndex(table.sort_by("cell"))
+
+
+_ROWS = [
+    (1, -80.5, 26.5, "2020-05-01", "container", True),
+    (2, -80.6, 26.4, "2021-05-01", "container", False),
+    (3, -80.4, 26.2, "2021-07-01", "still", True),
+    (4, -80.5, 25.5, "2019-01-01", "still", False),
+    (5, -70.0, 40.0, "2021-01-01", "still", False),  # outside both counties
+]
+
+
+def test_assign_counties_uses_one_tree_query() -> None:
+    county = assign_counties(np.array([-80.5, -80.5, -70.0]), np.array([26.5, 25.5, 40.0]), _COUNTIES)
+    assert county.tolist() == [0, 1, -1]
+
+
+def test_summary_counts_years_sources_and_mitigation(tmp_path: Path) -> None:
+    table = CountySummaryTable(tmp_path, counties=lambda: _COUNTIES)
+    assert table.refresh(_index(_ROWS)) == 5
+
+    summary = table.summary(table.find("Broward County"))
+    assert summary["total"] == 3
+    assert summary["eliminated"] == 2
+    assert summary["mitigation_rate"] == pytest.approx(2 / 3)
+    assert [(y["year"], y["count"]) for y in summary["by_year"]] == [(2020, 1), (2021, 2)]
+    assert summary["by_water_source_type"] == [{"value": "container", "count": 2}, {"value": "still", "count": 1}]
+
+    assert table.summary(table.find("miami-dade"))["total"] == 1
+    assert table.find("Orange") is None
+    with pytest.raises(LocationNotFoundError):
+        table.summary("99999")
+
+
+def test_refresh_only_assigns_new_observations(tmp_path: Path) -> None:
+    loads: list[int] = []
+
+    def _load() -> Counties:
+        loads.append(1)
+        return _COUNTIES
+
+    table = CountySummaryTable(tmp_path, counties=_load)
+    table.refresh(_index(_ROWS))
+    assert table.refresh(_index(_ROWS)) == 0
+
+    grown = _index(_ROWS + [(6, -80.5, 26.5, "2024-02-01", "container", True)])
+    assert table.refresh(grown) == 1
+    assert table.summary(table.find("Broward"))["total"] == 4
+    assert len(loads) == 1
+
+    # A new process picks up the persisted table and counts nothing twice.
+    reloaded = CountySummaryTable(tmp_path, counties=lambda: pytest.fail("counties reloaded"))
+    assert reloaded.refresh(grown) == 0
+    assert reloaded.summary(reloaded.find("Broward"))["by_year"][-1] == {
+        "year": 2024,
+        "count": 1,
+        "eliminated": 1,
+        "mitigation_rate": 1.0,
+    }
+
+
+def _write_source(path: Path, rows: list[tuple[int, float, float, str, str, bool]]) -> None:
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "SiteId": site,
+                "MeasuredAt": f"{when}T12:00:00",
+                "WaterSourceType": kind,
+                "WaterSource": "bucket",
+                "BreedingGroundEliminated": "true" if eliminated else "false",
+            },
+        }
+        for site, lon, lat, when, kind, eliminated in rows
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+
+
+def test_a_reingest_reaches_the_live_summary_without_a_reset(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "globe_mosquito.geojson"
+    monkeypatch.setattr(
+        observations,
+        "prepare_dataset",
+        lambda name, url, cache: DatasetArtifact(name=name, url=url, local_path=source),
+    )
+    sources = SimpleNamespace(datasets={"mosquito": "https://example.test/globe_mosquito.zip"})
+    table = CountySummaryTable(tmp_path / "counties", counties=lambda: _COUNTIES)
+
+    _write_source(source, _ROWS)
+    table.refresh(observation_index(tmp_path, "mosquito", sources=sources))
+    assert table.summary(table.find("Broward"))["total"] == 3
+
+    # New sightings arrive and are ingested (as `ingest-observations` would, possibly from another process).
+    _write_source(source, _ROWS + [(6, -80.5, 26.5, "2024-02-01", "container", True)])
+    ingest_observations("mosquito", repo_root=tmp_path, sources=sources)
+
+    assert table.refresh(observation_index(tmp_path, "mosquito", sources=sources)) == 1
+    assert table.summary(table.find("Broward"))["total"] == 4
+
+
+def test_a_reingest_that_removes_or_changes_rows_matches_a_full_rebuild(tmp_path: Path) -> None:
+    table = CountySummaryTable(tmp_path, counties=lambda: _COUNTIES)
+    table.refresh(_index(_ROWS))
+
+    # Row 2 was corrected to "still" and row 3 withdrawn upstream.
+    edited = [_ROWS[0], (2, -80.6, 26.4, "2021-05-01", "still", False), _ROWS[3], _ROWS[4]]
+    table.refresh(_index(edited))
+
+    rebuilt = CountySummaryTable(tmp_path / "fresh", counties=lambda: _COUNTIES)
+    rebuilt.refresh(_index(edited))
+    for name in ("Broward", "Miami-Dade"):
+        assert table.summary(table.find(name)) == rebuilt.summary(rebuilt.find(name))
+    broward = table.summary(table.find("Broward"))
+    assert broward["total"] == 2
+    assert broward["by_water_source_type"] == [{"value": "container", "count": 1}, {"value": "still", "count": 1}]
+
+
+def test_identical_observations_are_counted_separately(tmp_path: Path) -> None:
+    table = CountySummaryTable(tmp_path, counties=lambda: _COUNTIES)
+    assert table.refresh(_index([_ROWS[0], _ROWS[0]])) == 2
+    assert table.refresh(_index([_ROWS[0], _ROWS[0], _ROWS[0]])) == 1
+    assert table.summary(table.find("Broward"))["total"] == 3
+
+
+@pytest.mark.parametrize(
+    ("name", "geoid"),
+    [
+        ("St. Johns", "12109"),
+        ("Saint Johns County", "12109"),
+        ("Miami Dade", "12086"),
+        ("miami-dade county, FL", "12086"),
+        ("De Soto County", "12027"),
+    ],
+)
+def test_find_accepts_the_spellings_the_geocoder_accepts(tmp_path: Path, name: str, geoid: str) -> None:
+    counties = Counties(
+        geoids=("12109", "12086", "12027"),
+        names=("St. Johns", "Miami-Dade", "DeSoto"),
+        geometries=_COUNTIES.geometries[[0, 1, 1]],
+    )
+    table = CountySummaryTable(tmp_path, counties=lambda: counties)
+    table.refresh(_index(_ROWS))
+    assert table.find(name) == geoid
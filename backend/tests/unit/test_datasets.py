@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+from pathlib import Path
+import threading
+from zipfile import ZipFile
+
+import pytest
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.cache import CachePaths
+from backend.src.infra.datasets import download_to_cache, extract_zip, prefetch_datasets, prepare_dataset
+from backend.src.infra.sources import GoogleEarthEngineConfig, SourcesConfig
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as zf:
+        zf.writestr("points.csv", "lat,lng\n" + "27.0,-81.0\n" * 5000)
+        zf.writestr("nested/readme.txt", "hello")
+    return buffer.getvalue()
+
+
+class _Server:
+    """Serves fixed files with an ETag, honouring If-None-Match and single byte ranges."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.etag = '"v1"'
+        self.truncate_next = False
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server.requests.append((self.path, dict(self.headers)))
+                body = server.files.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header and self.headers.get("If-Range") == server.etag:
+                    start = int(range_header.removeprefix("bytes=").rstrip("-"))
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                else:
+                    self.send_response(200)
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                payload = body[start:]
+                if server.truncate_next:
+                    server.truncate_next = False
+                    payload = payload[: len(payload) // 2]
+                self.wfile.write(payload)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    srv = _Server()
+    srv.files["/data.zip"] = _zip_bytes()
+    yield srv
+    srv.close()
+
+
+def test_unchanged_files_are_revalidated_with_a_conditional_get(tmp_path: Path, server: _Server) -> None:
+    cache = CachePaths(base_dir=tmp_path)
+    url = f"{server.base_url}/data.zip"
+
+    path = download_to_cache(url, cache)
+    assert path.read_bytes() == server.files["/data.zip"]
+    assert download_to_cache(url, cache) == path
+    assert len(server.requests) == 1
+
+    # An expired TTL costs one 304, not a second download.
+    assert download_to_cache(url, cache, ttl_seconds=0) == path
+    assert server.requests[-1][1].get("If-None-Match") == '"v1"'
+    assert path.read_bytes() == server.files["/data.zip"]
+
+
+def test_prepare_dataset_revalidates_after_the_configured_age(tmp_path: Path, server: _Server, monkeypatch) -> None:
+    cache = CachePaths(base_dir=tmp_path)
+    url = f"{server.base_url}/data.zip"
+    prepare_dataset("sample", url, cache)
+    prepare_dataset("sample", url, cache)
+    assert len(server.requests) == 1
+
+    # Age the entry past the configured revalidation interval.
+    manifest_path = cache.subdir("datasets") / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["files"][url]["checked_at"] = 0.0
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    monkeypatch.setenv("GEOEMERGE_DATASET_REVALIDATE_SECONDS", "3600")
+    prepare_dataset("sample", url, cache)
+    assert len(server.requests) == 2
+    assert server.requests[-1][1].get("If-None-Match") == '"v1"'
+
+
+def test_interrupted_downloads_resume_with_a_range_request(tmp_path: Path, server: _Server) -> None:
+    cache = CachePaths(base_dir=tmp_path)
+    url = f"{server.base_url}/data.zip"
+    server.truncate_next = True
+
+    with pytest.raises(DataUnavailableError):
+        download_to_cache(url, cache)
+    path = download_to_cache(url, cache)
+
+    assert path.read_bytes() == server.files["/data.zip"]
+    headers = server.requests[-1][1]
+    assert headers["Range"] == f"bytes={len(server.files['/data.zip']) // 2}-"
+
+
+def test_corrupted_cached_files_are_downloaded_again(tmp_path: Path, server: _Server) -> None:
+    cache = CachePaths(base_dir=tmp_path)
+    url = f"{server.base_url}/data.zip"
+    path = download_to_cache(url, cache)
+
+    data = bytearray(path.read_bytes())
+    data[0] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert download_to_cache(url, cache).read_bytes() == server.files["/data.zip"]
+    assert len(server.requests) == 2
+
+
+def test_extraction_is_skipped_when_the_tree_matches(tmp_path: Path, server: _Server) -> None:
+    cache = CachePaths(base_dir=tmp_path)
+    zip_path = download_to_cache(f"{server.base_url}/data.zip", cache)
+
+    out_dir = extract_zip(zip_path, cache, subdir="datasets/sample")
+    extracted = out_dir / "points.csv"
+    mtime = extracted.stat().st_mtime_ns
+    assert extract_zip(zip_path, cache, subdir="datasets/sample") == out_dir
+    assert extracted.stat().st_mtime_ns == mtime
+
+    extracted.unlink()
+    extract_zip(zip_path, cache, subdir="datasets/sample")
+    assert extracted.exists()
+
+
+def test_prefetch_prepares_every_dataset_and_reports_failures(tmp_path: Path, server: _Server) -> None:
+    server.files["/boundary.geojson"] = b'{"type": "FeatureCollection", "features": []}'
+    sources = SourcesConfig(
+        datasets={
+            "sample": f"{server.base_url}/data.zip",
+            "boundary": f"{server.base_url}/boundary.geojson",
+            "missing": f"{server.base_url}/missing.zip",
+        },
+        eeimagesets={},
+        googleearthengine=GoogleEarthEngineConfig(projectid=None, token=None),
+    )
+
+    results = prefetch_datasets(sources, CachePaths(base_dir=tmp_path), max_workers=3)
+
+    assert (results["sample"].local_path / "nested" / "readme.txt").read_text() == "hello"
+    assert results["boundary"].local_path.name == "boundary.geojson"
+    assert isinstance(results["missing"], DataUnavailableError)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from backend.src.services.risk_service import RiskService
+
+
+def test_default_response_is_computed_once_and_refreshed_in_place(monkeypatch) -> None:
+    calls = {"n": 0}
+
+    def _compute(self) -> dict:
+        calls["n"] += 1
+        return {"tile_url_template": f"https://tiles/{calls['n']}/{{z}}/{{x}}/{{y}}"}
+
+    monkeypatch.setattr(RiskService, "_get_default", _compute)
+    service = RiskService(repo_root=Path("."))
+
+    first = service.get_default()
+    assert asyncio.run(service.aget_default()) is first
+    assert calls["n"] == 1
+
+    refreshed = service.refresh_default()
+    assert calls["n"] == 2
+    assert service.get_default() is refreshed
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.src.domain.errors import InvalidDateRangeError
+from backend.src.eda.driver_timeseries import driver_timeseries, stored_driver_timeseries
+from backend.src.infra.ee_geometry import LocalRegion
+from backend.src.infra.raster_store import RasterGrid, RasterStore
+from backend.src.infra.sources import GoogleEarthEngineConfig, SourcesConfig
+
+_SOURCES = SourcesConfig(
+    datasets={},
+    eeimagesets={
+        "vegetation": "COPERNICUS/S2_SR_HARMONIZED",
+        "land_surface_temperature": "MODIS/061/MOD11A1",
+        "precipitation": "UCSB-CHG/CHIRPS/DAILY",
+    },
+    googleearthengine=GoogleEarthEngineConfig(projectid=None, token=None),
+)
+
+
+class _Chain:
+    """Stand-in for ee.Image / ee.ImageCollection that only remembers its band name."""
+
+    def __init__(self, name: str | None = None) -> None:
+        self.name = name
+
+    def rename(self, name: str) -> "_Chain":
+        return _Chain(name)
+
+    def __getattr__(self, _name):
+        return lambda *_a, **_kw: _Chain()
+
+
+class _Region:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def serialize(self) -> str:
+        return self._name
+
+
+def _install_fake_ee(monkeypatch, reductions: list[list[str]]) -> None:
+    def _value(band: str):
+        if band == "precip_mm_2024_02":
+            return None  # e.g. no CHIRPS scenes yet
+        return {"ndvi": 0.5, "lst": 28.0, "precip": 120.0}[band.split("_")[0]]
+
+    class _Stack:
+        def __init__(self, bands: list[str]) -> None:
+            self._bands = bands
+
+        def reduceRegion(self, **_kwargs) -> SimpleNamespace:
+            def _get_info() -> dict:
+                reductions.append(self._bands)
+                return {band: _value(band) for band in self._bands}
+
+            return SimpleNamespace(getInfo=_get_info)
+
+    class _Image:
+        def __call__(self, obj):
+            return obj
+
+        @staticmethod
+        def constant(_value) -> _Chain:
+            return _Chain()
+
+        @staticmethod
+        def cat(bands: list[_Chain]) -> _Stack:
+            return _Stack([band.name for band in bands])
+
+    monkeypatch.setitem(
+        sys.modules,
+        "ee",
+        SimpleNamespace(
+            Image=_Image(),
+            ImageCollection=lambda _id: _Chain(),
+            Algorithms=SimpleNamespace(If=lambda _cond, then, _else: then),
+            Reducer=SimpleNamespace(mean=lambda: "mean"),
+        ),
+    )
+
+
+def _series(region: str, start: date, end: date, *, today: date = date(2025, 1, 1)) -> dict:
+    return driver_timeseries(region=_Region(region), start_date=start, end_date=end, sources=_SOURCES, today=today)
+
+
+def _months(bands: list[str]) -> list[str]:
+    return sorted({band[-7:].replace("_", "-") for band in bands})
+
+
+def test_all_months_are_reduced_in_one_call_and_returned_as_columns(monkeypatch) -> None:
+    reductions: list[list[str]] = []
+    _install_fake_ee(monkeypatch, reductions)
+
+    series = _series("miami", date(2024, 1, 15), date(2024, 3, 10))
+
+    assert series["months"] == ["2024-01", "2024-02", "2024-03"]
+    assert series["ndvi"] == [0.5, 0.5, 0.5]
+    assert series["lst_c"] == [28.0, 28.0, 28.0]
+    assert series["precip_mm"] == [120.0, None, 120.0]
+    assert len(reductions) == 1
+    assert len(reductions[0]) == 9
+
+
+def test_extending_a_series_only_fetches_new_months(monkeypatch) -> None:
+    reductions: list[list[str]] = []
+    _install_fake_ee(monkeypatch, reductions)
+
+    _series("miami", date(2024, 1, 1), date(2024, 3, 31))
+    extended = _series("miami", date(2024, 1, 1), date(2024, 5, 31))
+    _series("miami", date(2024, 2, 1), date(2024, 4, 30))
+    _series("tampa", date(2024, 1, 1), date(2024, 1, 31))
+
+    assert extended["months"] == ["2024-01", "2024-02", "2024-03", "2024-04", "2024-05"]
+    assert extended["precip_mm"][1] is None
+    assert [_months(bands) for bands in reductions] == [
+        ["2024-01", "2024-02", "2024-03"],
+        ["2024-04", "2024-05"],
+        ["2024-01"],
+    ]
+
+
+def test_the_current_month_is_refetched(monkeypatch) -> None:
+    reductions: list[list[str]] = []
+    _install_fake_ee(monkeypatch, reductions)
+
+    _series("miami", date(2024, 2, 1), date(2024, 3, 10), today=date(2024, 3, 10))
+    _series("miami", date(2024, 2, 1), date(2024, 3, 10), today=date(2024, 3, 10))
+
+    assert len(reductions) == 2
+    assert all(band.endswith("2024_03") for band in reductions[1])
+
+
+def test_overlong_series_are_rejected(monkeypatch) -> None:
+    monkeypatch.setenv("GEOEMERGE_TIMESERIES_MAX_MONTHS", "12")
+    _install_fake_ee(monkeypatch, [])
+
+    with pytest.raises(InvalidDateRangeError):
+        _series("miami", date(2023, 1, 1), date(2024, 1, 1))
+
+
+def _stored(tmp_path, months: list[str]) -> RasterStore:
+    store = RasterStore(tmp_path)
+    grid = RasterGrid(west=-81.0, north=27.0, pixel_size=0.25, width=4, height=4)
+    full = lambda v: np.full((4, 4), v, dtype=np.float32)  # noqa: E731
+    for i, month in enumerate(months):
+        bands = {"ndvi": full(0.3), "ndwi": full(0.0), "lst_c": full(20.0 + i), "precip_mm": full(50.0)}
+        store.put("r1", month, grid, bands)
+    return store
+
+
+_LOCAL = LocalRegion(bbox=(-80.9, 26.1, -80.1, 26.9))
+
+
+def test_stored_history_is_served_without_earth_engine(monkeypatch, tmp_path) -> None:
+    monkeypatch.setitem(sys.modules, "ee", None)  # any `import ee` fails
+    store = _stored(tmp_path, ["2024-01", "2024-02"])
+
+    series = stored_driver_timeseries(
+        store=store, local=_LOCAL, start_date=date(2024, 1, 1), end_date=date(2024, 2, 29), today=date(2025, 1, 1)
+    )
+
+    assert series == {
+        "months": ["2024-01", "2024-02"],
+        "ndvi": [pytest.approx(0.3), pytest.approx(0.3)],
+        "lst_c": [20.0, 21.0],
+        "precip_mm": [50.0, 50.0],
+    }
+    # A month missing from the store, or one not yet finished, is not answerable locally.
+    assert stored_driver_timeseries(
+        store=store, local=_LOCAL, start_date=date(2024, 1, 1), end_date=date(2024, 3, 31), today=date(2025, 1, 1)
+    ) is None
+    assert stored_driver_timeseries(
+        store=store, local=_LOCAL, start_date=date(2024, 1, 1), end_date=date(2024, 2, 29), today=date(2024, 2, 10)
+    ) is None
+
+
+def test_only_months_missing_from_the_store_are_reduced(monkeypatch, tmp_path) -> None:
+    reductions: list[list[str]] = []
+    _install_fake_ee(monkeypatch, reductions)
+    store = _stored(tmp_path, ["2024-01", "2024-02"])
+
+    series = driver_timeseries(
+        region=_Region("miami"),
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 31),
+        sources=_SOURCES,
+        today=date(2025, 1, 1),
+        store=store,
+        local=_LOCAL,
+    )
+
+    assert series["lst_c"] == [20.0, 21.0, 28.0]
+    assert [_months(bands) for bands in reductions] == [["2024-03"]]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+from backend.src.domain.models import RegionalMeans
+from backend.src.eda.risk_mapping import build_risk_image
+from backend.src.infra.ee_composites import build_driver_composites
+from backend.src.infra.sources import GoogleEarthEngineConfig, SourcesConfig
+
+
+class _Chain:
+    """Stand-in for ee.Image / ee.ImageCollection: every method returns another chain."""
+
+    def __getattr__(self, _name):
+        return lambda *_a, **_kw: _Chain()
+
+
+def _sources() -> SourcesConfig:
+    return SourcesConfig(
+        datasets={},
+        eeimagesets={
+            "vegetation": "COPERNICUS/S2_SR_HARMONIZED",
+            "land_surface_temperature": "MODIS/061/MOD11A1",
+            "precipitation": "UCSB-CHG/CHIRPS/DAILY",
+        },
+        googleearthengine=GoogleEarthEngineConfig(projectid=None, token=None),
+    )
+
+
+def test_composites_and_risk_image_share_one_collection_per_source(monkeypatch) -> None:
+    opened: list[str] = []
+
+    def _image_collection(collection_id: str):
+        opened.append(collection_id)
+        return _Chain()
+
+    monkeypatch.setitem(
+        sys.modules,
+        "ee",
+        SimpleNamespace(
+            ImageCollection=_image_collection,
+            Number=lambda _v: _Chain(),
+            Reducer=SimpleNamespace(mean=lambda: object()),
+        ),
+    )
+
+    composites = build_driver_composites(
+        region=object(), start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), sources=_sources()
+    )
+    build_risk_image(composites, means=RegionalMeans(lst_c=28.0, precip_mm=120.0))
+
+    assert sorted(opened) == sorted(_sources().eeimagesets.values())
+    assert composites.window_days == 31
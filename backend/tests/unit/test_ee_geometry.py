@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import math
+
+from backend.src.infra.ee_geometry import prepare_geometry
+
+
+def _circle(n: int) -> dict:
+    ring = [[-81.0 + math.cos(2 * math.pi * i / n), 27.0 + math.sin(2 * math.pi * i / n)] for i in range(n)]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def test_prepare_geometry_meets_the_vertex_budget() -> None:
+    prepared = prepare_geometry(_circle(20_000), max_vertices=500)
+
+    assert prepared.original_vertex_count == 20_001
+    assert 4 <= prepared.vertex_count <= 500
+    assert prepared.geometry["type"] == "Polygon"
+    minx, miny, maxx, maxy = prepared.bbox
+    assert math.isclose(minx, -82.0, abs_tol=1e-6) and math.isclose(maxy, 28.0, abs_tol=1e-6)
+
+
+def test_small_geometries_pass_through_and_results_are_cached() -> None:
+    square = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+
+    first = prepare_geometry(square, max_vertices=500)
+    assert first.vertex_count == first.original_vertex_count == 5
+    assert prepare_geometry(square, max_vertices=500) is first
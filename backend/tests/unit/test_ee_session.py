@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.ee_client import EarthEngineClient
+from backend.src.infra.ee_session import EarthEngineSession
+from backend.src.infra.metrics import MetricsRegistry
+
+
+class _CountingClient(EarthEngineClient):
+    def initialize(self) -> None:
+        object.__setattr__(self, "calls", getattr(self, "calls", 0) + 1)
+
+
+def test_session_initializes_once() -> None:
+    client = _CountingClient()
+    registry = MetricsRegistry()
+    session = EarthEngineSession(client, refresh_interval_seconds=3600, registry=registry)
+
+    session.ensure_initialized()
+    session.ensure_initialized()
+
+    assert client.calls == 1
+    assert registry.counter("ee.session.init_count") == 1
+    assert "ee.session.init_latency_ms" in registry.snapshot()["gauges"]
+
+
+def test_session_reinitializes_after_refresh_interval() -> None:
+    client = _CountingClient()
+    registry = MetricsRegistry()
+    session = EarthEngineSession(client, refresh_interval_seconds=0, registry=registry)
+
+    session.ensure_initialized()
+    session.ensure_initialized()
+
+    assert client.calls == 2
+    assert registry.counter("ee.session.reinit_count") == 1
+
+
+def test_session_propagates_init_failure() -> None:
+    class _FailingClient(EarthEngineClient):
+        def initialize(self) -> None:
+            raise DataUnavailableError("no credentials")
+
+    registry = MetricsRegistry()
+    session = EarthEngineSession(_FailingClient(), registry=registry)
+
+    with pytest.raises(DataUnavailableError):
+        session.ensure_initialized()
+    assert not session.is_initialized
+    assert registry.counter("ee.session.init_failures") == 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from backend.src.infra.ee_tiles import ee_image_tile_url_template, fresh_map_ids
+
+
+class _FakeImage:
+    def __init__(self, graph: str, calls: list[dict]) -> None:
+        self._graph = graph
+        self._calls = calls
+
+    def serialize(self) -> str:
+        return self._graph
+
+    def getMapId(self, vis_params: dict) -> dict:
+        self._calls.append(vis_params)
+        return {"mapid": f"m{len(self._calls)}", "token": "t"}
+
+
+def test_identical_expression_graphs_share_one_map_id() -> None:
+    calls: list[dict] = []
+    vis = {"min": 0, "max": 1, "palette": ["#000000", "#ffffff"]}
+
+    first = ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), vis)
+    second = ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), dict(vis))
+
+    assert len(calls) == 1
+    assert first == second
+    assert first.layer_key
+
+
+def test_different_graph_or_vis_params_miss_the_cache() -> None:
+    calls: list[dict] = []
+    vis = {"min": 0, "max": 1}
+
+    ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), vis)
+    ee_image_tile_url_template(_FakeImage('{"graph": 2}', calls), vis)
+    ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), {"min": 0, "max": 2})
+
+    assert len(calls) == 3
+
+
+def test_unserializable_images_are_not_cached() -> None:
+    calls: list[dict] = []
+
+    class _Opaque:
+        def getMapId(self, vis_params: dict) -> dict:
+            calls.append(vis_params)
+            return {"mapid": "m", "token": "t"}
+
+    ee_image_tile_url_template(_Opaque(), {"min": 0})
+    ee_image_tile_url_template(_Opaque(), {"min": 0})
+
+    assert len(calls) == 2
+
+
+def test_fresh_map_ids_bypasses_and_replaces_cached_entries() -> None:
+    calls: list[dict] = []
+    vis = {"min": 0}
+
+    first = ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), vis)
+    with fresh_map_ids():
+        refreshed = ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), vis)
+    after = ee_image_tile_url_template(_FakeImage('{"graph": 1}', calls), vis)
+
+    assert len(calls) == 2
+    assert refreshed != first
+    assert after == refreshed
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from backend.src.infra import ee_geometry, gazetteer, regions
+from backend.src.infra.gazetteer import GazetteerGeocoder, GazetteerIndex, florida_statewide_result
+
+
+def _write_boundary(path: Path, n: int) -> None:
+    ring = [[-83.0 + 2 * math.cos(2 * math.pi * i / n), 28.0 + 2 * math.sin(2 * math.pi * i / n)] for i in range(n)]
+    feature = {"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [ring + [ring[0]]]}}
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": [feature]}), encoding="utf-8")
+
+
+@pytest.fixture
+def source(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "florida.geojson"
+    _write_boundary(path, 20_000)
+    monkeypatch.setattr(regions, "florida_boundary_geojson_path", lambda **_: path)
+    monkeypatch.setenv("GEOEMERGE_FLORIDA_BOUNDARY_MAX_VERTICES", "400")
+    return path
+
+
+def test_boundary_is_simplified_and_cached_on_disk(tmp_path: Path, source: Path, monkeypatch) -> None:
+    sources = SimpleNamespace(datasets={"floridaboundaries": "https://example.test/florida.geojson"})
+
+    boundary = regions.florida_boundary(repo_root=tmp_path, sources=sources)
+    assert boundary.vertex_count <= 400
+    assert boundary.geometry["type"] == "Polygon"
+
+    cached = tmp_path / ".cache" / "geoemerge" / "boundaries"
+    meta = json.loads((cached / "florida.json").read_text(encoding="utf-8"))
+    assert meta["source_sha256"] == boundary.source_sha256
+    assert meta["original_vertex_count"] == 20_001
+    assert (cached / "florida.wkb").stat().st_size > 0
+
+    # A fresh process reloads the cached copy without re-reading the shapefile.
+    regions.reset_florida_boundaries()
+    monkeypatch.setattr(regions, "_union_florida_boundary", lambda path: pytest.fail("boundary was rebuilt"))
+    reloaded = regions.florida_boundary(repo_root=tmp_path, sources=sources)
+    assert reloaded.geometry == boundary.geometry
+    assert regions.florida_boundary(repo_root=tmp_path, sources=sources) is reloaded
+
+
+def test_boundary_is_rebuilt_when_the_source_changes(tmp_path: Path, source: Path) -> None:
+    sources = SimpleNamespace(datasets={})
+    first = regions.florida_boundary(repo_root=tmp_path, sources=sources)
+
+    _write_boundary(source, 50)
+    regions.reset_florida_boundaries()
+    second = regions.florida_boundary(repo_root=tmp_path, sources=sources)
+
+    assert second.source_sha256 != first.source_sha256
+    assert second.vertex_count == 51
+
+
+def test_statewide_queries_reuse_the_prebuilt_ee_geometry(tmp_path: Path, source: Path, monkeypatch) -> None:
+    built: list[dict] = []
+
+    class _Geometry:
+        def __init__(self, geojson: dict) -> None:
+            built.append(geojson)
+
+        @staticmethod
+        def Rectangle(coords):
+            return ("rectangle", tuple(coords))
+
+    monkeypatch.setitem(sys.modules, "ee", SimpleNamespace(Geometry=_Geometry))
+    sources = SimpleNamespace(datasets={})
+    monkeypatch.setattr(gazetteer, "load_sources_config", lambda _path: sources)
+
+    geocoder = GazetteerGeocoder(
+        lambda: GazetteerIndex(zips={}, counties={}),
+        fallback=None,
+        statewide=lambda: florida_statewide_result(tmp_path),
+    )
+    result = geocoder.geocode("State of Florida, USA")
+    boundary = regions.florida_boundary(repo_root=tmp_path, sources=sources)
+    assert result.geometry is boundary.geometry
+
+    monkeypatch.setattr(ee_geometry, "prepare_geometry", lambda *_a, **_kw: pytest.fail("boundary re-simplified"))
+    first = ee_geometry.prepare_region(location_geometry=result.geometry, location_bbox=result.bbox)
+    second = ee_geometry.prepare_region(location_geometry=result.geometry, location_bbox=result.bbox)
+
+    assert first.region is second.region
+    assert first.region is regions.florida_ee_geometry(repo_root=tmp_path, sources=sources)
+    assert built == [boundary.geometry]
+    assert first.bounds == ("rectangle", boundary.bbox)
+
+
+
+def test_statewide_lookup_does_not_wait_for_a_build_in_progress(tmp_path: Path, monkeypatch) -> None:
+    import threading
+
+    started, release = threading.Event(), threading.Event()
+
+    def _slow_build(**_kwargs):
+        started.set()
+        release.wait(5)
+        return regions.FloridaBoundary(
+            geometry={"type": "Polygon"}, bbox=(0.0, 0.0, 1.0, 1.0), vertex_count=4, source_sha256="x"
+        )
+
+    monkeypatch.setattr(regions, "_build_florida_boundary", _slow_build)
+    builder = threading.Thread(target=regions.florida_boundary, kwargs={"repo_root": tmp_path, "sources": None})
+    builder.start()
+    try:
+        assert started.wait(5)
+        lookup = threading.Thread(target=regions.statewide_ee_region, args=({"type": "Polygon"}, (0, 0, 1, 1)))
+        lookup.start()
+        lookup.join(1)
+        assert not lookup.is_alive()
+    finally:
+        release.set()
+        builder.join(5)
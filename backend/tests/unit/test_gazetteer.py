@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from backend.src.infra.gazetteer import GazetteerGeocoder, GazetteerIndex, _read_zip_centroids, is_statewide_query
+from backend.src.infra.geocoding import GeocodingResult
+
+
+class _Fallback:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def geocode(self, location_text: str) -> GeocodingResult:
+        self.calls.append(location_text)
+        return GeocodingResult(label="fallback", geometry={"type": "Point", "coordinates": [0, 0]})
+
+
+def _index() -> GazetteerIndex:
+    return GazetteerIndex(
+        zips={
+            "33172": GeocodingResult(
+                label="33172, Miami-Dade County, Florida, United States",
+                geometry={"type": "Point", "coordinates": [-80.36, 25.78]},
+            )
+        },
+        counties={
+            "miami dade": GeocodingResult(
+                label="Miami-Dade County, Florida, United States",
+                geometry={"type": "Polygon", "coordinates": [[[-81, 25], [-80, 25], [-80, 26], [-81, 25]]]},
+                bbox=(-81.0, 25.0, -80.0, 26.0),
+            ),
+            "st johns": GeocodingResult(label="St. Johns County, Florida, United States", geometry={}),
+        },
+    )
+
+
+def test_gazetteer_answers_florida_zips_and_counties_locally() -> None:
+    fallback = _Fallback()
+    geocoder = GazetteerGeocoder(_index, fallback)
+
+    assert geocoder.geocode("33172").label.startswith("33172")
+    assert geocoder.geocode("33172-1234, FL").label.startswith("33172")
+    assert geocoder.geocode("Miami-Dade County, FL").bbox == (-81.0, 25.0, -80.0, 26.0)
+    assert geocoder.geocode("saint johns county, florida").label.startswith("St. Johns")
+    assert fallback.calls == []
+
+
+def test_gazetteer_falls_back_on_miss_or_ambiguous_text() -> None:
+    fallback = _Fallback()
+    geocoder = GazetteerGeocoder(_index, fallback)
+
+    geocoder.geocode("Orange County")
+    geocoder.geocode("Miami, FL")
+    geocoder.geocode("90210")
+
+    assert fallback.calls == ["Orange County", "Miami, FL", "90210"]
+
+
+def test_gazetteer_load_failure_falls_back_and_backs_off() -> None:
+    attempts = {"n": 0}
+
+    def _broken() -> GazetteerIndex:
+        attempts["n"] += 1
+        raise RuntimeError("no network")
+
+    fallback = _Fallback()
+    geocoder = GazetteerGeocoder(_broken, fallback, retry_seconds=3600)
+    geocoder.geocode("33172")
+    geocoder.geocode("33101")
+
+    assert attempts["n"] == 1
+    assert fallback.calls == ["33172", "33101"]
+
+
+def test_read_zip_centroids_keeps_florida_prefixes(tmp_path: Path) -> None:
+    path = tmp_path / "zcta.txt"
+    path.write_text(
+        "GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG                \n"
+        "33172\t1\t0\t0\t0\t25.785\t-80.361\n"
+        "90210\t1\t0\t0\t0\t34.100\t-118.414\n",
+        encoding="utf-8",
+    )
+    assert _read_zip_centroids(path) == {"33172": (-80.361, 25.785)}
+
+
+def test_statewide_queries_are_recognized() -> None:
+    for text in ["Florida", " FL ", "State of Florida", "florida, USA", "Florida, United States"]:
+        assert is_statewide_query(text), text
+    for text in ["USA", "Florida City", "Miami, FL", "33172"]:
+        assert not is_statewide_query(text), text
+
+
+def test_async_lookups_load_off_the_event_loop() -> None:
+    import asyncio
+    import threading
+
+    loads: list[int] = []
+
+    def _loader() -> GazetteerIndex:
+        loads.append(threading.get_ident())
+        return _index()
+
+    def _statewide() -> GeocodingResult:
+        loads.append(threading.get_ident())
+        return GeocodingResult(label="Florida, United States", geometry={"type": "Polygon", "coordinates": []})
+
+    geocoder = GazetteerGeocoder(_loader, _Fallback(), statewide=_statewide)
+
+    async def _run() -> int:
+        assert (await geocoder.ageocode("33172")).label.startswith("33172")
+        assert (await geocoder.ageocode("Florida")).label == "Florida, United States"
+        # Both are in memory now and answered inline.
+        await geocoder.ageocode("Miami-Dade County, FL")
+        await geocoder.ageocode("FL")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(_run())
+    assert len(loads) == 2
+    assert loop_thread not in loads
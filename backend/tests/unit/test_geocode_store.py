@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from backend.src.domain.errors import LocationNotFoundError
+from backend.src.infra.geocode_store import PersistentGeocoder, SqliteGeocodeStore, preload_geocodes
+from backend.src.infra.geocoding import CachedGeocoder, Geocoder, GeocodingResult
+
+
+class _Inner(Geocoder):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def geocode(self, location_text: str) -> GeocodingResult:
+        self.calls.append(location_text)
+        if location_text == "nowhere":
+            raise LocationNotFoundError("Location not found")
+        return GeocodingResult(
+            label=f"{location_text} label",
+            geometry={"type": "Point", "coordinates": [-80.2, 25.8]},
+            bbox=(-80.3, 25.7, -80.1, 25.9),
+        )
+
+
+def test_store_survives_new_geocoder_instances(tmp_path: Path) -> None:
+    path = tmp_path / "geocodes.sqlite3"
+    inner = _Inner()
+
+    PersistentGeocoder(inner, SqliteGeocodeStore(path)).geocode("33172")
+    res = PersistentGeocoder(inner, SqliteGeocodeStore(path)).geocode("  33172 ")
+
+    assert inner.calls == ["33172"]
+    assert res.label == "33172 label"
+    assert res.bbox == (-80.3, 25.7, -80.1, 25.9)
+
+
+def test_store_caches_not_found_with_shorter_ttl(tmp_path: Path) -> None:
+    now = [1000.0]
+    store = SqliteGeocodeStore(tmp_path / "g.sqlite3", ttl_seconds=100, negative_ttl_seconds=10, clock=lambda: now[0])
+    inner = _Inner()
+    geocoder = PersistentGeocoder(inner, store)
+
+    for _ in range(2):
+        with pytest.raises(LocationNotFoundError):
+            geocoder.geocode("nowhere")
+    assert inner.calls == ["nowhere"]
+
+    now[0] += 11
+    with pytest.raises(LocationNotFoundError):
+        geocoder.geocode("nowhere")
+    assert inner.calls == ["nowhere", "nowhere"]
+
+
+def test_warm_start_and_preload_skip_stored_entries(tmp_path: Path) -> None:
+    store = SqliteGeocodeStore(tmp_path / "g.sqlite3")
+    inner = _Inner()
+    sleeps: list[float] = []
+
+    report = preload_geocodes(
+        ["33172", "nowhere", "33172"],
+        store=store,
+        geocoder=PersistentGeocoder(inner, store),
+        sleep=sleeps.append,
+    )
+    assert (report.fetched, report.not_found, report.skipped) == (1, 1, 1)
+    assert len(sleeps) == 2
+
+    cached = CachedGeocoder(_Inner())
+    warmed = cached.warm((k, s.result) for k, s in store.fresh_items() if s.result is not None)
+    assert warmed == 1
+    assert cached.geocode("33172").label == "33172 label"
+
+
+def test_async_lookups_run_store_calls_off_the_event_loop(tmp_path: Path) -> None:
+    import asyncio
+    import threading
+
+    class _RecordingStore(SqliteGeocodeStore):
+        threads: list[int] = []
+
+        def get(self, location_text):
+            self.threads.append(threading.get_ident())
+            return super().get(location_text)
+
+        def put(self, location_text, result):
+            self.threads.append(threading.get_ident())
+            return super().put(location_text, result)
+
+        def put_not_found(self, location_text):
+            self.threads.append(threading.get_ident())
+            return super().put_not_found(location_text)
+
+    store = _RecordingStore(tmp_path / "g.sqlite3")
+    geocoder = PersistentGeocoder(_Inner(), store)
+
+    async def _run() -> int:
+        await geocoder.ageocode("33172")
+        await geocoder.ageocode("33172")
+        with pytest.raises(LocationNotFoundError):
+            await geocoder.ageocode("nowhere")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(_run())
+    assert len(store.threads) == 5
+    assert loop_thread not in store.threads
@@ -45,6 +45,29 @@ def test_cached_geocoder_returns_cached(monkeypatch) -> None:
     assert calls["n"] == 1
 
 
+def test_cached_geocoder_keys_match_the_persistent_store() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls: list[str] = []
+
+    class _Inner:
+        def geocode(self, location_text: str) -> GeocodingResult:
+            calls.append(location_text)
+            return GeocodingResult(label=location_text, geometry={"type": "Point", "coordinates": [0, 0]})
+
+    cg = CachedGeocoder(_Inner(), max_entries=8)
+    assert cg.warm([("St  Johns ", GeocodingResult(label="warm", geometry={"type": "Point", "coordinates": [0, 0]}))])
+    assert cg.geocode("st johns").label == "warm"
+    cg.geocode("Palm  Beach")
+    cg.geocode(" palm beach")
+    assert calls == ["Palm  Beach"]
+
+    # Concurrent misses evict under the cache's own lock instead of racing a shared dict.
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(cg.geocode, [f"place {i}" for i in range(200)]))
+    assert cg.geocode("place 199").label == "place 199"
+
+
 def test_nominatim_retries_on_429(monkeypatch) -> None:
     import httpx
 
@@ -77,3 +100,34 @@ def test_nominatim_retries_on_429(monkeypatch) -> None:
     res = geo.geocode("33101")
     assert res.label == "ok"
     assert sleeps
+
+
+def test_nominatim_async_retries_on_429(monkeypatch) -> None:
+    import asyncio
+
+    import httpx
+
+    request = httpx.Request("GET", "https://example.com")
+    seq = [
+        httpx.Response(429, json={}, request=request),
+        httpx.Response(
+            200,
+            json={"features": [{"geometry": {"type": "Point", "coordinates": [0, 0]}, "properties": {"display_name": "ok"}}]},
+            request=request,
+        ),
+    ]
+
+    async def _fake_get(_self, *_a, **_kw):
+        return seq.pop(0)
+
+    sleeps: list[float] = []
+
+    async def _fake_sleep(s: float) -> None:
+        sleeps.append(s)
+
+    monkeypatch.setattr("backend.src.infra.geocoding.httpx.AsyncClient.get", _fake_get)
+    monkeypatch.setattr("backend.src.infra.geocoding.asyncio.sleep", _fake_sleep)
+
+    res = asyncio.run(NominatimGeocoder().ageocode("33101"))
+    assert res.label == "ok"
+    assert sleeps
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.src.domain.errors import InvalidLocationError
+from backend.src.eda.hotspots import HotspotPyramid, cell_degrees
+
+_FLORIDA = (-87.7, 24.4, -79.9, 31.1)
+
+
+def _points(n: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-87.0, -80.0, n), rng.uniform(25.0, 31.0, n)
+
+
+def test_every_level_matches_a_direct_histogram() -> None:
+    lon, lat = _points(5_000)
+    pyramid = HotspotPyramid.build(lon, lat, max_zoom=10)
+
+    for z in (3, 7, 10):
+        size = cell_degrees(z)
+        cells = pyramid.query(_FLORIDA, z)
+        expected: dict[tuple[int, int], int] = {}
+        for x, y in zip(np.floor((lon + 180) / size).astype(int), np.floor((lat + 90) / size).astype(int)):
+            expected[(x, y)] = expected.get((x, y), 0) + 1
+
+        got = {
+            (int(np.floor((x + 180) / size)), int(np.floor((y + 90) / size))): c
+            for x, y, c in zip(cells["lon"], cells["lat"], cells["count"])
+        }
+        assert got == expected
+        assert cells["total"] == 5_000
+
+
+def test_payload_size_depends_on_the_view_not_the_point_count() -> None:
+    small = HotspotPyramid.build(*_points(2_000), max_zoom=8).query(_FLORIDA, 6)
+    large = HotspotPyramid.build(*_points(200_000), max_zoom=8).query(_FLORIDA, 6)
+
+    assert large["total"] == 200_000
+    assert len(large["count"]) <= len(small["count"]) * 1.1
+    # Florida at z=6 is at most a 12 x 11 grid of 0.7 degree cells.
+    assert len(large["count"]) <= 12 * 11
+
+
+def test_bbox_windows_and_zoom_clamping() -> None:
+    pyramid = HotspotPyramid.build(np.array([-80.19, -82.46]), np.array([25.77, 27.95]), max_zoom=9)
+
+    miami = pyramid.query((-80.5, 25.5, -80.0, 26.0), 9)
+    assert miami["count"] == [1.0]
+    assert pyramid.query((-80.5, 25.5, -80.0, 26.0), 30)["z"] == 9
+    assert pyramid.query((0.0, 0.0, 1.0, 1.0), 5)["count"] == []
+
+
+def test_smoothing_spreads_mass_across_neighbours() -> None:
+    pyramid = HotspotPyramid.build(np.array([-81.0]), np.array([28.0]), max_zoom=10)
+
+    smoothed = pyramid.query((-82.0, 27.0, -80.0, 29.0), 8, smooth=True)
+    assert len(smoothed["count"]) == 9
+    assert smoothed["total"] == pytest.approx(1.0)
+    assert smoothed["max_count"] == pytest.approx(0.25)
+
+    with pytest.raises(InvalidLocationError):
+        pyramid.query((-180.0, -90.0, 180.0, 90.0), 10, smooth=True)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import date
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.src.infra import observations
+from backend.src.infra.datasets import DatasetArtifact
+from backend.src.infra.observations import ObservationIndex, ingest_observations
+
+_SOURCES = SimpleNamespace(datasets={"mosquito": "https://example.test/globe_mosquito.zip"})
+
+
+def _write_mosquito(path: Path, points: list[tuple[float, float, str, str]]) -> None:
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "SiteId": 100 + i,
+                "MeasuredAt": measured_at,
+                "CountryCode": "USA",
+                "WaterSourceType": "container: artificial",
+                "WaterSource": "bucket",
+                "LarvaeCountProcessed": str(i),
+                "BreedingGroundEliminated": eliminated,
+            },
+        }
+        for i, (lon, lat, measured_at, eliminated) in enumerate(points)
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+
+
+@pytest.fixture
+def source(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "globe_mosquito.geojson"
+    _write_mosquito(
+        path,
+        [
+            (-80.19, 25.77, "2020-06-01T12:00:00", "true"),  # Miami
+            (-80.20, 25.78, "2022-07-15T09:30:00", "false"),
+            (-82.46, 27.95, "2021-03-10T08:00:00", "true"),  # Tampa
+            (-84.28, 30.44, "2019-09-01T16:45:00", "false"),  # Tallahassee
+            (2.35, 48.86, "2021-05-05T10:00:00", "false"),  # Paris
+        ],
+    )
+    monkeypatch.setattr(
+        observations,
+        "prepare_dataset",
+        lambda name, url, cache: DatasetArtifact(name=name, url=url, local_path=path),
+    )
+    return path
+
+
+def test_ingest_writes_typed_cell_sorted_geoparquet(tmp_path: Path, source: Path) -> None:
+    import pyarrow.parquet as pq
+
+    path = ingest_observations("mosquito", repo_root=tmp_path, sources=_SOURCES)
+
+    table = pq.read_table(path)
+    assert b"geo" in table.schema.metadata
+    assert table.num_rows == 5
+    assert str(table.schema.field("site_id").type) == "int64"
+    assert str(table.schema.field("larvae_count").type) == "double"
+    assert str(table.schema.field("breeding_ground_eliminated").type) == "bool"
+    assert str(table.schema.field("measured_at").type).startswith("timestamp")
+    assert np.all(np.diff(table.column("cell").to_numpy()) >= 0)
+
+    mtime = path.stat().st_mtime_ns
+    assert ingest_observations("mosquito", repo_root=tmp_path, sources=_SOURCES) == path
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_index_answers_bbox_and_date_queries(tmp_path: Path, source: Path) -> None:
+    index = ObservationIndex.load(ingest_observations("mosquito", repo_root=tmp_path, sources=_SOURCES))
+    assert len(index) == 5
+
+    miami = (-80.5, 25.5, -80.0, 26.0)
+    assert len(index.rows(miami)) == 2
+    assert len(index.rows(miami, start=date(2022, 1, 1), end=date(2022, 7, 15))) == 1
+    assert len(index.rows(miami, start=date(2023, 1, 1))) == 0
+
+    florida = (-87.7, 24.4, -79.9, 31.1)
+    records = index.records(index.rows(florida))
+    assert sorted(r["site_id"] for r in records) == [100, 101, 102, 103]
+    tampa = next(r for r in records if r["site_id"] == 102)
+    assert tampa["breeding_ground_eliminated"] is True
+    assert tampa["measured_at"].year == 2021
+    assert "cell" not in tampa
+
+
+def test_index_matches_a_brute_force_scan(tmp_path: Path, monkeypatch) -> None:
+    rng = np.random.default_rng(7)
+    lon = rng.uniform(-88.0, -80.0, 2000)
+    lat = rng.uniform(24.0, 31.0, 2000)
+    path = tmp_path / "points.geojson"
+    _write_mosquito(path, [(x, y, "2021-01-01T00:00:00", "false") for x, y in zip(lon, lat)])
+    monkeypatch.setattr(
+        observations,
+        "prepare_dataset",
+        lambda name, url, cache: DatasetArtifact(name=name, url=url, local_path=path),
+    )
+    index = ObservationIndex.load(ingest_observations("mosquito", repo_root=tmp_path, sources=_SOURCES))
+
+    for bbox in [(-85.05, 26.13, -82.71, 29.99), (-80.3, 24.0, -80.0, 24.5), (-87.0, 30.95, -86.95, 31.0)]:
+        minx, miny, maxx, maxy = bbox
+        expected = int(np.sum((lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy)))
+        assert len(index.rows(bbox)) == expected
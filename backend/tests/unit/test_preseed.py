@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.domain.models import Location, LocationSource
+from backend.src.infra.concurrency import FanOutResult
+from backend.src.infra.ee_tiles import TileUrlTemplate
+from backend.src.infra.tile_proxy import DiskTileCache, TileProxy, tiles_for_bbox
+from backend.src.infra.ee_geometry import local_region
+from backend.src.services import risk_service
+from backend.src.services.preseed_service import PreseedPlan, _location_bbox, preseed
+
+_BBOX = (-80.5, 25.5, -80.1, 25.9)
+
+
+class _FakeRiskService:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, date, date]] = []
+        self.layer_ids: list[object] = []
+
+    def layer_tiles(self, *, location_text: str, start_date: date, end_date: date, layer_ids=None):
+        self.calls.append((location_text, start_date, end_date))
+        self.layer_ids.append(layer_ids)
+        if location_text == "Nowhere":
+            raise DataUnavailableError("no data")
+        location = Location(
+            id="x", label=location_text, source=LocationSource.geocoded_text, geometry={"type": "Polygon"}, bbox=_BBOX
+        )
+        key = f"{len(self.calls):064x}"
+        return location, FanOutResult(
+            values={"risk": TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}", layer_key=key)},
+            errors={"precipitation": "timed out"},
+        )
+
+
+def _proxy(tmp_path, requests: list[str]) -> TileProxy:
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, content=b"png")
+
+    templates = {}
+
+    def _resolve(key: str) -> TileUrlTemplate:
+        return templates.setdefault(key, TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}", layer_key=key))
+
+    return TileProxy(
+        DiskTileCache(tmp_path, max_bytes=10 * 1024 * 1024),
+        client=httpx.Client(transport=httpx.MockTransport(_handler)),
+        resolve=_resolve,
+    )
+
+
+def test_tiles_for_bbox_covers_miami_dade_area() -> None:
+    assert tiles_for_bbox(_BBOX, 0) == [(0, 0)]
+    tiles = tiles_for_bbox(_BBOX, 10)
+    assert (283, 436) in tiles
+    assert len(tiles) == 4
+
+
+def test_preseed_resolves_every_window_and_fetches_tiles(tmp_path) -> None:
+    requests: list[str] = []
+    service = _FakeRiskService()
+    plan = PreseedPlan(
+        locations=("Miami-Dade County, Florida", "Nowhere"),
+        window_days=(30, 90),
+        min_zoom=9,
+        max_zoom=10,
+        requests_per_second=0,
+    )
+
+    report = preseed(plan, risk_service=service, proxy=_proxy(tmp_path, requests), today=date(2024, 6, 30))
+
+    assert [c[1] for c in service.calls[:2]] == [date(2024, 5, 31), date(2024, 4, 1)]
+    assert report.map_ids == 2
+    assert report.map_id_failures == 4
+    per_layer = len(tiles_for_bbox(_BBOX, 9)) + len(tiles_for_bbox(_BBOX, 10))
+    assert report.tiles_fetched == len(requests) == 2 * per_layer
+
+
+def test_preseed_respects_the_tile_budget(tmp_path) -> None:
+    requests: list[str] = []
+    plan = PreseedPlan(
+        locations=("Miami-Dade County, Florida",),
+        window_days=(30,),
+        min_zoom=10,
+        max_zoom=12,
+        max_tile_requests=5,
+        requests_per_second=0,
+    )
+
+    report = preseed(plan, risk_service=_FakeRiskService(), proxy=_proxy(tmp_path, requests))
+
+    assert len(requests) == 5
+    assert report.tiles_skipped > 0
+
+
+def test_preseed_reports_cached_tiles_separately(tmp_path) -> None:
+    requests: list[str] = []
+    proxy = _proxy(tmp_path, requests)
+    plan = PreseedPlan(
+        locations=("Miami-Dade County, Florida",),
+        window_days=(30,),
+        min_zoom=9,
+        max_zoom=10,
+        requests_per_second=0,
+    )
+
+    class _SameKeyService(_FakeRiskService):
+        def layer_tiles(self, **kwargs):
+            location, tiles = super().layer_tiles(**kwargs)
+            template = TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}", layer_key="a" * 64)
+            return location, FanOutResult(values={"risk": template})
+
+    first = preseed(plan, risk_service=_SameKeyService(), proxy=proxy)
+    second = preseed(plan, risk_service=_SameKeyService(), proxy=proxy)
+
+    assert first.tiles_fetched == len(requests) > 0
+    assert (first.tiles_cached, second.tiles_fetched) == (0, 0)
+    assert second.tiles_cached == first.tiles_fetched
+
+
+def test_preseed_passes_the_layer_filter_to_map_id_resolution(tmp_path) -> None:
+    service = _FakeRiskService()
+    plan = PreseedPlan(locations=("Miami-Dade County, Florida",), window_days=(30,), layer_ids=("risk",))
+
+    preseed(plan, risk_service=service, proxy=None)
+
+    assert service.layer_ids == [("risk",)]
+
+
+def test_preseed_fetches_each_entrys_tiles_before_resolving_the_next(tmp_path) -> None:
+    requests: list[str] = []
+    events: list[str] = []
+
+    class _Service(_FakeRiskService):
+        def layer_tiles(self, **kwargs):
+            events.append(f"map ids after {len(requests)} tiles")
+            return super().layer_tiles(**kwargs)
+
+    plan = PreseedPlan(
+        locations=("Miami-Dade County, Florida",),
+        window_days=(30, 90),
+        min_zoom=10,
+        max_zoom=10,
+        requests_per_second=0,
+    )
+    preseed(plan, risk_service=_Service(), proxy=_proxy(tmp_path, requests))
+
+    per_entry = len(tiles_for_bbox(_BBOX, 10))
+    assert events == ["map ids after 0 tiles", f"map ids after {per_entry} tiles"]
+
+
+def test_point_locations_use_the_shared_point_buffer() -> None:
+    geometry = {"type": "Point", "coordinates": [-80.2, 25.8]}
+    location = Location(id="p", label="33101", source=LocationSource.geocoded_text, geometry=geometry)
+
+    assert _location_bbox(location) == local_region(location_geometry=geometry, location_bbox=None).bbox
+
+
+def test_layers_outside_the_filter_never_request_a_map_id(monkeypatch) -> None:
+    rendered: list[object] = []
+
+    def _tile(image, _vis) -> TileUrlTemplate:
+        rendered.append(image)
+        return TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}")
+
+    monkeypatch.setattr(risk_service, "ee_image_tile_url_template", _tile)
+    composites = SimpleNamespace(lst_c="lst", ndvi="ndvi", precip_mm="precip", window_days=30)
+
+    tiles, _vis = risk_service.RiskService(repo_root=Path("."))._layer_tiles(
+        region=None,
+        start=date(2024, 1, 1),
+        end=date(2024, 1, 31),
+        sources=None,
+        composites=composites,
+        layer_ids=("precipitation",),
+    )
+
+    assert list(tiles.values) == ["precipitation"]
+    assert rendered == ["precip"]
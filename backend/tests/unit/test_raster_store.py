@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.src.infra.raster_store import (
+    RasterGrid,
+    RasterStore,
+    month_bounds,
+    months_between,
+    region_tiles,
+)
+
+
+def _grid() -> RasterGrid:
+    return RasterGrid(west=-81.0, north=27.0, pixel_size=0.25, width=4, height=4)
+
+
+def test_put_then_read_windows_from_memory_maps(tmp_path) -> None:
+    store = RasterStore(tmp_path)
+    ndvi = np.arange(16, dtype=np.float32).reshape(4, 4)
+    store.put("r1", "2024-06", _grid(), {"ndvi": ndvi, "lst_c": ndvi + 20})
+
+    tile = store.get("r1", "2024-06")
+    assert isinstance(tile.bands["ndvi"], np.memmap)
+    window = tile.window((-80.6, 26.4, -80.3, 26.8))
+    np.testing.assert_array_equal(window["ndvi"], ndvi[0:3, 1:3])
+    assert np.shares_memory(window["ndvi"], tile.bands["ndvi"])
+
+    assert store.read_window("2024-06", (-90.0, 10.0, -89.0, 11.0)) == []
+    assert len(store.read_window("2024-06", (-80.9, 26.1, -80.1, 26.9))) == 1
+
+
+def test_manifest_survives_reopen(tmp_path) -> None:
+    RasterStore(tmp_path).put("r1", "2024-01", _grid(), {"precip_mm": np.ones((4, 4), dtype=np.float32)})
+
+    reopened = RasterStore(tmp_path)
+    assert reopened.has("r1", "2024-01")
+    assert not reopened.has("r1", "2024-02")
+    assert reopened.get("r1", "2024-01").grid == _grid()
+
+
+def test_month_helpers_and_region_tiles() -> None:
+    assert months_between(date(2023, 11, 15), date(2024, 2, 1)) == ["2023-11", "2023-12", "2024-01", "2024-02"]
+    assert month_bounds("2023-12") == (date(2023, 12, 1), date(2024, 1, 1))
+
+    tiles = region_tiles((-81.5, 25.2, -80.1, 26.0), tile_degrees=1.0)
+    assert len(tiles) == 2
+    assert tiles[0][1] == (-82.0, 25.0, -81.0, 26.0)
+
+
+def test_region_means_need_full_coverage_and_respect_the_geometry(tmp_path) -> None:
+    store = RasterStore(tmp_path)
+    ndvi = np.arange(16, dtype=np.float32).reshape(4, 4)
+    ndvi[0, 0] = np.nan
+    store.put("r1", "2024-06", _grid(), {"ndvi": ndvi})
+
+    # Partly outside the stored tile: not answerable locally.
+    assert store.region_means("2024-06", (-81.5, 26.0, -80.0, 27.0)) is None
+    assert store.region_means("2024-05", (-81.0, 26.0, -80.0, 27.0)) is None
+
+    assert store.region_means("2024-06", (-81.0, 26.0, -80.0, 27.0)) == {"ndvi": pytest.approx(np.nanmean(ndvi))}
+    # Only the two left columns have pixel centres inside the polygon.
+    west_half = {
+        "type": "Polygon",
+        "coordinates": [[[-81.0, 26.0], [-80.5, 26.0], [-80.5, 27.0], [-81.0, 27.0], [-81.0, 26.0]]],
+    }
+    means = store.region_means("2024-06", (-81.0, 26.0, -80.0, 27.0), west_half)
+    assert means == {"ndvi": pytest.approx(np.nanmean(ndvi[:, :2]))}
+
+
+def test_manifest_is_reread_after_another_writer_updates_it(tmp_path) -> None:
+    reader = RasterStore(tmp_path)
+    assert not reader.has("r1", "2024-01")
+
+    RasterStore(tmp_path).put("r1", "2024-01", _grid(), {"precip_mm": np.ones((4, 4), dtype=np.float32)})
+
+    assert reader.has("r1", "2024-01")
+    assert reader.covers("2024-01", (-80.9, 26.1, -80.1, 26.9))
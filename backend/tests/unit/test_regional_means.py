@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.eda.risk_mapping import regional_means
+from backend.src.infra.ee_composites import DriverComposites
+
+
+class _Band:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def rename(self, name: str) -> "_Band":
+        return _Band(name)
+
+    def reduceRegion(self, **kwargs) -> SimpleNamespace:
+        return SimpleNamespace(get=lambda band: f"{kwargs['geometry']}:{band}")
+
+
+def _install_fake_ee(monkeypatch, values: dict, calls: list[dict]) -> None:
+    class _Dictionary:
+        def __init__(self, exprs: dict) -> None:
+            self._exprs = exprs
+
+        def serialize(self) -> str:
+            return json.dumps(self._exprs, sort_keys=True)
+
+        def getInfo(self) -> dict:
+            calls.append(self._exprs)
+            return values
+
+    monkeypatch.setitem(
+        sys.modules, "ee", SimpleNamespace(Dictionary=_Dictionary, Reducer=SimpleNamespace(mean=lambda: "mean"))
+    )
+
+
+def _composites(region: str) -> DriverComposites:
+    return DriverComposites(
+        region=region,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 30),
+        ndvi=None,
+        ndwi=None,
+        lst_c=_Band("lst_c"),
+        precip_mm=_Band("precip_mm"),
+    )
+
+
+def test_regional_means_are_fetched_once_per_region(monkeypatch) -> None:
+    calls: list[dict] = []
+    _install_fake_ee(monkeypatch, {"lst_c": 27.5, "precip_mm": 610.0}, calls)
+
+    first = regional_means(_composites("miami"))
+    second = regional_means(_composites("miami"))
+    regional_means(_composites("tampa"))
+
+    assert first == second
+    assert (first.lst_c, first.precip_mm) == (27.5, 610.0)
+    assert len(calls) == 2
+
+
+def test_regional_means_without_valid_pixels_are_unavailable(monkeypatch) -> None:
+    _install_fake_ee(monkeypatch, {"lst_c": None, "precip_mm": 10.0}, [])
+
+    with pytest.raises(DataUnavailableError):
+        regional_means(_composites("ocean"))
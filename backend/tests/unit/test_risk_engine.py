@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.src.eda.risk_engine import (
+    RISK_CODES,
+    RISK_NODATA,
+    classify_risk_arrays,
+    classify_risk_scores,
+)
+from backend.src.eda.risk_mapping import build_risk_image, classify_risk_score
+from backend.src.infra.ee_composites import DriverComposites
+
+
+class _NpNumber:
+    def __init__(self, value) -> None:
+        self.value = float(value)
+
+
+class _NpImage:
+    """NumPy-backed stand-in for the ee.Image operations used by build_risk_image."""
+
+    def __init__(self, bands: dict[str, np.ndarray]) -> None:
+        self.bands = bands
+
+    @property
+    def array(self) -> np.ndarray:
+        (arr,) = self.bands.values()
+        return arr
+
+    def rename(self, name: str) -> "_NpImage":
+        return _NpImage({name: self.array})
+
+    def addBands(self, other: "_NpImage") -> "_NpImage":
+        return _NpImage({**self.bands, **other.bands})
+
+    def select(self, name: str) -> "_NpImage":
+        return _NpImage({name: self.bands[name]})
+
+    def reduceRegion(self, **_kwargs) -> dict[str, float]:
+        return {name: float(np.nanmean(arr)) for name, arr in self.bands.items()}
+
+    def _op(self, other, fn) -> "_NpImage":
+        a = self.array
+        b = other.array if isinstance(other, _NpImage) else (other.value if isinstance(other, _NpNumber) else other)
+        masked = np.isnan(a) | np.isnan(b)
+        return _NpImage({"v": np.where(masked, np.nan, fn(np.nan_to_num(a), np.nan_to_num(b)).astype(float))})
+
+    def lt(self, other):
+        return self._op(other, np.less)
+
+    def lte(self, other):
+        return self._op(other, np.less_equal)
+
+    def gt(self, other):
+        return self._op(other, np.greater)
+
+    def eq(self, other):
+        return self._op(other, np.equal)
+
+    def And(self, other):
+        return self._op(other, lambda a, b: (a != 0) & (b != 0))
+
+    def Or(self, other):
+        return self._op(other, lambda a, b: (a != 0) | (b != 0))
+
+    def multiply(self, other):
+        return self._op(other, np.multiply)
+
+    def add(self, other):
+        return self._op(other, np.add)
+
+    def toInt(self):
+        return self
+
+
+def test_numpy_engine_matches_earth_engine_rules(monkeypatch) -> None:
+    rng = np.random.default_rng(7)
+    shape = (64, 48)
+    ndvi = rng.uniform(-0.4, 0.9, shape)
+    lst = rng.uniform(12.0, 38.0, shape)
+    precip = rng.uniform(0.0, 60.0, shape)
+    ndvi[0, :5] = np.nan
+    lst[3, 3] = np.nan
+    precip[10, 10] = np.nan
+
+    fake_ee = SimpleNamespace(
+        Number=_NpNumber,
+        Dictionary=lambda values: SimpleNamespace(getInfo=lambda: dict(values)),
+        Reducer=SimpleNamespace(mean=lambda: "mean"),
+    )
+    monkeypatch.setitem(sys.modules, "ee", fake_ee)
+    composites = DriverComposites(
+        region=None,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        ndvi=_NpImage({"ndvi": ndvi}),
+        ndwi=_NpImage({"ndwi": np.zeros(shape)}),
+        lst_c=_NpImage({"lst": lst}),
+        precip_mm=_NpImage({"precip": precip}),
+    )
+    ee_risk = build_risk_image(composites).array
+    expected = np.where(np.isnan(ee_risk), RISK_NODATA, np.nan_to_num(ee_risk)).astype(np.int8)
+
+    local = classify_risk_arrays(ndvi, lst, precip)
+
+    np.testing.assert_array_equal(local, expected)
+    assert set(np.unique(local)) <= {RISK_NODATA, 0, 1, 2}
+
+
+def test_batch_scores_match_scalar_classifier() -> None:
+    rng = np.random.default_rng(11)
+    ndvi = rng.uniform(-0.2, 0.8, 500)
+    lst = rng.uniform(10.0, 40.0, 500)
+    precip = rng.uniform(0.0, 30.0, 500)
+
+    codes = classify_risk_scores(ndvi, lst, precip)
+
+    expected = [classify_risk_score(ndvi=n, lst_c=t, precip_mm=p) for n, t, p in zip(ndvi, lst, precip)]
+    assert [RISK_CODES[int(c)] for c in codes] == expected
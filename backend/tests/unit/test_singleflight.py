@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from backend.src.domain.errors import DataUnavailableError
+from backend.src.infra.metrics import MetricsRegistry
+from backend.src.infra.singleflight import SingleFlight
+
+
+def test_do_runs_once_for_concurrent_callers() -> None:
+    registry = MetricsRegistry()
+    flights: SingleFlight[int] = SingleFlight("test", registry=registry)
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def _work() -> int:
+        with lock:
+            calls["n"] += 1
+        time.sleep(0.2)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: flights.do("k", _work), range(4)))
+
+    assert results == [42, 42, 42, 42]
+    assert calls["n"] == 1
+    assert registry.counter("singleflight.test.executed") == 1
+    assert registry.counter("singleflight.test.coalesced") == 3
+
+
+def test_do_does_not_cache_after_completion() -> None:
+    flights: SingleFlight[int] = SingleFlight("test", registry=MetricsRegistry())
+    calls = {"n": 0}
+
+    def _work() -> int:
+        calls["n"] += 1
+        return calls["n"]
+
+    assert flights.do("k", _work) == 1
+    assert flights.do("k", _work) == 2
+
+
+def test_ado_coalesces_and_shares_errors() -> None:
+    registry = MetricsRegistry()
+    flights: SingleFlight[int] = SingleFlight("test", registry=registry)
+    calls = {"ok": 0, "fail": 0}
+
+    async def _ok() -> int:
+        calls["ok"] += 1
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def _fail() -> int:
+        calls["fail"] += 1
+        await asyncio.sleep(0.05)
+        raise DataUnavailableError("boom")
+
+    async def _main() -> None:
+        results = await asyncio.gather(*(flights.ado("ok", _ok) for _ in range(3)))
+        assert results == [7, 7, 7]
+
+        failures = await asyncio.gather(*(flights.ado("fail", _fail) for _ in range(2)), return_exceptions=True)
+        assert all(isinstance(f, DataUnavailableError) for f in failures)
+
+    asyncio.run(_main())
+    assert calls == {"ok": 1, "fail": 1}
+    assert registry.counter("singleflight.test.coalesced") == 3
+
+
+def test_do_propagates_errors_to_waiters() -> None:
+    flights: SingleFlight[int] = SingleFlight("test", registry=MetricsRegistry())
+
+    def _fail() -> int:
+        time.sleep(0.1)
+        raise DataUnavailableError("boom")
+
+    def _call(_: int) -> str:
+        with pytest.raises(DataUnavailableError):
+            flights.do("k", _fail)
+        return "raised"
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert list(pool.map(_call, range(3))) == ["raised"] * 3
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+# Generous enough for a cold CI runner; geopandas alone used to cost about this much.
+IMPORT_BUDGET_SECONDS = float(os.getenv("GEOEMERGE_IMPORT_BUDGET_SECONDS", "2.0"))
+
+# Loaded on first use only; none of them may be pulled in by building the app.
+HEAVY_MODULES = ("geopandas", "pandas", "pyogrio", "shapely", "numpy", "ee")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from backend.src.api.app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(m for m in %r if m in sys.modules)}))
+"""
+
+
+def _probe() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_create_app_stays_within_the_import_budget() -> None:
+    result = _probe()
+
+    assert result["modules"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS, f"create_app() imports took {result['seconds']:.2f}s"
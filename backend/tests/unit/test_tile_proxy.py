@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import httpx
+
+from backend.src.infra.ee_tiles import TileUrlTemplate
+from backend.src.infra.tile_proxy import DiskTileCache, TileProxy, client_tile_url, is_valid_tile
+
+_KEY = "a" * 64
+
+
+def _proxy(tmp_path, requests: list[str], *, max_bytes: int = 1024) -> TileProxy:
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, content=b"png:" + request.url.path.encode())
+
+    return TileProxy(
+        DiskTileCache(tmp_path, max_bytes=max_bytes),
+        client=httpx.Client(transport=httpx.MockTransport(_handler)),
+        resolve=lambda key: TileUrlTemplate(url="https://ee.test/map/{z}/{x}/{y}?token=t", layer_key=key)
+        if key == _KEY
+        else None,
+    )
+
+
+def test_fetches_each_tile_once_then_serves_from_disk(tmp_path) -> None:
+    requests: list[str] = []
+    proxy = _proxy(tmp_path, requests)
+
+    first = proxy.fetch(_KEY, 3, 2, 1)
+    second = proxy.fetch(_KEY, 3, 2, 1)
+
+    assert first == second == b"png:/map/3/2/1"
+    assert requests == ["https://ee.test/map/3/2/1?token=t"]
+    assert (tmp_path / _KEY / "3" / "2" / "1.png").exists()
+
+
+def test_unknown_layer_returns_none(tmp_path) -> None:
+    assert _proxy(tmp_path, []).fetch("b" * 64, 0, 0, 0) is None
+
+
+def test_disk_cache_evicts_least_recently_used_tiles(tmp_path) -> None:
+    cache = DiskTileCache(tmp_path, max_bytes=250)
+    for y in range(3):
+        cache.put(_KEY, 5, 0, y, b"x" * 100)
+
+    assert cache.size_bytes() <= 250
+    assert cache.get(_KEY, 5, 0, 0) is None
+    assert cache.get(_KEY, 5, 0, 2) == b"x" * 100
+
+
+def test_client_tile_url_uses_proxy_only_when_configured(monkeypatch, tmp_path) -> None:
+    import backend.src.infra.tile_proxy as tile_proxy
+
+    monkeypatch.setattr(tile_proxy, "find_repo_root", lambda: tmp_path)
+    template = TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}", layer_key=_KEY)
+    assert client_tile_url(template) == template.url
+
+    monkeypatch.setenv("GEOEMERGE_TILE_PROXY_BASE_URL", "http://127.0.0.1:8000/")
+    assert client_tile_url(template) == f"http://127.0.0.1:8000/tiles/{_KEY}/{{z}}/{{x}}/{{y}}.png"
+    assert client_tile_url(TileUrlTemplate(url="https://ee.test/{z}/{x}/{y}")) == "https://ee.test/{z}/{x}/{y}"
+
+
+def test_tile_coordinates_are_validated() -> None:
+    assert is_valid_tile(_KEY, 2, 3, 3)
+    assert not is_valid_tile(_KEY, 2, 4, 0)
+    assert not is_valid_tile("not-a-key", 0, 0, 0)
+
+
+def test_other_workers_resolve_remembered_layers_until_the_token_expires(monkeypatch, tmp_path) -> None:
+    requests: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, content=b"png")
+
+    def _worker() -> TileProxy:
+        # A fresh process: nothing in its own map-id cache.
+        return TileProxy(
+            DiskTileCache(tmp_path, max_bytes=1024),
+            client=httpx.Client(transport=httpx.MockTransport(_handler)),
+            resolve=lambda _key: None,
+        )
+
+    _worker().remember(TileUrlTemplate(url="https://ee.test/map/{z}/{x}/{y}?token=t", layer_key=_KEY))
+
+    other = _worker()
+    assert other.fetch(_KEY, 3, 2, 1) == b"png"
+    assert requests == ["https://ee.test/map/3/2/1?token=t"]
+    assert other.knows(_KEY, 3, 2, 1)
+
+    monkeypatch.setenv("GEOEMERGE_MAPID_CACHE_TTL_SECONDS", "0")
+    expired = _worker()
+    assert expired.fetch(_KEY, 4, 0, 0) is None
+    # Tiles already on disk stay servable; their bytes never change.
+    assert expired.knows(_KEY, 3, 2, 1)
+    assert not expired.knows(_KEY, 4, 0, 0)